@@ -0,0 +1,89 @@
+"""This file contains a method to build the GCC base image using the cli."""
+# pylint: disable=E0401
+import sys
+import time
+from io import StringIO
+
+import paramiko
+from botocore.exceptions import ClientError
+from gcc_ec2 import BASE_IMAGE_TAG, GccEc2
+from gcc_node import BASE_IMAGE_VERSION, BOOTSTRAP_COMMANDS
+from gcc_readiness import default_readiness_prober
+from gcc_workflow import generate_random_string
+
+
+def build_base_image(gcc_ec2_obj: GccEc2) -> str:
+    """Bootstrap a fresh instance, register an image of it and return the image id.
+
+    Instances launched by GCC use the newest image tagged with the current
+    BASE_IMAGE_VERSION, and skip BOOTSTRAP_COMMANDS when configured.
+    """
+    base_image_id = gcc_ec2_obj.find_base_image(BASE_IMAGE_VERSION)
+    if base_image_id is not None:
+        return base_image_id
+
+    resource_name = f"gcc-ami-builder-{generate_random_string()}"
+    security_group = gcc_ec2_obj.create_security_group(resource_name)
+    key_pair = gcc_ec2_obj.create_key_pair(resource_name)
+    instance_id = None
+
+    try:
+        instance_id = gcc_ec2_obj.create_instance(
+            key_pair["KeyName"], security_group["GroupId"]
+        )["Instances"][0]["InstanceId"]
+        ip_address = gcc_ec2_obj.wait_until_running([instance_id])[instance_id]
+
+        run_bootstrap_commands(ip_address, key_pair["KeyMaterial"])
+
+        return gcc_ec2_obj.create_image(
+            instance_id,
+            f"gcc-base-{BASE_IMAGE_VERSION}",
+            {BASE_IMAGE_TAG: BASE_IMAGE_VERSION},
+        )
+    finally:
+        if instance_id is not None:
+            gcc_ec2_obj.terminate_instance(instance_id)
+        gcc_ec2_obj.delete_key_pair(key_pair["KeyName"])
+        delete_security_group(gcc_ec2_obj, security_group["GroupId"])
+
+
+def run_bootstrap_commands(ip_address: str, pem: str) -> None:
+    """Run BOOTSTRAP_COMMANDS over SSH, failing on the first command that does not succeed."""
+    default_readiness_prober.wait([(ip_address, 22)])
+
+    client = paramiko.SSHClient()
+    client.load_system_host_keys()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    client.connect(
+        ip_address,
+        username="ubuntu",
+        pkey=paramiko.RSAKey.from_private_key(StringIO(pem)),
+    )
+
+    try:
+        for comm in BOOTSTRAP_COMMANDS:
+            _, stdout, stderr = client.exec_command(comm)
+            if stdout.channel.recv_exit_status() != 0:
+                raise RuntimeError(f"[{comm}] failed: {stderr.read().decode()}")
+    finally:
+        client.close()
+
+
+def delete_security_group(gcc_ec2_obj: GccEc2, security_group_id: str) -> None:
+    """Delete a security group once no terminating instance uses it any more."""
+    for _ in range(60):
+        try:
+            gcc_ec2_obj.delete_security_group(security_group_id)
+            return
+        except ClientError:
+            time.sleep(10)
+
+
+def main(aws_access_key_id: str, aws_secret_access_key: str) -> None:
+    """This method contains code to build the GCC base image."""
+    gcc_ec2_obj = GccEc2(aws_access_key_id, aws_secret_access_key)
+    print(build_base_image(gcc_ec2_obj))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1], sys.argv[2])
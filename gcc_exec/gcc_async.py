@@ -0,0 +1,374 @@
+"""This file contains the GccAsyncWorkflow class."""
+# pylint: disable=E0401,W1514,W0718
+import asyncio
+import functools
+import hashlib
+import time
+from concurrent.futures.thread import ThreadPoolExecutor
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, AsyncIterator, Callable
+
+from gcc_backend import STREAM_CHUNK_SIZE, GccEc2Backend
+from gcc_node import GccNode
+from gcc_script import GccScript
+from gcc_workflow import GccWorkflow
+
+try:
+    import asyncssh
+except ImportError:  # pragma: no cover - asyncssh is optional
+    asyncssh = None
+
+
+class GccAsyncWorkflow:
+    """This class drives a GccWorkflow's lifecycle from one asyncio event loop."""
+
+    __gcc_workflow_obj = None
+    __executor = None
+    __ssh_semaphore = None
+    __max_connections = None
+    __max_blocking_calls = None
+    __connections = None
+    __connections_loop = None
+
+    def __init__(
+        self,
+        gcc_workflow_obj: GccWorkflow,
+        max_connections: int = 1024,
+        max_blocking_calls: int = 64,
+    ) -> None:
+        """Constructor for a GccAsyncWorkflow object.
+
+        SSH sessions run on the event loop through asyncssh when it is installed,
+        with up to max_connections open at once, and every session on a machine
+        reuses one connection to it. boto3 and Dropbox calls, and SSH sessions
+        when asyncssh is missing, run on max_blocking_calls threads. The nodes
+        of a type 1 workflow stream to each other, so they all run at once
+        whatever max_connections is.
+        """
+        self.__gcc_workflow_obj = gcc_workflow_obj
+        self.__max_connections = max_connections
+        self.__max_blocking_calls = max_blocking_calls
+        self.__executor = ThreadPoolExecutor(
+            max_workers=max_blocking_calls, thread_name_prefix="gcc-async"
+        )
+
+    def get_gcc_workflow_obj(self) -> GccWorkflow:
+        """This method returns the __gcc_workflow_obj private variable."""
+        return self.__gcc_workflow_obj
+
+    async def __run_blocking(self, function: Callable, *args: Any) -> Any:
+        """Run a blocking call on the engine's threads without blocking the loop."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.__executor, functools.partial(function, *args)
+        )
+
+    async def plan(self, available_machines: list, *args: Any, **kwargs: Any) -> list:
+        """This method creates an execution plan based on a workflow specification."""
+        return await self.__run_blocking(
+            functools.partial(
+                self.__gcc_workflow_obj.plan, available_machines, *args, **kwargs
+            )
+        )
+
+    async def initialize(self) -> None:
+        """Initialize a virtual machine for a node if needed."""
+        pooled_nodes = await self.__run_blocking(
+            self.__gcc_workflow_obj.create_execution_resources
+        )
+        if not pooled_nodes:
+            return
+
+        gcc_backend = self.__gcc_workflow_obj.get_gcc_backend()
+        if not isinstance(gcc_backend, GccEc2Backend):
+            await self.__run_blocking(
+                gcc_backend.provision, self.__gcc_workflow_obj, pooled_nodes
+            )
+            return
+
+        await self.__run_blocking(self.__gcc_workflow_obj.create_access_resources)
+        instance_ips = await self.__run_blocking(
+            self.__gcc_workflow_obj.create_instances, pooled_nodes
+        )
+        await asyncio.gather(
+            *(
+                self.__wait_for_ssh(
+                    node, instance_ips[node.get_node_virtual_machine()["instance_id"]]
+                )
+                for node in pooled_nodes
+            )
+        )
+
+    async def __wait_for_ssh(
+        self, node: GccNode, ip_address: str, timeout: float = 300.0
+    ) -> None:
+        """Set a node's ip once its virtual machine accepts SSH connections."""
+        deadline = time.monotonic() + timeout
+        delay = 0.05
+
+        while not await probe_port(ip_address, 22, timeout=1.0):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"Timed out waiting for {ip_address}:22 to accept connections."
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+        node.get_node_virtual_machine()["ip"] = ip_address
+
+    async def configure(self) -> None:
+        """Set configuration commands and execute them on a virtual machine."""
+        workflow_dict = self.__gcc_workflow_obj.get_workflow_dict()
+
+        if workflow_dict["type"] == 1:
+            for level in workflow_dict["plan_raw"]:
+                await asyncio.gather(
+                    *(
+                        self.__run_blocking(node.set_config_commands)
+                        for node in workflow_dict["plan_raw"][level]
+                    )
+                )
+
+        elif workflow_dict["type"] == 0:
+            await asyncio.gather(
+                *(
+                    self.__run_blocking(node.set_config_commands)
+                    for node in workflow_dict["nodes"].values()
+                )
+            )
+
+        await asyncio.gather(
+            *(self.__configure_node(node) for node in workflow_dict["nodes"].values())
+        )
+
+    async def __configure_node(self, node: GccNode) -> None:
+        """Run the configuration commands of a node as one script and keep each step's result."""
+        if self.__ssh_semaphore is None:
+            self.__ssh_semaphore = asyncio.Semaphore(self.__max_connections)
+
+        config_commands = node.get_node_config()["config_commands"]
+
+        async with self.__ssh_semaphore:
+            if asyncssh is None or not isinstance(
+                self.__gcc_workflow_obj.get_gcc_backend(), GccEc2Backend
+            ):
+                config_results = await self.__run_blocking(
+                    node.run_script, config_commands, "w+", "\n[{}]\n"
+                )
+            else:
+                gcc_script_obj = GccScript(config_commands)
+                async with self.__session(node) as connection:
+                    result = await connection.run(
+                        "bash -s", input=gcc_script_obj.get_source()
+                    )
+                config_results = node.write_script_log(
+                    gcc_script_obj.parse(result.stdout or ""), "w+", "\n[{}]\n"
+                )
+
+        node.get_node_config()["config_results"] = config_results
+
+    async def execute(self) -> None:
+        """This method executes a node payload on a virtual machine.
+
+        Raise ValueError if a type 1 workflow has more nodes than can run at
+        once on the engine's threads.
+        """
+        workflow_dict = self.__gcc_workflow_obj.get_workflow_dict()
+
+        if workflow_dict["type"] == 1:
+            if (
+                asyncssh is None
+                or not isinstance(
+                    self.__gcc_workflow_obj.get_gcc_backend(), GccEc2Backend
+                )
+            ) and len(workflow_dict["nodes"]) > self.__max_blocking_calls:
+                raise ValueError(
+                    f"Type 1 workflows run every node at once, but {len(workflow_dict['nodes'])} "
+                    f"nodes exceed max_blocking_calls={self.__max_blocking_calls}."
+                )
+
+            await asyncio.gather(
+                *(
+                    self.__execute_node(node)
+                    for level in workflow_dict["plan_raw"]
+                    for node in workflow_dict["plan_raw"][level]
+                ),
+                return_exceptions=True,
+            )
+
+        elif workflow_dict["type"] == 0:
+            finished = {node_id: asyncio.Event() for node_id in workflow_dict["nodes"]}
+
+            reschedules = {}
+
+            async def execute_when_ready(node: GccNode) -> None:
+                for node_id, _ in node.get_node_dependency_items():
+                    if node_id is not None:
+                        await finished[node_id].wait()
+                try:
+                    await self.__execute_until_done(node, reschedules)
+                finally:
+                    finished[node.get_node_id()].set()
+
+            await asyncio.gather(
+                *(execute_when_ready(node) for node in workflow_dict["nodes"].values()),
+                return_exceptions=True,
+            )
+
+    async def __execute_until_done(self, node: GccNode, reschedules: dict) -> None:
+        """Execute a node, moving it to an on-demand instance if its spot instance is reclaimed."""
+        while True:
+            try:
+                await self.__execute_node(node)
+                return
+            except Exception:
+                if not await self.__run_blocking(
+                    self.__gcc_workflow_obj.was_interrupted, node, reschedules
+                ):
+                    raise
+            await self.__run_blocking(node.reschedule)
+
+    async def __execute_node(self, node: GccNode) -> None:
+        """Execute a node and record its start and finish times in the timeline."""
+        node_timeline = {"start": time.time(), "finish": None}
+        self.__gcc_workflow_obj.get_workflow_dict()["timeline"][
+            node.get_node_id()
+        ] = node_timeline
+        gcc_log_uploader = self.__gcc_workflow_obj.get_gcc_log_uploader()
+        try:
+            exec_commands = await self.__run_blocking(node.get_exec_commands)
+            gcc_log_uploader.start_watching(node.get_log_path(), node.upload_log_part)
+            try:
+                await self.__run_commands(node, exec_commands, "a+", "\n[{}]\n\n")
+            finally:
+                await self.__run_blocking(
+                    gcc_log_uploader.stop_watching, node.get_log_path()
+                )
+            await self.__run_blocking(node.upload_telemetry)
+            await self.__run_blocking(node.upload_log)
+        finally:
+            node_timeline["finish"] = time.time()
+
+    async def __run_commands(
+        self, node: GccNode, commands: list, log_mode: str, log_header: str
+    ) -> None:
+        """Run commands one at a time over SSH and stream their output to the node log."""
+        if self.__ssh_semaphore is None:
+            self.__ssh_semaphore = asyncio.Semaphore(self.__max_connections)
+
+        # Type 1 nodes stream to each other, so none of them may wait for a
+        # connection slot held by another.
+        if self.__gcc_workflow_obj.get_workflow_dict()["type"] == 1:
+            ssh_limit = nullcontext()
+        else:
+            ssh_limit = self.__ssh_semaphore
+
+        async with ssh_limit:
+            if asyncssh is None or not isinstance(
+                self.__gcc_workflow_obj.get_gcc_backend(), GccEc2Backend
+            ):
+                await self.__run_blocking(
+                    node.run_commands, commands, log_mode, log_header
+                )
+                return
+
+            async with self.__session(node) as connection:
+                with open(node.get_log_path(), log_mode) as log_file:
+                    for comm in commands:
+                        log_file.write(log_header.format(comm))
+                        log_file.flush()
+
+                        async with connection.create_process(
+                            comm, stderr=asyncssh.STDOUT, errors="replace"
+                        ) as process:
+                            while True:
+                                chunk = await process.stdout.read(STREAM_CHUNK_SIZE)
+                                if not chunk:
+                                    break
+                                log_file.write(chunk)
+                                log_file.flush()
+
+    @asynccontextmanager
+    async def __session(self, node: GccNode) -> AsyncIterator[Any]:
+        """Yield a connection to a node's machine, connecting only if none is open.
+
+        A connection that fails while in use is dropped, so the next session
+        reconnects.
+        """
+        if self.__connections_loop is not asyncio.get_running_loop():
+            self.__connections = {}
+            self.__connections_loop = asyncio.get_running_loop()
+
+        node_virtual_machine = node.get_node_virtual_machine()
+        connection_key = (
+            node_virtual_machine["ip"],
+            hashlib.sha256(node_virtual_machine["pem"].encode()).hexdigest(),
+        )
+        connection_task = self.__connections.get(connection_key)
+        if connection_task is None:
+            connection_task = asyncio.ensure_future(
+                asyncssh.connect(
+                    node_virtual_machine["ip"],
+                    username="ubuntu",
+                    client_keys=[
+                        asyncssh.import_private_key(node_virtual_machine["pem"])
+                    ],
+                    known_hosts=None,
+                )
+            )
+            self.__connections[connection_key] = connection_task
+
+        try:
+            yield await connection_task
+        except Exception:
+            if self.__connections.get(connection_key) is connection_task:
+                del self.__connections[connection_key]
+                if connection_task.done() and connection_task.exception() is None:
+                    connection_task.result().close()
+            raise
+
+    async def __close_connections(self) -> None:
+        """Close the engine's asyncssh connections."""
+        connection_tasks = list((self.__connections or {}).values())
+        self.__connections = {}
+
+        for connection_task in connection_tasks:
+            if connection_task.done() and connection_task.exception() is None:
+                connection_task.result().close()
+                await connection_task.result().wait_closed()
+
+    async def complete(self) -> None:
+        """Delete tmp directory and terminate created instances."""
+        await self.__close_connections()
+        await self.__run_blocking(
+            self.__gcc_workflow_obj.get_gcc_backend().terminate,
+            self.__gcc_workflow_obj,
+        )
+        await self.__run_blocking(self.__gcc_workflow_obj.delete_execution_resources)
+
+    async def run(self) -> None:
+        """Initialize, configure, execute and complete a planned workflow."""
+        await self.initialize()
+        await self.configure()
+        await self.execute()
+        await self.complete()
+
+    def shutdown(self) -> None:
+        """Wait for blocking calls and stop the engine's threads."""
+        self.__executor.shutdown(wait=True)
+
+
+async def probe_port(host: str, port: int, timeout: float = 5.0) -> bool:
+    """Return whether a TCP connection to a host and port can be opened."""
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), timeout=timeout
+        )
+    except (OSError, asyncio.TimeoutError):
+        return False
+
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
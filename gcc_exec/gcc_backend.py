@@ -0,0 +1,285 @@
+"""This file contains the GccEc2Backend and GccLocalBackend classes."""
+# pylint: disable=E0401,W1514,W0613
+import codecs
+import functools
+import os
+import shutil
+import subprocess
+import threading
+from typing import Any, Iterator, TextIO
+
+from gcc_readiness import default_readiness_prober
+from gcc_ssh_pool import GccSshPool, default_ssh_pool
+
+STREAM_CHUNK_SIZE = 32768
+
+
+class GccEc2Backend:
+    """This class runs nodes on EC2 instances and reaches them over SSH."""
+
+    __gcc_ssh_pool = None
+
+    def __init__(self, gcc_ssh_pool: GccSshPool = None) -> None:
+        """Constructor for a GccEc2Backend object.
+
+        Commands and transfers reuse the connections of gcc_ssh_pool, which
+        is shared by every backend that is not given one.
+        """
+        if gcc_ssh_pool is None:
+            gcc_ssh_pool = default_ssh_pool
+
+        self.__gcc_ssh_pool = gcc_ssh_pool
+
+    def get_gcc_ssh_pool(self) -> GccSshPool:
+        """This method returns the __gcc_ssh_pool private variable."""
+        return self.__gcc_ssh_pool
+
+    def provision(self, gcc_workflow_obj: Any, nodes: list) -> None:
+        """Give each node an instance and wait until they all accept SSH connections."""
+        gcc_workflow_obj.create_access_resources()
+        instance_ips = gcc_workflow_obj.create_instances(nodes)
+        default_readiness_prober.wait(
+            [(ip_address, 22) for ip_address in instance_ips.values()]
+        )
+        for node in nodes:
+            node_virtual_machine = node.get_node_virtual_machine()
+            node_virtual_machine["ip"] = instance_ips[
+                node_virtual_machine["instance_id"]
+            ]
+
+    def run_commands(
+        self, node: Any, commands: list, log_mode: str, log_header: str
+    ) -> None:
+        """Run commands one at a time over SSH and stream their output to the node log.
+
+        Standard error is interleaved with standard output as it arrives.
+        """
+        node_virtual_machine = node.get_node_virtual_machine()
+
+        with self.__gcc_ssh_pool.session(
+            node_virtual_machine["ip"], node_virtual_machine["pem"]
+        ) as client, open(node.get_log_path(), log_mode) as log_file:
+            for comm in commands:
+                log_file.write(log_header.format(comm))
+                log_file.flush()
+
+                channel = client.get_transport().open_session()
+                try:
+                    channel.set_combine_stderr(True)
+                    channel.exec_command(comm)
+                    stream_to_log(
+                        iter(functools.partial(channel.recv, STREAM_CHUNK_SIZE), b""),
+                        log_file,
+                    )
+                finally:
+                    channel.close()
+
+    def run_script(self, node: Any, source: str) -> str:
+        """Run a shell script on one channel over SSH and return its output."""
+        node_virtual_machine = node.get_node_virtual_machine()
+
+        with self.__gcc_ssh_pool.session(
+            node_virtual_machine["ip"], node_virtual_machine["pem"]
+        ) as client:
+            stdin, stdout, _ = client.exec_command("bash -s")
+            stdin.write(source)
+            stdin.channel.shutdown_write()
+            return stdout.read().decode(errors="replace")
+
+    def transfer(self, node: Any, local_path: str, remote_path: str) -> None:
+        """Copy a local file to a path relative to the home directory of a node's machine."""
+        node_virtual_machine = node.get_node_virtual_machine()
+
+        with self.__gcc_ssh_pool.session(
+            node_virtual_machine["ip"], node_virtual_machine["pem"]
+        ) as client, client.open_sftp() as sftp:
+            sftp.put(local_path, remote_path)
+
+    def fetch(self, node: Any, remote_path: str, local_path: str) -> None:
+        """Copy a file from a path relative to the home directory of a node's machine.
+
+        Raise OSError if the file does not exist.
+        """
+        node_virtual_machine = node.get_node_virtual_machine()
+
+        with self.__gcc_ssh_pool.session(
+            node_virtual_machine["ip"], node_virtual_machine["pem"]
+        ) as client, client.open_sftp() as sftp:
+            sftp.get(remote_path, local_path)
+
+    def terminate(self, gcc_workflow_obj: Any) -> None:
+        """Terminate a workflow's instances, or return them to its instance pool.
+
+        Pooled connections to the instances are closed first.
+        """
+        self.__gcc_ssh_pool.close(
+            [
+                node.get_node_virtual_machine()["ip"]
+                for node in gcc_workflow_obj.get_workflow_dict()["nodes"].values()
+                if node.get_node_virtual_machine() is not None
+            ]
+        )
+        gcc_workflow_obj.release_instances()
+
+    def get_home_dir(self, node: Any) -> str:
+        """Return the directory a node's commands start in."""
+        return "/home/ubuntu"
+
+    def get_cleanup_command(self, node: Any, path: str) -> str:
+        """Return the command that removes path, which root may own on the instance."""
+        return f"sudo rm -rf {path}"
+
+    def reserve_ports(self, node: Any, port_count: int) -> int:
+        """Return the first of port_count ports a node can receive streams on."""
+        return 5001
+
+
+class GccLocalBackend:
+    """This class runs nodes as subprocesses on the orchestrator host."""
+
+    __max_processes = None
+    __process_semaphore = None
+    __port_base = None
+    __next_port = None
+    __lock = None
+
+    def __init__(self, max_processes: int = None, port_base: int = 20000) -> None:
+        """Constructor for a GccLocalBackend object.
+
+        Each node gets its own home directory under the execution's tmp
+        directory, which its commands run in, with up to max_processes commands
+        running at once (the number of CPUs by default). Type 1 nodes receive
+        streams on ports handed out from port_base upwards.
+        """
+        if max_processes is None:
+            max_processes = os.cpu_count() or 1
+
+        self.__max_processes = max_processes
+        self.__process_semaphore = threading.BoundedSemaphore(max_processes)
+        self.__port_base = port_base
+        self.__next_port = port_base
+        self.__lock = threading.Lock()
+
+    def get_max_processes(self) -> int:
+        """This method returns the __max_processes private variable."""
+        return self.__max_processes
+
+    def provision(self, gcc_workflow_obj: Any, nodes: list) -> None:
+        """Create a home directory for each node.
+
+        Raise ValueError if a node of the workflow already has a machine, since
+        every node of a local execution runs on this host.
+        """
+        node_ids = {node.get_node_id() for node in nodes}
+        remote_nodes = [
+            node_id
+            for node_id, node in gcc_workflow_obj.get_workflow_dict()["nodes"].items()
+            if node_id not in node_ids and node.get_node_virtual_machine() is not None
+        ]
+        if remote_nodes:
+            raise ValueError(
+                f"Nodes {', '.join(remote_nodes)} have a machine, but the local "
+                "backend runs every node on this host."
+            )
+
+        for node in nodes:
+            home_dir = (
+                f"{os.getcwd()}/tmp/{gcc_workflow_obj.get_tmp_dir()}/local/"
+                f"{node.get_node_id()}"
+            )
+            os.makedirs(home_dir, exist_ok=True)
+            node.set_node_virtual_machine(
+                {
+                    "ip": "127.0.0.1",
+                    "pem": None,
+                    "instance_id": None,
+                    "bootstrapped": True,
+                    "home_dir": home_dir,
+                }
+            )
+
+    def run_commands(
+        self, node: Any, commands: list, log_mode: str, log_header: str
+    ) -> None:
+        """Run commands one at a time in a node's home directory and stream their output to its log.
+
+        Standard output and standard error are written straight to the log.
+        """
+        home_dir = self.get_home_dir(node)
+        env = dict(os.environ, HOME=home_dir)
+
+        with open(node.get_log_path(), log_mode) as log_file:
+            for comm in commands:
+                log_file.write(log_header.format(comm))
+                log_file.flush()
+
+                with self.__process_semaphore:
+                    subprocess.run(
+                        comm,
+                        shell=True,
+                        cwd=home_dir,
+                        env=env,
+                        stdout=log_file,
+                        stderr=subprocess.STDOUT,
+                        check=False,
+                    )
+
+    def run_script(self, node: Any, source: str) -> str:
+        """Run a shell script in a node's home directory and return its output."""
+        home_dir = self.get_home_dir(node)
+
+        with self.__process_semaphore:
+            result = subprocess.run(
+                ["bash", "-s"],
+                input=source.encode(),
+                cwd=home_dir,
+                env=dict(os.environ, HOME=home_dir),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                check=False,
+            )
+        return result.stdout.decode(errors="replace")
+
+    def transfer(self, node: Any, local_path: str, remote_path: str) -> None:
+        """Copy a local file to a path relative to a node's home directory."""
+        shutil.copyfile(local_path, os.path.join(self.get_home_dir(node), remote_path))
+
+    def fetch(self, node: Any, remote_path: str, local_path: str) -> None:
+        """Copy a file from a path relative to a node's home directory.
+
+        Raise OSError if the file does not exist.
+        """
+        shutil.copyfile(os.path.join(self.get_home_dir(node), remote_path), local_path)
+
+    def terminate(self, gcc_workflow_obj: Any) -> None:
+        """Do nothing, since home directories go with the execution's tmp directory."""
+
+    def get_home_dir(self, node: Any) -> str:
+        """Return the directory a node's commands start in."""
+        return node.get_node_virtual_machine()["home_dir"]
+
+    def get_cleanup_command(self, node: Any, path: str) -> str:
+        """Return the command that removes path, which the orchestrator's user owns."""
+        return f"rm -rf {path}"
+
+    def reserve_ports(self, node: Any, port_count: int) -> int:
+        """Return the first of port_count ports no other local node receives streams on."""
+        with self.__lock:
+            port = self.__next_port
+            self.__next_port += port_count
+            if self.__next_port > 65535:
+                self.__next_port = self.__port_base + port_count
+                port = self.__port_base
+        return port
+
+
+def stream_to_log(chunks: Iterator[bytes], log_file: TextIO) -> None:
+    """Decode chunks of output and write each one to a log as soon as it arrives."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for chunk in chunks:
+        log_file.write(decoder.decode(chunk))
+        log_file.flush()
+    log_file.write(decoder.decode(b"", final=True))
+
+
+default_backend = GccEc2Backend()
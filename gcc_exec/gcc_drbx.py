@@ -1,13 +1,21 @@
 """This file contains the GccDrbx class."""
+# pylint: disable=R0902
 
+import contextlib
 import io
 import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from os.path import dirname, join
+from typing import Any, Callable, ContextManager
 
 import dropbox
 from dotenv import load_dotenv
 from dropbox import files
 
+LINK_TTL = 3.5 * 60 * 60
+
 
 class GccDrbx:
     """This class contains methods to interface with Dropbox."""
@@ -15,9 +23,29 @@ class GccDrbx:
     __drbx = None
     __drbx_app_key = None
     __drbx_app_secret = None
-
-    def __init__(self, oauth2_refresh_token: str) -> None:
-        """Constructor method for a GccDrbx object."""
+    __link_ttl = None
+    __link_workers = None
+    __links = None
+    __pending_links = None
+    __links_lock = None
+
+    def __init__(
+        self,
+        oauth2_refresh_token: str,
+        link_ttl: float = LINK_TTL,
+        link_workers: int = 16,
+    ) -> None:
+        """Constructor method for a GccDrbx object.
+
+        Temporary links are reused for link_ttl seconds, which stays below the
+        four hours Dropbox keeps them valid, and up to link_workers links are
+        requested at once.
+        """
+        self.__link_ttl = link_ttl
+        self.__link_workers = link_workers
+        self.__links = {}
+        self.__pending_links = {}
+        self.__links_lock = threading.Lock()
         env_path = join(dirname(__file__), ".env")
 
         if os.path.isfile(env_path):
@@ -54,7 +82,9 @@ class GccDrbx:
                     session_id=upload_session_start_result.session_id,
                     offset=out_file.tell(),
                 )
-                commit = dropbox.files.CommitInfo(path=drbx_file_path)
+                commit = dropbox.files.CommitInfo(
+                    path=drbx_file_path, mode=dropbox.files.WriteMode("overwrite")
+                )
                 while out_file.tell() < file_size:
                     if (file_size - out_file.tell()) <= chunk_size:
                         response = self.__drbx.files_upload_session_finish(
@@ -67,16 +97,112 @@ class GccDrbx:
                         cursor.offset = out_file.tell()
         return response
 
+    def upload_data(self, data: bytes, drbx_file_path: str) -> files.FileMetadata:
+        """Upload data of up to 150 MB to a file in Dropbox, replacing any file there."""
+        response = self.__drbx.files_upload(
+            data, drbx_file_path, mode=dropbox.files.WriteMode("overwrite")
+        )
+        return response
+
     def get_file_contents(self, drbx_file_path: str) -> str:
         """Get the contents of a file stored in Dropbox as a String."""
         _, result = self.__drbx.files_download(drbx_file_path)
         with io.BytesIO(result.content) as stream:
             return stream.read().decode()
 
-    def get_file_link(self, drbx_file_path: str) -> str:
-        """Get the download link of a file stored in Dropbox as a String."""
-        response = self.__drbx.files_get_temporary_link(drbx_file_path)
-        return response.link
+    def get_file_stream(self, drbx_file_path: str) -> Any:
+        """Get a readable binary stream of a file stored in Dropbox."""
+        _, result = self.__drbx.files_download(drbx_file_path)
+        result.raw.decode_content = True
+        return result.raw
+
+    def get_file_content_hash(self, drbx_file_path: str) -> str:
+        """Get the Dropbox content hash of a file without downloading it."""
+        response = self.__drbx.files_get_metadata(drbx_file_path)
+        return response.content_hash
+
+    def file_exists(self, drbx_file_path: str) -> bool:
+        """Check whether a file is stored in Dropbox."""
+        try:
+            self.__drbx.files_get_metadata(drbx_file_path)
+        except dropbox.exceptions.ApiError as error:
+            if error.error.is_path() and error.error.get_path().is_not_found():
+                return False
+            raise
+        return True
+
+    def get_file_link(
+        self,
+        drbx_file_path: str,
+        drbx_limit: Callable[[], ContextManager] = contextlib.nullcontext,
+    ) -> str:
+        """Get the download link of a file stored in Dropbox as a String.
+
+        Links are cached, and a link that is already being requested by
+        another thread is waited for rather than requested again. Only the
+        request to Dropbox is made within drbx_limit.
+        """
+        with self.__links_lock:
+            cached_link = self.__links.get(drbx_file_path)
+            if cached_link is not None and cached_link[1] > time.monotonic():
+                return cached_link[0]
+
+            pending_link = self.__pending_links.get(drbx_file_path)
+            if pending_link is None:
+                self.__pending_links[drbx_file_path] = Future()
+
+        if pending_link is not None:
+            return pending_link.result()
+
+        try:
+            with drbx_limit():
+                requested_at = time.monotonic()
+                link = self.__drbx.files_get_temporary_link(drbx_file_path).link
+        except Exception as error:
+            with self.__links_lock:
+                pending_link = self.__pending_links.pop(drbx_file_path)
+            pending_link.set_exception(error)
+            raise
+
+        with self.__links_lock:
+            self.__links[drbx_file_path] = (link, requested_at + self.__link_ttl)
+            pending_link = self.__pending_links.pop(drbx_file_path)
+        pending_link.set_result(link)
+        return link
+
+    def get_file_links(
+        self,
+        drbx_file_paths: list,
+        drbx_limit: Callable[[], ContextManager] = contextlib.nullcontext,
+    ) -> list:
+        """Get the download links of many files stored in Dropbox, requesting them concurrently.
+
+        Each request is made within drbx_limit, so callers sharing a limit
+        never have more requests in flight than it allows.
+        """
+        unique_paths = list(dict.fromkeys(drbx_file_paths))
+
+        if len(unique_paths) <= 1:
+            links = [self.get_file_link(path, drbx_limit) for path in unique_paths]
+        else:
+            with ThreadPoolExecutor(
+                min(self.__link_workers, len(unique_paths))
+            ) as executor:
+                links = list(
+                    executor.map(
+                        self.get_file_link,
+                        unique_paths,
+                        [drbx_limit] * len(unique_paths),
+                    )
+                )
+
+        links_by_path = dict(zip(unique_paths, links))
+        return [links_by_path[path] for path in drbx_file_paths]
+
+    def clear_links(self) -> None:
+        """Forget every cached download link."""
+        with self.__links_lock:
+            self.__links.clear()
 
     def create_folder(self, drbx_folder_path: str) -> files.FolderMetadata:
         """Create a folder in Dropbox."""
@@ -88,6 +214,20 @@ class GccDrbx:
         result = self.__drbx.files_list_folder(drbx_folder_path)
         return [f.name for f in result.entries]
 
+    def list_file_metadata(self, drbx_folder_path: str) -> dict:
+        """Get the size and content hash of each file in a certain directory in Dropbox."""
+        result = self.__drbx.files_list_folder(drbx_folder_path)
+        entries = list(result.entries)
+        while result.has_more:
+            result = self.__drbx.files_list_folder_continue(result.cursor)
+            entries += result.entries
+
+        return {
+            entry.name: {"size": entry.size, "content_hash": entry.content_hash}
+            for entry in entries
+            if isinstance(entry, files.FileMetadata)
+        }
+
     def delete(self, drbx_path: str) -> files.DeleteResult:
         """Delete an object that is stored in Dropbox."""
         result = self.__drbx.files_delete_v2(drbx_path)
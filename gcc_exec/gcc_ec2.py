@@ -1,7 +1,38 @@
 """This file contains the GccEc2 class."""
+# pylint: disable=E0401,R0913,R0904
+import random
+import time
 from typing import Any
 
 import boto3
+from botocore.exceptions import ClientError
+from gcc_instance_types import DEFAULT_INSTANCE_TYPE
+
+THROTTLING_ERROR_CODES = ("RequestLimitExceeded", "Throttling", "ThrottlingException")
+DEFAULT_IMAGE_ID = "ami-09e67e426f25ce0d7"
+BASE_IMAGE_TAG = "gcc:base-image"
+SPOT_CAPACITY_ERROR_CODES = (
+    "InsufficientInstanceCapacity",
+    "InsufficientSpotCapacity",
+    "MaxSpotInstanceCountExceeded",
+    "SpotMaxPriceTooLow",
+    "UnfulfillableCapacity",
+)
+SECURITY_GROUP_PERMISSIONS = [
+    {
+        "IpProtocol": "tcp",
+        "FromPort": 0,
+        "ToPort": 65535,
+        "IpRanges": [{"CidrIp": "0.0.0.0/0"}],
+    },
+]
+SPOT_MARKET_OPTIONS = {
+    "MarketType": "spot",
+    "SpotOptions": {
+        "SpotInstanceType": "one-time",
+        "InstanceInterruptionBehavior": "terminate",
+    },
+}
 
 
 class GccEc2:
@@ -9,6 +40,7 @@ class GccEc2:
 
     __ec2 = None
     __ec2_resource = None
+    __base_image_ids = None
 
     def __init__(self, aws_access_key_id: str, aws_secret_access_key: str) -> None:
         """Constructor for a GccEc2 object."""
@@ -18,6 +50,7 @@ class GccEc2:
             aws_secret_access_key=aws_secret_access_key,
             region_name="us-east-1",
         )
+        self.__base_image_ids = {}
         self.__ec2_resource = boto3.resource(
             "ec2",
             aws_access_key_id=aws_access_key_id,
@@ -41,16 +74,13 @@ class GccEc2:
             GroupName=security_group_name,
             Description="Security group generated by GCC",
         )
-        self.__ec2.authorize_security_group_ingress(
-            GroupId=response["GroupId"],
-            IpPermissions=[
-                {
-                    "IpProtocol": "tcp",
-                    "FromPort": 0,
-                    "ToPort": 65535,
-                    "IpRanges": [{"CidrIp": "0.0.0.0/0"}],
-                },
-            ],
+        self.authorize_security_group(response["GroupId"])
+        return response
+
+    def authorize_security_group(self, security_group_id: str) -> dict:
+        """Allow the connections GCC needs through a security group."""
+        response = self.__ec2.authorize_security_group_ingress(
+            GroupId=security_group_id, IpPermissions=SECURITY_GROUP_PERMISSIONS
         )
         return response
 
@@ -59,24 +89,290 @@ class GccEc2:
         response = self.__ec2.delete_security_group(GroupId=security_group_id)
         return response
 
-    def create_instance(self, key_pair_name: str, security_group_id: str) -> dict:
-        """Create an instance in Ec2 with a size of t2.micro and an image of ubuntu 20.04."""
-        response = self.__ec2.run_instances(
-            ImageId="ami-09e67e426f25ce0d7",
-            MinCount=1,
-            MaxCount=1,
-            InstanceType="t2.micro",
-            KeyName=key_pair_name,
-            SecurityGroupIds=[security_group_id],
+    def create_instance(
+        self,
+        key_pair_name: str,
+        security_group_id: str,
+        image_id: str = None,
+        instance_type: str = None,
+        spot: bool = False,
+    ) -> dict:
+        """Create an instance in Ec2, by default a t2.micro with an image of ubuntu 20.04.
+
+        With spot, a spot instance is requested and an on-demand instance is
+        created when there is no spot capacity.
+        """
+        request = {
+            "ImageId": image_id or DEFAULT_IMAGE_ID,
+            "MinCount": 1,
+            "MaxCount": 1,
+            "InstanceType": instance_type or DEFAULT_INSTANCE_TYPE,
+            "KeyName": key_pair_name,
+            "SecurityGroupIds": [security_group_id],
+        }
+
+        response = self.__run_spot_instances(request) if spot else None
+        if response is None:
+            response = call_with_backoff(self.__ec2.run_instances, **request)
+        return response
+
+    def create_instances(
+        self,
+        key_pair_name: str,
+        security_group_id: str,
+        instance_count: int,
+        tags: dict = None,
+        image_id: str = None,
+        instance_type: str = None,
+        spot: bool = False,
+    ) -> list:
+        """Create instances of one type with one request and return their ids.
+
+        With spot, as many instances as there is spot capacity for are spot
+        instances, and the rest are created on demand with a second request.
+        """
+        request = {
+            "ImageId": image_id or DEFAULT_IMAGE_ID,
+            "MinCount": instance_count,
+            "MaxCount": instance_count,
+            "InstanceType": instance_type or DEFAULT_INSTANCE_TYPE,
+            "KeyName": key_pair_name,
+            "SecurityGroupIds": [security_group_id],
+        }
+        if tags:
+            request["TagSpecifications"] = [
+                {"ResourceType": "instance", "Tags": to_tag_list(tags)}
+            ]
+
+        instance_ids = []
+        if spot:
+            response = self.__run_spot_instances(dict(request, MinCount=1))
+            if response is not None:
+                instance_ids = [
+                    instance["InstanceId"] for instance in response["Instances"]
+                ]
+
+        remaining_count = instance_count - len(instance_ids)
+        if remaining_count > 0:
+            request["MinCount"] = request["MaxCount"] = remaining_count
+            response = call_with_backoff(self.__ec2.run_instances, **request)
+            instance_ids += [
+                instance["InstanceId"] for instance in response["Instances"]
+            ]
+
+        return instance_ids
+
+    def __run_spot_instances(self, request: dict) -> dict:
+        """Run a run_instances request on spot capacity, or return None without any."""
+        try:
+            return call_with_backoff(
+                self.__ec2.run_instances,
+                InstanceMarketOptions=SPOT_MARKET_OPTIONS,
+                **request,
+            )
+        except ClientError as error:
+            if error.response["Error"]["Code"] not in SPOT_CAPACITY_ERROR_CODES:
+                raise
+            return None
+
+    def find_interrupted_instances(self, instance_ids: list) -> list:
+        """Return the ids of the spot instances in a list that EC2 has reclaimed."""
+        response = call_with_backoff(
+            self.__ec2.describe_instances, InstanceIds=instance_ids
+        )
+        return [
+            instance["InstanceId"]
+            for reservation in response["Reservations"]
+            for instance in reservation["Instances"]
+            if instance.get("InstanceLifecycle") == "spot"
+            and instance["State"]["Name"] in ("shutting-down", "terminated")
+        ]
+
+    def wait_until_running(
+        self, instance_ids: list, delay: float = 5.0, max_attempts: int = 120
+    ) -> dict:
+        """Poll instances with batched describe_instances calls until they are all running.
+
+        Return the public ip address of each instance by id.
+        """
+        instance_ips = {}
+        waiting_ids = list(instance_ids)
+
+        for _ in range(max_attempts):
+            for start in range(0, len(waiting_ids), 1000):
+                batch_end = start + 1000
+                instance_ips.update(
+                    self.__describe_running_instances(waiting_ids[start:batch_end])
+                )
+
+            waiting_ids = [
+                instance_id
+                for instance_id in waiting_ids
+                if instance_id not in instance_ips
+            ]
+            if not waiting_ids:
+                return instance_ips
+            time.sleep(delay)
+
+        raise TimeoutError(
+            f"Instances {', '.join(waiting_ids)} were not running after "
+            f"{max_attempts} checks."
+        )
+
+    def __describe_running_instances(self, instance_ids: list) -> dict:
+        """Return the public ip address of each running instance among up to 1000 ids."""
+        try:
+            response = call_with_backoff(
+                self.__ec2.describe_instances, InstanceIds=instance_ids
+            )
+        except ClientError as error:
+            if error.response["Error"]["Code"] == "InvalidInstanceID.NotFound":
+                return {}
+            raise
+
+        return {
+            instance["InstanceId"]: instance["PublicIpAddress"]
+            for reservation in response["Reservations"]
+            for instance in reservation["Instances"]
+            if instance["State"]["Name"] == "running"
+            and instance.get("PublicIpAddress") is not None
+        }
+
+    def find_instances(
+        self, tags: dict, states: list, instance_type: str = None
+    ) -> list:
+        """Return the instances in any of a list of states that carry every tag in a dict."""
+        filters = [
+            {"Name": f"tag:{key}", "Values": [value]} for key, value in tags.items()
+        ]
+        filters.append({"Name": "instance-state-name", "Values": states})
+        if instance_type is not None:
+            filters.append({"Name": "instance-type", "Values": [instance_type]})
+
+        return [
+            instance
+            for page in self.__ec2.get_paginator("describe_instances").paginate(
+                Filters=filters
+            )
+            for reservation in page["Reservations"]
+            for instance in reservation["Instances"]
+        ]
+
+    def tag_instances(self, instance_ids: list, tags: dict) -> dict:
+        """Set tags on instances."""
+        response = call_with_backoff(
+            self.__ec2.create_tags, Resources=instance_ids, Tags=to_tag_list(tags)
+        )
+        return response
+
+    def start_instances(self, instance_ids: list) -> dict:
+        """Start stopped Ec2 instances."""
+        response = call_with_backoff(
+            self.__ec2.start_instances, InstanceIds=instance_ids
+        )
+        return response
+
+    def stop_instances(self, instance_ids: list) -> dict:
+        """Stop running Ec2 instances."""
+        response = call_with_backoff(
+            self.__ec2.stop_instances, InstanceIds=instance_ids
+        )
+        return response
+
+    def wait_until_terminated(self, instance_ids: list) -> None:
+        """Wait until instances are terminated, with batched describe_instances calls."""
+        waiter = self.__ec2.get_waiter("instance_terminated")
+        for start in range(0, len(instance_ids), 1000):
+            batch_end = start + 1000
+            waiter.wait(
+                InstanceIds=instance_ids[start:batch_end],
+                WaiterConfig={"Delay": 5, "MaxAttempts": 120},
+            )
+
+    def terminate_instances(self, instance_ids: list) -> dict:
+        """Terminate Ec2 instances with one request."""
+        response = call_with_backoff(
+            self.__ec2.terminate_instances, InstanceIds=instance_ids
         )
         return response
 
+    def find_security_group(self, security_group_name: str) -> dict:
+        """Return the security group with a name, or None if there is none."""
+        response = self.__ec2.describe_security_groups(
+            Filters=[{"Name": "group-name", "Values": [security_group_name]}]
+        )
+        if not response["SecurityGroups"]:
+            return None
+        return response["SecurityGroups"][0]
+
+    def find_key_pair(self, key_pair_name: str) -> dict:
+        """Return the key pair with a name, or None if there is none."""
+        response = self.__ec2.describe_key_pairs(
+            Filters=[{"Name": "key-name", "Values": [key_pair_name]}]
+        )
+        if not response["KeyPairs"]:
+            return None
+        return response["KeyPairs"][0]
+
+    def find_base_image(self, version: str) -> str:
+        """Return the id of this account's GCC base image for a bootstrap version, or None."""
+        if version not in self.__base_image_ids:
+            response = self.__ec2.describe_images(
+                Owners=["self"],
+                Filters=[
+                    {"Name": f"tag:{BASE_IMAGE_TAG}", "Values": [version]},
+                    {"Name": "state", "Values": ["available"]},
+                ],
+            )
+            images = sorted(response["Images"], key=lambda image: image["CreationDate"])
+            self.__base_image_ids[version] = images[-1]["ImageId"] if images else None
+        return self.__base_image_ids[version]
+
+    def create_image(self, instance_id: str, image_name: str, tags: dict) -> str:
+        """Create an image from an instance, wait until it is available and return its id."""
+        response = self.__ec2.create_image(
+            InstanceId=instance_id,
+            Name=image_name,
+            Description="Base image generated by GCC",
+            TagSpecifications=[{"ResourceType": "image", "Tags": to_tag_list(tags)}],
+        )
+        self.__ec2.get_waiter("image_available").wait(
+            ImageIds=[response["ImageId"]],
+            WaiterConfig={"Delay": 15, "MaxAttempts": 120},
+        )
+        self.__base_image_ids.clear()
+        return response["ImageId"]
+
     def terminate_instance(self, instance_id: str) -> dict:
         """Terminate an Ec2 instance."""
-        response = self.__ec2.terminate_instances(InstanceIds=[instance_id])
+        response = call_with_backoff(
+            self.__ec2.terminate_instances, InstanceIds=[instance_id]
+        )
         return response
 
     def get_instance_object(self, instance_id: str) -> Any:
         """This class returns an Instance object."""
         response = self.__ec2_resource.Instance(id=instance_id)
         return response
+
+
+def to_tag_list(tags: dict) -> list:
+    """Convert a dict of tags to the list of Key and Value dicts EC2 expects."""
+    return [{"Key": key, "Value": str(value)} for key, value in tags.items()]
+
+
+def call_with_backoff(
+    operation: Any, max_retries: int = 8, base_delay: float = 0.5, **kwargs: Any
+) -> Any:
+    """Call an EC2 operation, retrying throttled requests after a jittered exponential backoff."""
+    for attempt in range(max_retries + 1):
+        try:
+            return operation(**kwargs)
+        except ClientError as error:
+            if (
+                error.response["Error"]["Code"] not in THROTTLING_ERROR_CODES
+                or attempt == max_retries
+            ):
+                raise
+            time.sleep(random.uniform(0, min(20.0, base_delay * 2**attempt)))
+    return None
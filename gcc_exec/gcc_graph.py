@@ -0,0 +1,370 @@
+"""This file contains the GccGraph class and a streaming workflow specification parser."""
+# pylint: disable=C0200,C0301,R0902,R0913,R0914,E0401
+import io
+import math
+import sys
+from array import array
+from collections import deque
+from typing import Any, Iterator
+from xml.etree.ElementTree import iterparse
+
+from gcc_instance_types import select_instance_type
+
+
+class GccGraph:
+    """This class holds a workflow's tasks and dependencies in compact, index-based arrays."""
+
+    __slots__ = (
+        "__workflow_type",
+        "__node_ids",
+        "__node_indices",
+        "__node_estimates",
+        "__node_virtual_machines",
+        "__node_instance_types",
+        "__node_levels",
+        "__dep_offsets",
+        "__dep_nodes",
+        "__dep_files",
+        "__dep_sizes",
+        "__dependent_offsets",
+        "__dependent_nodes",
+        "__dependent_deps",
+    )
+
+    def __init__(
+        self,
+        workflow_type: int,
+        node_ids: list,
+        node_estimates: array,
+        node_virtual_machines: dict,
+        dep_offsets: array,
+        dep_node_ids: list,
+        dep_files: list,
+        dep_sizes: array,
+        node_levels: array = None,
+        node_instance_types: list = None,
+    ) -> None:
+        """Constructor for a GccGraph object.
+
+        The dependencies of node i are the entries dep_offsets[i] up to
+        dep_offsets[i + 1] of dep_node_ids, dep_files and dep_sizes. A dependency
+        on workflow data rather than another node has a dep_node_id of None.
+        Levels are computed unless they are passed in from a cached graph.
+        node_instance_types holds the instance type picked from each node's
+        resource hints, or None for the default instance type.
+        """
+        self.__workflow_type = workflow_type
+        self.__node_ids = node_ids
+        self.__node_indices = {node_id: index for index, node_id in enumerate(node_ids)}
+        self.__node_estimates = node_estimates
+        self.__node_virtual_machines = node_virtual_machines
+        self.__node_instance_types = (
+            node_instance_types
+            if node_instance_types is not None
+            else [None] * len(node_ids)
+        )
+        self.__dep_offsets = dep_offsets
+        self.__dep_files = dep_files
+        self.__dep_sizes = dep_sizes
+        self.__dep_nodes = array("l")
+
+        if len(self.__node_indices) < len(node_ids):
+            seen_node_ids = set()
+            for node_id in node_ids:
+                if node_id in seen_node_ids:
+                    raise ValueError(
+                        f"Task '{node_id}' is declared more than once in the workflow specification."
+                    )
+                seen_node_ids.add(node_id)
+
+        dependent_counts = array("l", [0]) * len(node_ids)
+        for index in range(len(node_ids)):
+            for dep in range(dep_offsets[index], dep_offsets[index + 1]):
+                dep_node_id = dep_node_ids[dep]
+                if dep_node_id is None:
+                    self.__dep_nodes.append(-1)
+                    continue
+                try:
+                    dep_node = self.__node_indices[dep_node_id]
+                except KeyError as error:
+                    raise ValueError(
+                        f"Task '{node_ids[index]}' depends on unknown task '{dep_node_id}'."
+                    ) from error
+                self.__dep_nodes.append(dep_node)
+                dependent_counts[dep_node] += 1
+
+        self.__dependent_offsets = array("l", [0]) * (len(node_ids) + 1)
+        for index, dependent_count in enumerate(dependent_counts):
+            self.__dependent_offsets[index + 1] = (
+                self.__dependent_offsets[index] + dependent_count
+            )
+
+        dependent_total = self.__dependent_offsets[len(node_ids)]
+        self.__dependent_nodes = array("l", [0]) * dependent_total
+        self.__dependent_deps = array("l", [0]) * dependent_total
+        fill_offsets = array("l", self.__dependent_offsets)
+        for index in range(len(node_ids)):
+            for dep in range(dep_offsets[index], dep_offsets[index + 1]):
+                dep_node = self.__dep_nodes[dep]
+                if dep_node >= 0:
+                    self.__dependent_nodes[fill_offsets[dep_node]] = index
+                    self.__dependent_deps[fill_offsets[dep_node]] = dep
+                    fill_offsets[dep_node] += 1
+
+        if node_levels is None:
+            node_levels = self.__level_nodes()
+        self.__node_levels = node_levels
+
+    def __len__(self) -> int:
+        """Return the number of nodes in the graph."""
+        return len(self.__node_ids)
+
+    def __level_nodes(self) -> array:
+        """Level the nodes with Kahn's algorithm, whatever order they were declared in."""
+        in_degree = array("l", [0]) * len(self.__node_ids)
+        for dep_node in self.__dependent_nodes:
+            in_degree[dep_node] += 1
+
+        node_levels = array("l", [0]) * len(self.__node_ids)
+        ready = deque(index for index, count in enumerate(in_degree) if count == 0)
+        leveled_count = 0
+
+        while ready:
+            index = ready.popleft()
+            leveled_count += 1
+            for dependent in range(
+                self.__dependent_offsets[index], self.__dependent_offsets[index + 1]
+            ):
+                dependent_node = self.__dependent_nodes[dependent]
+                node_levels[dependent_node] = max(
+                    node_levels[dependent_node], node_levels[index] + 1
+                )
+                in_degree[dependent_node] -= 1
+                if in_degree[dependent_node] == 0:
+                    ready.append(dependent_node)
+
+        if leveled_count < len(self.__node_ids):
+            raise ValueError(
+                "Workflow specification contains a dependency cycle: "
+                f"{' -> '.join(self.__find_cycle(in_degree))}."
+            )
+
+        return node_levels
+
+    def __find_cycle(self, in_degree: array) -> list:
+        """Return the node ids of one dependency cycle among nodes that could not be leveled."""
+        index = next(index for index, count in enumerate(in_degree) if count > 0)
+        path = []
+        visited = {}
+
+        while index not in visited:
+            visited[index] = len(path)
+            path.append(self.__node_ids[index])
+            index = next(
+                self.__dep_nodes[dep]
+                for dep in range(
+                    self.__dep_offsets[index], self.__dep_offsets[index + 1]
+                )
+                if self.__dep_nodes[dep] >= 0 and in_degree[self.__dep_nodes[dep]] > 0
+            )
+
+        cycle_start = visited[index]
+        cycle = path[cycle_start:] + [self.__node_ids[index]]
+        cycle.reverse()
+        return cycle
+
+    def get_workflow_type(self) -> int:
+        """Return the workflow type declared by the specification."""
+        return self.__workflow_type
+
+    def get_node_id(self, index: int) -> str:
+        """Return the id of the node at an index."""
+        return self.__node_ids[index]
+
+    def get_node_index(self, node_id: str) -> int:
+        """Return the index of the node with an id."""
+        return self.__node_indices[node_id]
+
+    def get_node_level(self, index: int) -> int:
+        """Return the level of the node at an index."""
+        return self.__node_levels[index]
+
+    def get_node_estimate(self, index: int) -> float:
+        """Return the estimated runtime in seconds of the node at an index."""
+        return self.__node_estimates[index]
+
+    def get_node_virtual_machine(self, index: int) -> tuple:
+        """Return the (ip, pem file name) declared for the node at an index, or None."""
+        return self.__node_virtual_machines.get(index)
+
+    def get_node_instance_type(self, index: int) -> str:
+        """Return the instance type picked for the node at an index, or None."""
+        return self.__node_instance_types[index]
+
+    def get_node_dependencies(self, index: int) -> Iterator[tuple]:
+        """Yield (dependency node id, files, size) for each dependency of the node at an index."""
+        for dep in range(self.__dep_offsets[index], self.__dep_offsets[index + 1]):
+            dep_node = self.__dep_nodes[dep]
+            dep_size = self.__dep_sizes[dep]
+            yield (
+                self.__node_ids[dep_node] if dep_node >= 0 else None,
+                self.__dep_files[dep],
+                None if math.isnan(dep_size) else dep_size,
+            )
+
+    def get_node_dependents(self, index: int) -> Iterator[tuple]:
+        """Yield (dependent node id, files) for each node that depends on the node at an index."""
+        for dependent in range(
+            self.__dependent_offsets[index], self.__dependent_offsets[index + 1]
+        ):
+            yield (
+                self.__node_ids[self.__dependent_nodes[dependent]],
+                self.__dep_files[self.__dependent_deps[dependent]],
+            )
+
+    def to_dict(self) -> dict:
+        """Return the graph as plain lists so it can be serialized."""
+        return {
+            "type": self.__workflow_type,
+            "ids": self.__node_ids,
+            "est": self.__node_estimates.tolist(),
+            "vms": [
+                [index, vm_ip, vm_pem]
+                for index, (vm_ip, vm_pem) in self.__node_virtual_machines.items()
+            ],
+            "dep_offsets": self.__dep_offsets.tolist(),
+            "dep_nodes": self.__dep_nodes.tolist(),
+            "dep_files": self.__dep_files,
+            "dep_sizes": [
+                None if math.isnan(dep_size) else dep_size
+                for dep_size in self.__dep_sizes
+            ],
+            "levels": self.__node_levels.tolist(),
+            "types": self.__node_instance_types,
+        }
+
+    @classmethod
+    def from_dict(cls, graph_dict: dict) -> Any:
+        """Build a graph from the output of to_dict without leveling it again."""
+        node_ids = [sys.intern(node_id) for node_id in graph_dict["ids"]]
+        file_tuples = {}
+
+        return cls(
+            graph_dict["type"],
+            node_ids,
+            array("d", graph_dict["est"]),
+            {index: (vm_ip, vm_pem) for index, vm_ip, vm_pem in graph_dict["vms"]},
+            array("l", graph_dict["dep_offsets"]),
+            [
+                node_ids[dep_node] if dep_node >= 0 else None
+                for dep_node in graph_dict["dep_nodes"]
+            ],
+            [
+                intern_files(dep_files, file_tuples)
+                for dep_files in graph_dict["dep_files"]
+            ],
+            array(
+                "d",
+                [
+                    math.nan if dep_size is None else dep_size
+                    for dep_size in graph_dict["dep_sizes"]
+                ],
+            ),
+            array("l", graph_dict["levels"]),
+            [
+                sys.intern(instance_type) if instance_type is not None else None
+                for instance_type in graph_dict["types"]
+            ],
+        )
+
+
+def parse_specification(source: Any) -> GccGraph:
+    """Parse a workflow specification one task at a time from a string or binary stream."""
+    if isinstance(source, str):
+        source = io.BytesIO(source.encode())
+
+    workflow_type = None
+    node_ids = []
+    node_estimates = array("d")
+    node_virtual_machines = {}
+    node_instance_types = []
+    dep_offsets = array("l", [0])
+    dep_node_ids = []
+    dep_files = []
+    dep_sizes = array("d")
+    file_tuples = {}
+    root = None
+
+    for event, element in iterparse(source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+                if element.get("type") is None:
+                    raise ValueError("Workflow specification does not declare a type.")
+                workflow_type = int(element.get("type"))
+            continue
+
+        if element.tag != "task":
+            continue
+
+        node_ids.append(sys.intern(element.get("id")))
+        node_estimates.append(float(element.get("est", 0.0)))
+        try:
+            instance_type = select_instance_type(
+                element.get("instance"),
+                element.get("class"),
+                float(element.get("cpu")) if element.get("cpu") is not None else None,
+                float(element.get("mem")) if element.get("mem") is not None else None,
+            )
+        except ValueError as error:
+            raise ValueError(f"Task '{node_ids[-1]}': {error}") from error
+        node_instance_types.append(
+            sys.intern(instance_type) if instance_type is not None else None
+        )
+
+        for child in element:
+            child_text = child.text.strip() if child.text is not None else ""
+
+            if child.tag == "vm":
+                node_virtual_machines[len(node_ids) - 1] = (
+                    child_text or None,
+                    child.get("pem"),
+                )
+
+            elif child.tag == "dep":
+                dep_node_id = child.get("node")
+                if dep_node_id is None and not child_text:
+                    continue
+
+                dep_node_ids.append(
+                    sys.intern(dep_node_id) if dep_node_id is not None else None
+                )
+                dep_files.append(
+                    intern_files(
+                        child_text.split(",") if child_text else None, file_tuples
+                    )
+                )
+                dep_sizes.append(float(child.get("size", math.nan)))
+
+        dep_offsets.append(len(dep_node_ids))
+        root.clear()
+
+    return GccGraph(
+        workflow_type,
+        node_ids,
+        node_estimates,
+        node_virtual_machines,
+        dep_offsets,
+        dep_node_ids,
+        dep_files,
+        dep_sizes,
+        node_instance_types=node_instance_types,
+    )
+
+
+def intern_files(dep_files: list, file_tuples: dict) -> tuple:
+    """Return a shared tuple for a list of file names so repeated lists are stored once."""
+    if dep_files is None:
+        return None
+    dep_files = tuple(sys.intern(file) for file in dep_files)
+    return file_tuples.setdefault(dep_files, dep_files)
@@ -0,0 +1,194 @@
+"""This file contains the GccInstancePool class."""
+# pylint: disable=E0401,R0913
+import threading
+import time
+import uuid
+
+from gcc_ec2 import GccEc2
+from gcc_instance_types import DEFAULT_INSTANCE_TYPE
+from gcc_resources import GccSharedResources
+
+POOL_TAG = "gcc:pool"
+STATE_TAG = "gcc:state"
+IDLE_SINCE_TAG = "gcc:idle-since"
+LEASE_TAG = "gcc:lease"
+LEASE_STATES = ["pending", "running", "stopping", "stopped"]
+
+
+class GccInstancePool:
+    """This class keeps GCC instances warm between executions and leases them out."""
+
+    __pool_name = None
+    __idle_ttl = None
+    __max_idle = None
+    __stop_idle = None
+    __lease_settle = None
+    __gcc_shared_resources = None
+    __lock = None
+
+    def __init__(
+        self,
+        pool_name: str = "default",
+        idle_ttl: float = 1800.0,
+        max_idle: int = 20,
+        stop_idle: bool = True,
+        key_dir: str = "~/.gcc/pool",
+        lease_settle: float = 2.0,
+    ) -> None:
+        """Constructor for a GccInstancePool object.
+
+        Instances are tagged with the pool name and whether they are idle or
+        leased, so the pool lives in EC2 and is shared by every execution that
+        uses the same AWS account and pool name. Idle instances are stopped
+        unless stop_idle is False, and are terminated once they have been idle
+        for idle_ttl seconds or when more than max_idle are idle. The private
+        key of the pool's key pair is kept in key_dir.
+
+        Since other processes may lease from the same pool, a lease tags the
+        instances with a token of its own and, after lease_settle seconds for
+        the tags to settle, only keeps the instances that still carry it.
+        """
+        self.__pool_name = pool_name
+        self.__idle_ttl = idle_ttl
+        self.__max_idle = max_idle
+        self.__stop_idle = stop_idle
+        self.__lease_settle = lease_settle
+        self.__gcc_shared_resources = GccSharedResources(
+            self.get_resource_name(), key_dir
+        )
+        self.__lock = threading.Lock()
+
+    def get_pool_name(self) -> str:
+        """This method returns the __pool_name private variable."""
+        return self.__pool_name
+
+    def get_resource_name(self) -> str:
+        """This method returns the name of the pool's key pair and security group prefix."""
+        return f"gcc-pool-{self.__pool_name}"
+
+    def get_leased_tags(self) -> dict:
+        """This method returns the tags of an instance leased from the pool."""
+        return {POOL_TAG: self.__pool_name, STATE_TAG: "leased"}
+
+    def get_key_pair(self, gcc_ec2_obj: GccEc2) -> dict:
+        """Return the pool's key pair with its private key, creating it if needed.
+
+        If the private key is gone, no idle instance can be reached, so they
+        are terminated before the key pair is replaced.
+        """
+        return self.__gcc_shared_resources.get_key_pair(
+            gcc_ec2_obj,
+            on_replace=lambda: self.__terminate_idle(
+                gcc_ec2_obj, self.__find_idle(gcc_ec2_obj)
+            ),
+        )
+
+    def get_security_group(self, gcc_ec2_obj: GccEc2) -> dict:
+        """Return the pool's security group, creating it if needed."""
+        return self.__gcc_shared_resources.get_security_group(gcc_ec2_obj)
+
+    def lease(
+        self, gcc_ec2_obj: GccEc2, instance_count: int, instance_type: str = None
+    ) -> list:
+        """Lease up to instance_count idle instances of a type and return their ids.
+
+        Stopped instances are started. Running ones are used first since
+        they need no boot. Instances another process claimed at the same time
+        are left to it, so fewer than instance_count may be returned.
+        """
+        with self.__lock:
+            idle_instances = sorted(
+                self.__find_idle(gcc_ec2_obj, instance_type or DEFAULT_INSTANCE_TYPE),
+                key=lambda instance: instance["State"]["Name"] != "running",
+            )[:instance_count]
+            instance_ids = [instance["InstanceId"] for instance in idle_instances]
+            if not instance_ids:
+                return []
+
+            lease_token = uuid.uuid4().hex
+            gcc_ec2_obj.tag_instances(
+                instance_ids, {**self.get_leased_tags(), LEASE_TAG: lease_token}
+            )
+            time.sleep(self.__lease_settle)
+            claimed_ids = {
+                instance["InstanceId"]
+                for instance in gcc_ec2_obj.find_instances(
+                    {POOL_TAG: self.__pool_name, LEASE_TAG: lease_token}, LEASE_STATES
+                )
+            }
+            idle_instances = [
+                instance
+                for instance in idle_instances
+                if instance["InstanceId"] in claimed_ids
+            ]
+            instance_ids = [instance["InstanceId"] for instance in idle_instances]
+
+        stopped_ids = [
+            instance["InstanceId"]
+            for instance in idle_instances
+            if instance["State"]["Name"] == "stopped"
+        ]
+        if stopped_ids:
+            gcc_ec2_obj.start_instances(stopped_ids)
+
+        return instance_ids
+
+    def release(self, gcc_ec2_obj: GccEc2, instance_ids: list) -> None:
+        """Return leased instances to the pool and evict instances it should not keep."""
+        if instance_ids:
+            gcc_ec2_obj.tag_instances(
+                instance_ids,
+                {
+                    POOL_TAG: self.__pool_name,
+                    STATE_TAG: "idle",
+                    IDLE_SINCE_TAG: int(time.time()),
+                    LEASE_TAG: "",
+                },
+            )
+            if self.__stop_idle:
+                gcc_ec2_obj.stop_instances(instance_ids)
+
+        self.evict(gcc_ec2_obj)
+
+    def evict(self, gcc_ec2_obj: GccEc2) -> list:
+        """Terminate idle instances past the idle TTL or beyond the size cap.
+
+        Return the ids of the terminated instances.
+        """
+        with self.__lock:
+            idle_instances = sorted(
+                self.__find_idle(gcc_ec2_obj), key=get_idle_since, reverse=True
+            )
+            max_idle = self.__max_idle
+            expired_before = time.time() - self.__idle_ttl
+            evicted = idle_instances[max_idle:] + [
+                instance
+                for instance in idle_instances[:max_idle]
+                if get_idle_since(instance) < expired_before
+            ]
+            self.__terminate_idle(gcc_ec2_obj, evicted)
+
+        return [instance["InstanceId"] for instance in evicted]
+
+    def __find_idle(self, gcc_ec2_obj: GccEc2, instance_type: str = None) -> list:
+        """Return the pool's idle instances, of any type unless one is given."""
+        return gcc_ec2_obj.find_instances(
+            {POOL_TAG: self.__pool_name, STATE_TAG: "idle"},
+            ["running", "stopped"],
+            instance_type,
+        )
+
+    def __terminate_idle(self, gcc_ec2_obj: GccEc2, instances: list) -> None:
+        """Terminate idle instances and take them out of the pool."""
+        instance_ids = [instance["InstanceId"] for instance in instances]
+        if instance_ids:
+            gcc_ec2_obj.tag_instances(instance_ids, {STATE_TAG: "evicted"})
+            gcc_ec2_obj.terminate_instances(instance_ids)
+
+
+def get_idle_since(instance: dict) -> float:
+    """Return when an instance became idle from its tags, or 0 if it has no such tag."""
+    for tag in instance.get("Tags", []):
+        if tag["Key"] == IDLE_SINCE_TAG:
+            return float(tag["Value"])
+    return 0.0
@@ -0,0 +1,67 @@
+"""This file contains methods to pick an EC2 instance type from a task's resource hints."""
+DEFAULT_INSTANCE_TYPE = "t2.micro"
+
+# (instance type, vCPUs, memory in GiB) of x86_64 instance types with dedicated
+# cores, cheapest first, so compute-optimized types win when a task asks for
+# little memory per vCPU.
+INSTANCE_TYPES = (
+    ("c5.large", 2, 4),
+    ("m5.large", 2, 8),
+    ("r5.large", 2, 16),
+    ("c5.xlarge", 4, 8),
+    ("m5.xlarge", 4, 16),
+    ("r5.xlarge", 4, 32),
+    ("c5.2xlarge", 8, 16),
+    ("m5.2xlarge", 8, 32),
+    ("r5.2xlarge", 8, 64),
+    ("c5.4xlarge", 16, 32),
+    ("m5.4xlarge", 16, 64),
+    ("r5.4xlarge", 16, 128),
+    ("c5.9xlarge", 36, 72),
+    ("m5.8xlarge", 32, 128),
+    ("r5.8xlarge", 32, 256),
+)
+
+SIZE_CLASSES = {
+    "micro": "t2.micro",
+    "small": "t2.small",
+    "medium": "c5.large",
+    "large": "c5.xlarge",
+    "xlarge": "c5.2xlarge",
+    "2xlarge": "c5.4xlarge",
+}
+
+
+def select_instance_type(
+    instance_type: str = None,
+    size_class: str = None,
+    cpu: float = None,
+    mem: float = None,
+) -> str:
+    """Return the instance type for a task's resource hints, or None without any.
+
+    An explicit instance type is used as is, then a size class, and otherwise
+    the cheapest instance type in INSTANCE_TYPES with at least cpu vCPUs and
+    mem GiB of memory.
+    """
+    if instance_type is not None:
+        return instance_type
+
+    if size_class is not None:
+        if size_class not in SIZE_CLASSES:
+            raise ValueError(
+                f"Unknown size class '{size_class}', expected one of "
+                f"{', '.join(SIZE_CLASSES)}."
+            )
+        return SIZE_CLASSES[size_class]
+
+    if cpu is None and mem is None:
+        return None
+
+    for name, type_cpu, type_mem in INSTANCE_TYPES:
+        if type_cpu >= (cpu or 0) and type_mem >= (mem or 0):
+            return name
+
+    raise ValueError(
+        f"No instance type has {cpu or 0} vCPUs and {mem or 0} GiB of memory."
+    )
@@ -0,0 +1,121 @@
+"""This file contains the GccLogUploader class."""
+# pylint: disable=W0703
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+
+class GccLogUploader:
+    """This class uploads the new parts of growing log files from a background thread."""
+
+    __interval = None
+    __watched = None
+    __lock = None
+    __thread = None
+
+    def __init__(self, interval: float = 30.0) -> None:
+        """Constructor for a GccLogUploader object.
+
+        Every interval seconds, the bytes appended to each watched log since
+        its last upload are uploaded as the log's next numbered part, so long
+        running nodes can be followed in Dropbox before they finish without
+        uploading the whole log again. Upload errors are left to the next
+        attempt, which sends the same bytes along with anything newer.
+        """
+        self.__interval = interval
+        self.__watched = {}
+        self.__lock = threading.Lock()
+
+    def get_interval(self) -> float:
+        """This method returns the __interval private variable."""
+        return self.__interval
+
+    def start_watching(
+        self, log_path: str, upload: Callable[[bytes, int], None]
+    ) -> None:
+        """Upload each new part of a log with upload, until stop_watching is called.
+
+        upload is called with the part's bytes and its number, starting at 1.
+        """
+        with self.__lock:
+            self.__watched[log_path] = {
+                "upload": upload,
+                "offset": 0,
+                "part": 1,
+                "lock": threading.Lock(),
+            }
+            if self.__thread is None:
+                self.__thread = threading.Thread(
+                    target=self.__run, name="gcc-log-uploader", daemon=True
+                )
+                self.__thread.start()
+
+    def stop_watching(self, log_path: str) -> None:
+        """Stop uploading a log, waiting for an upload of it that is in progress."""
+        with self.__lock:
+            watched_log = self.__watched.pop(log_path, None)
+
+        if watched_log is not None:
+            with watched_log["lock"]:
+                pass
+
+    @contextmanager
+    def watch(
+        self, log_path: str, upload: Callable[[bytes, int], None]
+    ) -> Iterator[None]:
+        """Upload each new part of a log with upload while the with block runs."""
+        self.start_watching(log_path, upload)
+        try:
+            yield
+        finally:
+            self.stop_watching(log_path)
+
+    def flush(self) -> int:
+        """Upload the new part of every watched log that grew since its last upload.
+
+        Return how many parts were uploaded.
+        """
+        with self.__lock:
+            watched_logs = list(self.__watched.items())
+
+        uploaded = 0
+        for log_path, watched_log in watched_logs:
+            with watched_log["lock"]:
+                try:
+                    with open(log_path, "rb") as log_file:
+                        log_file.seek(watched_log["offset"])
+                        part = log_file.read()
+                except OSError:
+                    continue
+
+                if not part:
+                    continue
+
+                try:
+                    watched_log["upload"](part, watched_log["part"])
+                except Exception:
+                    continue
+
+                watched_log["offset"] += len(part)
+                watched_log["part"] += 1
+                uploaded += 1
+
+        return uploaded
+
+    def __run(self) -> None:
+        """Flush watched logs every interval until none are watched."""
+        while True:
+            time.sleep(self.__interval)
+            self.flush()
+            with self.__lock:
+                if not self.__watched:
+                    self.__thread = None
+                    return
+
+    def __len__(self) -> int:
+        """Return the number of watched logs."""
+        return len(self.__watched)
+
+
+default_log_uploader = GccLogUploader()
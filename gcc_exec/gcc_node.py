@@ -1,38 +1,74 @@
 """This file contains the GccNode class."""
-# pylint: disable=C0301,R0914,W0612,R1721,R1702,W1514,R0912
+# pylint: disable=C0301,R0914,W0612,R1721,R1702,W1514,R0912,R0904,E0401,R0915
+import contextlib
+import functools
+import hashlib
 import json
 import os
-import socket
-import time
-from io import StringIO
 from typing import Any
 
-import paramiko
+import gcc_stage_inputs
+import gcc_telemetry
+from gcc_readiness import default_readiness_prober
+from gcc_script import GccScript
+
+BOOTSTRAP_COMMANDS = [
+    "sudo apt update -qq",
+    "sudo apt update -qq",
+    "sudo apt install unzip -y -qq",
+    "sudo apt install python3-pip -y -qq",
+    "pip3 install rpyc",
+    "pip3 install dropbox",
+]
+BASE_IMAGE_VERSION = hashlib.sha256("\n".join(BOOTSTRAP_COMMANDS).encode()).hexdigest()[
+    :12
+]
+INPUT_STAGING_WORKERS = 8
+INPUT_STAGING_ATTEMPTS = 3
 
 
 class GccNode:
     """This class contains methods to configure and execute a node in a workflow."""
 
-    __node_virtual_machine = None
-    __node_level = None
-    __node_id = None
-    __node_dependents = None
-    __node_dependencies = None
-    __node_config = None
-    __gcc_workflow_obj = None
-
-    def __init__(self, node_id: str, gcc_workflow_obj: Any) -> None:
-        """Constructor for a GccNode object."""
+    __slots__ = (
+        "__node_id",
+        "__node_index",
+        "__node_virtual_machine",
+        "__node_config",
+        "__gcc_workflow_obj",
+    )
+
+    def __init__(
+        self, node_id: str, gcc_workflow_obj: Any, node_index: int = None
+    ) -> None:
+        """Constructor for a GccNode object.
+
+        node_index is the position of the node in the workflow's GccGraph, which
+        holds its level, estimate and dependencies.
+        """
         self.__node_id = node_id
+        self.__node_index = node_index
+        self.__node_virtual_machine = None
+        self.__node_config = None
         self.__gcc_workflow_obj = gcc_workflow_obj
 
-    def set_node_level(self, node_level: int) -> None:
-        """This method sets the level of a node in a workflow plan."""
-        self.__node_level = node_level
-
     def get_node_level(self) -> int:
         """This method returns a nodes level."""
-        return self.__node_level
+        if self.__node_index is None:
+            return None
+        return self.__gcc_workflow_obj.get_gcc_graph().get_node_level(self.__node_index)
+
+    def get_node_index(self) -> int:
+        """This method returns a nodes index in the workflow graph."""
+        return self.__node_index
+
+    def get_node_instance_type(self) -> str:
+        """This method returns the instance type picked from a nodes resource hints."""
+        if self.__node_index is None:
+            return None
+        return self.__gcc_workflow_obj.get_gcc_graph().get_node_instance_type(
+            self.__node_index
+        )
 
     def get_node_id(self) -> str:
         """This method returns a nodes id"""
@@ -48,52 +84,77 @@ class GccNode:
 
     def initialize(self) -> None:
         """This method initializes a nodes virtual machine if needed."""
+        instance = self.create_virtual_machine()
+        instance.wait_until_running()
+        self.wait_for_ssh(instance.public_ip_address)
+
+    def wait_for_ssh(self, ip_address: str) -> None:
+        """This method sets a nodes ip once its virtual machine accepts SSH connections."""
+        default_readiness_prober.wait([(ip_address, 22)])
+        self.__node_virtual_machine["ip"] = ip_address
+
+    def reschedule(self) -> None:
+        """This method moves a node whose spot instance was reclaimed to an on-demand one."""
+        instance = self.create_virtual_machine(spot=False)
+        instance.wait_until_running()
+        self.wait_for_ssh(instance.public_ip_address)
+        self.configure_virtual_machine()
+
+    def create_virtual_machine(self, spot: bool = None) -> Any:
+        """This method launches a nodes virtual machine and returns its boto3 instance.
+
+        The virtual machine is a spot instance if spot is True, or if it is None
+        and the workflow uses spot instances.
+        """
+        if spot is None:
+            spot = self.__gcc_workflow_obj.get_spot_instances()
         security_group = self.__gcc_workflow_obj.get_gcc_security_group()
         key_pair = self.__gcc_workflow_obj.get_gcc_key_pair()
-        retry_count = 0
 
-        result = self.__gcc_workflow_obj.get_gcc_ec2_obj().create_instance(
-            key_pair["KeyName"], security_group["GroupId"]
-        )
+        gcc_ec2_obj = self.__gcc_workflow_obj.get_gcc_ec2_obj()
+
+        with self.__limit("ec2"):
+            base_image_id = gcc_ec2_obj.find_base_image(BASE_IMAGE_VERSION)
+            result = gcc_ec2_obj.create_instance(
+                key_pair["KeyName"],
+                security_group["GroupId"],
+                base_image_id,
+                self.get_node_instance_type(),
+                spot,
+            )
         self.__node_virtual_machine = {
             "ip": None,
             "pem": key_pair["KeyMaterial"],
             "instance_id": result["Instances"][0]["InstanceId"],
+            "bootstrapped": base_image_id is not None,
         }
 
-        instance = self.__gcc_workflow_obj.get_gcc_ec2_obj().get_instance_object(
+        return self.__gcc_workflow_obj.get_gcc_ec2_obj().get_instance_object(
             self.__node_virtual_machine["instance_id"]
         )
-        instance.wait_until_running()
-
-        while retry_count <= 20:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            result = sock.connect_ex((instance.public_ip_address, 22))
-            if result == 0:
-                if instance.public_ip_address is not None:
-                    self.__node_virtual_machine["ip"] = instance.public_ip_address
-                    break
-            else:
-                time.sleep(10)
 
     def set_config_commands(self) -> None:
         """Set the configuration commands for a specific node on it's virtual machine."""
         drbx_node_path = f"/{self.__gcc_workflow_obj.get_workflow_dict()['name']}/nodes/{self.__node_id}.zip"
-        drbx_node_link = self.__gcc_workflow_obj.get_gcc_drbx_obj().get_file_link(
-            drbx_node_path
-        )
+        with self.__limit("drbx"):
+            drbx_node_link = self.__gcc_workflow_obj.get_gcc_drbx_obj().get_file_link(
+                drbx_node_path
+            )
+            drbx_node_hash = (
+                self.__gcc_workflow_obj.get_gcc_drbx_obj().get_file_content_hash(
+                    drbx_node_path
+                )
+            )
+
+        gcc_backend = self.__gcc_workflow_obj.get_gcc_backend()
+        home_dir = gcc_backend.get_home_dir(self)
 
         self.__node_config = {
             "config_commands": [
-                f"sudo rm -rf /home/ubuntu/{self.__node_id}",
-                "sudo apt update -qq",
-                "sudo apt update -qq",
-                "sudo apt install unzip -y -qq",
-                "sudo apt install python3-pip -y -qq",
-                "pip3 install rpyc",
-                "pip3 install dropbox",
-                f"wget {drbx_node_link} -O {self.__node_id}.zip",
-                f"unzip {self.__node_id}.zip -d /home/ubuntu",
+                gcc_backend.get_cleanup_command(self, f"{home_dir}/{self.__node_id}"),
+                self.__gcc_workflow_obj.get_gcc_payload_cache().get_install_command(
+                    home_dir, drbx_node_link, drbx_node_hash
+                ),
             ],
             "receiving_ports": None,
             "receiving_args": None,
@@ -103,74 +164,63 @@ class GccNode:
             "dropbox_args_str": None,
         }
 
+        if not self.__node_virtual_machine.get("bootstrapped"):
+            self.__node_config["config_commands"][1:1] = BOOTSTRAP_COMMANDS
+
         if self.__gcc_workflow_obj.get_workflow_dict()["type"] == 1:
-            port = 5001
-
-            if self.__node_dependencies is not None:
-                for node_dependency in self.__node_dependencies:
-                    receiving_args_dict = {
-                        "host": "0.0.0.0",
-                        "port": port,
-                        "outdir": "data/in",
-                    }
-
-                    if self.__node_config["receiving_args"] is None:
-                        self.__node_config["receiving_args"] = [receiving_args_dict]
-                    elif isinstance(self.__node_config["receiving_args"], list):
-                        self.__node_config["receiving_args"].append(receiving_args_dict)
-
-                    if self.__node_config["receiving_ports"] is None:
-                        self.__node_config["receiving_ports"] = [port]
-                    elif isinstance(self.__node_config["receiving_ports"], list):
-                        self.__node_config["receiving_ports"].append(port)
-
-                    port += 1
-
-                    gcc_workflow_name = self.__gcc_workflow_obj.get_workflow_dict()[
-                        "name"
-                    ]
-                    gcc_drbx_obj = self.__gcc_workflow_obj.get_gcc_drbx_obj()
-
-                    for node_id in node_dependency:
-                        if node_id is None:
-                            for file in node_dependency[node_id]:
-                                if file == "*":
-                                    for __file__ in gcc_drbx_obj.list_files(
-                                        f"/{self.__gcc_workflow_obj.get_workflow_dict()['name']}/data"
-                                    ):
-                                        self.__node_config["config_commands"].append(
-                                            f"wget {gcc_drbx_obj.get_file_link(f'/{gcc_workflow_name}/data/{__file__}')} -O /home/ubuntu/{self.__node_id}/data/in/{__file__}"
-                                        )
-                                else:
-                                    self.__node_config["config_commands"].append(
-                                        f"wget {gcc_drbx_obj.get_file_link(f'/{gcc_workflow_name}/data/{file}')} -O /home/ubuntu/{self.__node_id}/data/in/{file}"
-                                    )
-
-            if self.__node_dependents is not None:
-                for node_dependent in self.__node_dependents:
-                    filedictlist = []
-
-                    for node_id in node_dependent:
-                        for file in node_dependent[node_id]:
-                            filedict = {"filename": file, "filedir": "data/out"}
-                            filedictlist.append(filedict)
-
-                        sending_to_node = self.__gcc_workflow_obj.get_workflow_dict()[
-                            "nodes"
-                        ][node_id]
-
-                        sending_args_dict = {
-                            "host": sending_to_node.get_node_virtual_machine()["ip"],
-                            "filedictlist": filedictlist,
-                            "port": sending_to_node.get_node_config()[
-                                "receiving_ports"
-                            ].pop(),
-                        }
-
-                        if self.__node_config["sending_args"] is None:
-                            self.__node_config["sending_args"] = [sending_args_dict]
-                        elif isinstance(self.__node_config["sending_args"], list):
-                            self.__node_config["sending_args"].append(sending_args_dict)
+            dependency_items = self.get_node_dependency_items()
+            port = self.__gcc_workflow_obj.get_gcc_backend().reserve_ports(
+                self, len(dependency_items)
+            )
+            input_files = []
+
+            for node_id, dep_files in dependency_items:
+                receiving_args_dict = {
+                    "host": "0.0.0.0",
+                    "port": port,
+                    "outdir": "data/in",
+                }
+
+                if self.__node_config["receiving_args"] is None:
+                    self.__node_config["receiving_args"] = [receiving_args_dict]
+                elif isinstance(self.__node_config["receiving_args"], list):
+                    self.__node_config["receiving_args"].append(receiving_args_dict)
+
+                if self.__node_config["receiving_ports"] is None:
+                    self.__node_config["receiving_ports"] = [port]
+                elif isinstance(self.__node_config["receiving_ports"], list):
+                    self.__node_config["receiving_ports"].append(port)
+
+                port += 1
+
+                if node_id is None:
+                    input_files += self.get_input_files(node_id, dep_files)
+
+            self.__node_config["config_commands"] += self.get_download_commands(
+                input_files, home_dir
+            )
+
+            for node_id, dep_files in self.get_node_dependent_items():
+                filedictlist = []
+
+                for file in dep_files:
+                    filedict = {"filename": file, "filedir": "data/out"}
+                    filedictlist.append(filedict)
+
+                sending_to_node = self.__gcc_workflow_obj.get_workflow_dict()["nodes"][
+                    node_id
+                ]
+
+                sending_args_dict = {
+                    "host": sending_to_node.get_node_virtual_machine()["ip"],
+                    "filedictlist": filedictlist,
+                    "port": sending_to_node.get_node_config()["receiving_ports"].pop(),
+                }
+
+                if self.__node_config["sending_args"] is None:
+                    self.__node_config["sending_args"] = [sending_args_dict]
+                elif isinstance(self.__node_config["sending_args"], list):
+                    self.__node_config["sending_args"].append(sending_args_dict)
 
             if self.__node_config["sending_args"] is None:
                 self.__node_config["sending_args_str"] = json.dumps(str([]))
@@ -195,130 +245,343 @@ class GccNode:
         }
         self.__node_config["dropbox_args_str"] = json.dumps(str(uda_dict))
 
-        self.__node_config["config_commands"] += [
-            f"cd {self.__node_id};pip3 install -r requirements.txt",
-            "exit",
-        ]
+        drbx_wheelhouse_path = self.__gcc_workflow_obj.get_gcc_wheelhouse().prepare(
+            self.__gcc_workflow_obj.get_gcc_drbx_obj(),
+            self.__gcc_workflow_obj.get_workflow_dict()["name"],
+            self.__node_id,
+            drbx_node_link,
+            drbx_node_hash,
+            functools.partial(self.__limit, "drbx"),
+        )
+        if drbx_wheelhouse_path is None:
+            install_command = f"cd {self.__node_id};pip3 install -r requirements.txt"
+        else:
+            with self.__limit("drbx"):
+                drbx_wheelhouse_link = (
+                    self.__gcc_workflow_obj.get_gcc_drbx_obj().get_file_link(
+                        drbx_wheelhouse_path
+                    )
+                )
+            install_command = (
+                self.__gcc_workflow_obj.get_gcc_wheelhouse().get_install_command(
+                    home_dir, self.__node_id, drbx_wheelhouse_path, drbx_wheelhouse_link
+                )
+            )
+
+        self.__node_config["config_commands"] += [install_command, "exit"]
 
     def configure_virtual_machine(self) -> None:
         """Execute configuration commands on a virtual machine."""
-        keyfile = StringIO(self.__node_virtual_machine["pem"])
-        mykey = paramiko.RSAKey.from_private_key(keyfile)
-        client = paramiko.SSHClient()
-        client.load_system_host_keys()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        client.connect(self.__node_virtual_machine["ip"], username="ubuntu", pkey=mykey)
-
-        with open(
-            f"{os.getcwd()}/tmp/{self.__gcc_workflow_obj.get_tmp_dir()}/{self.__node_id}_logs.txt",
-            "w+",
-        ) as log_file:
-            for comm in self.__node_config["config_commands"]:
-                stdin, stdout, stderr = client.exec_command(comm)
-
-                log_file.write(f"\n[{comm}]\n")
-                log_file.writelines([line for line in stdout])
-
-        log_file.close()
-        client.close()
+        with self.__limit("ssh"):
+            self.__node_config["config_results"] = self.run_script(
+                self.__node_config["config_commands"], "w+", "\n[{}]\n"
+            )
 
     def execute(self) -> None:
         """Execute execution commands on a virtual machine."""
+        exec_commands = self.get_exec_commands()
+
+        # Type 1 nodes stream to each other, so none of them may wait for an
+        # SSH slot held by another.
+        if self.__gcc_workflow_obj.get_workflow_dict()["type"] == 1:
+            ssh_limit = contextlib.nullcontext()
+        else:
+            ssh_limit = self.__limit("ssh")
+
+        with self.__gcc_workflow_obj.get_gcc_log_uploader().watch(
+            self.get_log_path(), self.upload_log_part
+        ), ssh_limit:
+            self.run_commands(exec_commands, "a+", "\n[{}]\n\n")
+
+        self.upload_telemetry()
+        self.upload_log()
+
+    def get_exec_commands(self) -> list:
+        """Get the commands that fetch a nodes inputs and run its payload."""
         exec_commands = []
 
         if self.__gcc_workflow_obj.get_workflow_dict()["type"] == 1:
             exec_commands += [
-                f"cd {self.__node_id};chmod +x run.sh;./run.sh {self.__node_config['receiving_args_str']} {self.__node_config['sending_args_str']} {self.__node_config['dropbox_args_str']}",
+                f"cd {self.__node_id};chmod +x run.sh;{self.get_payload_command()} {self.__node_config['receiving_args_str']} {self.__node_config['sending_args_str']} {self.__node_config['dropbox_args_str']}",
                 "exit",
             ]
 
         elif self.__gcc_workflow_obj.get_workflow_dict()["type"] == 0:
-            gcc_workflow_name = self.__gcc_workflow_obj.get_workflow_dict()["name"]
-            gcc_drbx_obj = self.__gcc_workflow_obj.get_gcc_drbx_obj()
-
-            if self.__node_dependencies is not None:
-                for node_dependency in self.__node_dependencies:
-                    for node_id in node_dependency:
-                        if node_id is not None:
-                            for file in node_dependency[node_id]:
-                                if file == "*":
-                                    for __file__ in gcc_drbx_obj.list_files(
-                                        f"/{gcc_workflow_name}/exec/{self.__gcc_workflow_obj.get_exec_date_time()}/{node_id}/data/out"
-                                    ):
-                                        exec_commands.append(
-                                            f"wget {gcc_drbx_obj.get_file_link(f'/{gcc_workflow_name}/exec/{self.__gcc_workflow_obj.get_exec_date_time()}/{node_id}/data/out/{__file__}')} -O /home/ubuntu/{self.__node_id}/data/in/{__file__}"
-                                        )
-                                else:
-                                    exec_commands.append(
-                                        f"wget {gcc_drbx_obj.get_file_link(f'/{gcc_workflow_name}/exec/{self.__gcc_workflow_obj.get_exec_date_time()}/{node_id}/data/out/{file}')} -O /home/ubuntu/{self.__node_id}/data/in/{file}"
-                                    )
-                        else:
-                            for file in node_dependency[node_id]:
-                                if file == "*":
-                                    for __file__ in gcc_drbx_obj.list_files(
-                                        f"/{gcc_workflow_name}/data"
-                                    ):
-                                        exec_commands.append(
-                                            f"wget {gcc_drbx_obj.get_file_link(f'/{gcc_workflow_name}/data/{__file__}')} -O /home/ubuntu/{self.__node_id}/data/in/{__file__}"
-                                        )
-                                else:
-                                    exec_commands.append(
-                                        f"wget {gcc_drbx_obj.get_file_link(f'/{gcc_workflow_name}/data/{file}')} -O /home/ubuntu/{self.__node_id}/data/in/{file}"
-                                    )
+            home_dir = self.__gcc_workflow_obj.get_gcc_backend().get_home_dir(self)
+
+            input_files = []
+            for node_id, dep_files in self.get_node_dependency_items():
+                input_files += self.get_input_files(node_id, dep_files)
+
+            exec_commands += self.get_staging_commands(input_files, home_dir)
 
             exec_commands += [
-                f"cd {self.__node_id};chmod +x run.sh;./run.sh {self.__node_config['dropbox_args_str']}",
+                f"cd {self.__node_id};chmod +x run.sh;{self.get_payload_command()} {self.__node_config['dropbox_args_str']}",
                 "exit",
             ]
 
-        keyfile = StringIO(self.__node_virtual_machine["pem"])
-        mykey = paramiko.RSAKey.from_private_key(keyfile)
-        client = paramiko.SSHClient()
-        client.load_system_host_keys()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        client.connect(self.__node_virtual_machine["ip"], username="ubuntu", pkey=mykey)
-
-        with open(
-            f"{os.getcwd()}/tmp/{self.__gcc_workflow_obj.get_tmp_dir()}/{self.__node_id}_logs.txt",
-            "a+",
-        ) as log_file:
-            for comm in exec_commands:
-                stdin, stdout, stderr = client.exec_command(comm)
-
-                log_file.write(f"\n[{comm}]\n\n")
-                log_file.writelines([line for line in stdout])
-
-        log_file.close()
-        client.close()
-
-        self.__gcc_workflow_obj.get_gcc_drbx_obj().upload_file(
-            f"{os.getcwd()}/tmp/{self.__gcc_workflow_obj.get_tmp_dir()}/{self.__node_id}_logs.txt",
-            f"/{self.__gcc_workflow_obj.get_workflow_dict()['name']}/exec/{self.__gcc_workflow_obj.get_exec_date_time()}/{self.__node_id}/{self.__node_id}_logs.txt",
+        return exec_commands
+
+    def get_payload_command(self) -> str:
+        """Get the command that starts run.sh from a nodes folder, sampled by gcc_telemetry if enabled."""
+        telemetry_interval = self.__gcc_workflow_obj.get_telemetry_interval()
+        if telemetry_interval is None:
+            return "./run.sh"
+
+        with self.__limit("ssh"):
+            self.__gcc_workflow_obj.get_gcc_backend().transfer(
+                self, gcc_telemetry.__file__, f"{self.__node_id}/.gcc_telemetry.py"
+            )
+
+        return f"python3 .gcc_telemetry.py {telemetry_interval} .gcc_telemetry.csv ./run.sh"
+
+    def get_input_files(self, node_id: str, dep_files: list) -> list:
+        """Get the Dropbox path, name and metadata of each file a node receives from a dependency.
+
+        A node_id of None stands for the workflow's data folder, and a file of
+        "*" for every file in the folder. The metadata holds the size and
+        content hash of the file, or is empty if it is not in the folder.
+        """
+        gcc_workflow_name = self.__gcc_workflow_obj.get_workflow_dict()["name"]
+        if node_id is None:
+            drbx_folder_path = f"/{gcc_workflow_name}/data"
+        else:
+            drbx_folder_path = f"/{gcc_workflow_name}/exec/{self.__gcc_workflow_obj.get_exec_date_time()}/{node_id}/data/out"
+
+        with self.__limit("drbx"):
+            folder_files = (
+                self.__gcc_workflow_obj.get_gcc_drbx_obj().list_file_metadata(
+                    drbx_folder_path
+                )
+            )
+
+        file_names = []
+        for file in dep_files:
+            if file == "*":
+                file_names += list(folder_files)
+            else:
+                file_names.append(file)
+
+        return [
+            (f"{drbx_folder_path}/{file}", file, folder_files.get(file, {}))
+            for file in file_names
+        ]
+
+    def get_download_commands(self, input_files: list, home_dir: str) -> list:
+        """Get the commands that download input files into a nodes data/in folder."""
+        drbx_links = self.__gcc_workflow_obj.get_gcc_drbx_obj().get_file_links(
+            [drbx_file_path for drbx_file_path, _, _ in input_files],
+            functools.partial(self.__limit, "drbx"),
         )
 
+        return [
+            f"wget {drbx_link} -O {home_dir}/{self.__node_id}/data/in/{file}"
+            for drbx_link, (_, file, _) in zip(drbx_links, input_files)
+        ]
+
+    def get_staging_commands(self, input_files: list, home_dir: str) -> list:
+        """Get the command that downloads and verifies all input files of a node at once.
+
+        The files are listed in a manifest that is copied to the nodes machine
+        along with gcc_stage_inputs, which downloads them on
+        INPUT_STAGING_WORKERS threads and checks their size and content hash.
+        """
+        if not input_files:
+            return []
+
+        drbx_links = self.__gcc_workflow_obj.get_gcc_drbx_obj().get_file_links(
+            [drbx_file_path for drbx_file_path, _, _ in input_files],
+            functools.partial(self.__limit, "drbx"),
+        )
+
+        manifest = {
+            "workers": INPUT_STAGING_WORKERS,
+            "attempts": INPUT_STAGING_ATTEMPTS,
+            "files": [
+                {
+                    "link": drbx_link,
+                    "path": f"{home_dir}/{self.__node_id}/data/in/{file}",
+                    "size": file_metadata.get("size"),
+                    "content_hash": file_metadata.get("content_hash"),
+                }
+                for drbx_link, (_, file, file_metadata) in zip(drbx_links, input_files)
+            ],
+        }
+        manifest_path = f"{os.getcwd()}/tmp/{self.__gcc_workflow_obj.get_tmp_dir()}/{self.__node_id}_inputs.json"
+        with open(manifest_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+
+        with self.__limit("ssh"):
+            self.__gcc_workflow_obj.get_gcc_backend().transfer(
+                self,
+                gcc_stage_inputs.__file__,
+                f"{self.__node_id}/.gcc_stage_inputs.py",
+            )
+            self.__gcc_workflow_obj.get_gcc_backend().transfer(
+                self, manifest_path, f"{self.__node_id}/.gcc_inputs.json"
+            )
+
+        return [
+            f"python3 {home_dir}/{self.__node_id}/.gcc_stage_inputs.py {home_dir}/{self.__node_id}/.gcc_inputs.json"
+        ]
+
+    def run_commands(self, commands: list, log_mode: str, log_header: str) -> None:
+        """Run commands one at a time on a nodes machine and stream their output to the node log."""
+        self.__gcc_workflow_obj.get_gcc_backend().run_commands(
+            self, commands, log_mode, log_header
+        )
+
+    def run_script(self, commands: list, log_mode: str, log_header: str) -> list:
+        """Run commands as one script on a nodes machine and return the result of each step."""
+        gcc_script_obj = GccScript(commands)
+        output = self.__gcc_workflow_obj.get_gcc_backend().run_script(
+            self, gcc_script_obj.get_source()
+        )
+        return self.write_script_log(gcc_script_obj.parse(output), log_mode, log_header)
+
+    def write_script_log(
+        self, script_results: list, log_mode: str, log_header: str
+    ) -> list:
+        """Write the output of each script step to the node log and return the step results.
+
+        Steps that did not exit with 0 get a line with their exit code after
+        their output.
+        """
+        with open(self.get_log_path(), log_mode) as log_file:
+            for step_result in script_results:
+                log_file.write(log_header.format(step_result["command"]))
+                log_file.write(step_result["output"])
+                if step_result["exit_code"] != 0:
+                    log_file.write(
+                        f"[exit code {step_result['exit_code']} after "
+                        f"{step_result['seconds']}s]\n"
+                    )
+
+        return [
+            {key: value for key, value in step_result.items() if key != "output"}
+            for step_result in script_results
+        ]
+
+    def get_log_path(self) -> str:
+        """Get the local path of the node log."""
+        return f"{os.getcwd()}/tmp/{self.__gcc_workflow_obj.get_tmp_dir()}/{self.__node_id}_logs.txt"
+
+    def upload_log(self) -> None:
+        """Upload the node log next to the nodes execution output.
+
+        The parts uploaded while the node ran are deleted once the whole log
+        is there.
+        """
+        drbx_log_path = f"/{self.__gcc_workflow_obj.get_workflow_dict()['name']}/exec/{self.__gcc_workflow_obj.get_exec_date_time()}/{self.__node_id}/{self.__node_id}_logs"
+        with self.__limit("drbx"):
+            self.__gcc_workflow_obj.get_gcc_drbx_obj().upload_file(
+                self.get_log_path(), f"{drbx_log_path}.txt"
+            )
+            if self.__node_config.pop("log_parts", 0):
+                self.__gcc_workflow_obj.get_gcc_drbx_obj().delete(drbx_log_path)
+
+    def upload_log_part(self, part: bytes, part_number: int) -> None:
+        """Upload a part of the node log written while the node runs."""
+        with self.__limit("drbx"):
+            self.__gcc_workflow_obj.get_gcc_drbx_obj().upload_data(
+                part,
+                f"/{self.__gcc_workflow_obj.get_workflow_dict()['name']}/exec/{self.__gcc_workflow_obj.get_exec_date_time()}/{self.__node_id}/{self.__node_id}_logs/{part_number:05d}.txt",
+            )
+        self.__node_config["log_parts"] = part_number
+
+    def upload_telemetry(self) -> None:
+        """Upload the resource samples taken while the node ran next to its log.
+
+        Nothing is uploaded if telemetry is disabled or the machine recorded no
+        samples.
+        """
+        if self.__gcc_workflow_obj.get_telemetry_interval() is None:
+            return
+
+        telemetry_path = f"{os.getcwd()}/tmp/{self.__gcc_workflow_obj.get_tmp_dir()}/{self.__node_id}_telemetry.csv"
+        try:
+            with self.__limit("ssh"):
+                self.__gcc_workflow_obj.get_gcc_backend().fetch(
+                    self, f"{self.__node_id}/.gcc_telemetry.csv", telemetry_path
+                )
+        except OSError:
+            return
+
+        with self.__limit("drbx"):
+            self.__gcc_workflow_obj.get_gcc_drbx_obj().upload_file(
+                telemetry_path,
+                f"/{self.__gcc_workflow_obj.get_workflow_dict()['name']}/exec/{self.__gcc_workflow_obj.get_exec_date_time()}/{self.__node_id}/{self.__node_id}_telemetry.csv",
+            )
+
     def terminate(self) -> None:
         """Terminate the virtual machine associated with a node if needed."""
         if self.__node_virtual_machine["instance_id"] is not None:
-            self.__gcc_workflow_obj.get_gcc_ec2_obj().terminate_instance(
-                self.__node_virtual_machine["instance_id"]
+            with self.__limit("ec2"):
+                self.__gcc_workflow_obj.get_gcc_ec2_obj().terminate_instance(
+                    self.__node_virtual_machine["instance_id"]
+                )
+
+    def get_node_dependency_items(self) -> list:
+        """Get (node id, files) pairs for node dependencies, with a node id of None for workflow data."""
+        if self.__node_index is None:
+            return []
+        return [
+            (dep_node_id, dep_files)
+            for dep_node_id, dep_files, _ in self.__gcc_workflow_obj.get_gcc_graph().get_node_dependencies(
+                self.__node_index
             )
+        ]
 
-    def set_node_dependencies(self, node_dependencies: list) -> None:
-        """Set node dependencies."""
-        self.__node_dependencies = node_dependencies
+    def get_node_dependent_items(self) -> list:
+        """Get (node id, files) pairs for node dependents."""
+        if self.__node_index is None:
+            return []
+        return list(
+            self.__gcc_workflow_obj.get_gcc_graph().get_node_dependents(
+                self.__node_index
+            )
+        )
 
     def get_node_dependencies(self) -> list:
-        """Get node dependencies."""
-        return self.__node_dependencies
-
-    def set_node_dependents(self, node_dependents: list) -> None:
-        """Set node dependents."""
-        self.__node_dependents = node_dependents
+        """Get node dependencies as a list of {node id: files} dicts, or None."""
+        node_dependencies = [
+            {dep_node_id: list(dep_files) if dep_files is not None else None}
+            for dep_node_id, dep_files in self.get_node_dependency_items()
+        ]
+        return node_dependencies or None
 
     def get_node_dependents(self) -> list:
-        """Get node dependents."""
-        return self.__node_dependents
+        """Get node dependents as a list of {node id: files} dicts, or None."""
+        node_dependents = [
+            {dependent_id: list(dep_files) if dep_files is not None else None}
+            for dependent_id, dep_files in self.get_node_dependent_items()
+        ]
+        return node_dependents or None
+
+    def __limit(self, resource: str) -> Any:
+        """Hold one of the workflow worker pool's slots for a resource."""
+        return self.__gcc_workflow_obj.get_gcc_worker_pool().limit(resource)
 
     def get_node_config(self) -> dict:
         """Get node configuration."""
         return self.__node_config
+
+    def get_node_estimate(self) -> float:
+        """Get the estimated runtime of a node in seconds."""
+        if self.__node_index is None:
+            return 0.0
+        return self.__gcc_workflow_obj.get_gcc_graph().get_node_estimate(
+            self.__node_index
+        )
+
+    def get_node_dependency_sizes(self) -> dict:
+        """Get the estimated size in megabytes of the data each dependency sends."""
+        if self.__node_index is None:
+            return {}
+        return {
+            dep_node_id: dep_size
+            for dep_node_id, _, dep_size in self.__gcc_workflow_obj.get_gcc_graph().get_node_dependencies(
+                self.__node_index
+            )
+            if dep_node_id is not None and dep_size is not None
+        }
@@ -0,0 +1,74 @@
+"""This file contains the GccPayloadCache class."""
+# pylint: disable=R0903
+import re
+
+CONTENT_HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class GccPayloadCache:
+    """This class keeps unpacked node zips on a node's machine, keyed by their content hash."""
+
+    __cache_dir = None
+    __quota_mb = None
+
+    def __init__(self, cache_dir: str = ".gcc/payloads", quota_mb: int = 4096) -> None:
+        """Constructor for a GccPayloadCache object.
+
+        Node zips are unpacked into cache_dir, relative to a node's home
+        directory, under their Dropbox content hash. A node whose zip is
+        already there is copied from it instead of being downloaded and
+        unpacked. Once the cache holds more than quota_mb megabytes, the least
+        recently used zips are evicted.
+        """
+        self.__cache_dir = cache_dir
+        self.__quota_mb = quota_mb
+
+    def get_cache_dir(self) -> str:
+        """This method returns the __cache_dir private variable."""
+        return self.__cache_dir
+
+    def get_quota_mb(self) -> int:
+        """This method returns the __quota_mb private variable."""
+        return self.__quota_mb
+
+    def get_install_command(
+        self, home_dir: str, drbx_node_link: str, content_hash: str
+    ) -> str:
+        """Return a command that unpacks a node zip into home_dir from the cache.
+
+        On a miss the zip is downloaded and unpacked into the cache first, and
+        only kept once both have succeeded. Installs on one machine take turns
+        through a lock file next to the cache, so no node evicts an entry
+        another is filling or copying. Raise ValueError if content_hash is not
+        a Dropbox content hash.
+        """
+        if not CONTENT_HASH_PATTERN.match(content_hash):
+            raise ValueError(f"'{content_hash}' is not a Dropbox content hash.")
+
+        cache_dir = f"{home_dir}/{self.__cache_dir}"
+        entry = f"{cache_dir}/{content_hash}"
+
+        # Nodes sharing a machine install at the same time, so every step that
+        # touches the cache holds a lock on it.
+        return (
+            f"mkdir -p {cache_dir}; "
+            "( flock 9 || exit 1; "
+            f"if [ ! -d {entry} ]; then "
+            f"rm -rf {entry}.partial {entry}.zip; "
+            f"wget '{drbx_node_link}' -O {entry}.zip "
+            f"&& unzip {entry}.zip -d {entry}.partial "
+            f"&& mv {entry}.partial {entry}; "
+            f"rm -rf {entry}.partial {entry}.zip; "
+            f"else echo 'Payload {content_hash} is cached.'; fi; "
+            f"[ -d {entry} ] || exit 1; "
+            f"touch {entry}; "
+            f"for old in $(ls -1dtr {cache_dir}/*/); do "
+            f'[ "$(du -sk {cache_dir} | cut -f1)" -le {self.__quota_mb * 1024} ] && break; '
+            f'[ "${{old%/}}" = {entry} ] || rm -rf "$old"; '
+            "done; "
+            f"cp -a --reflink=auto {entry}/. {home_dir}/ "
+            f") 9>{cache_dir}.lock"
+        )
+
+
+default_payload_cache = GccPayloadCache()
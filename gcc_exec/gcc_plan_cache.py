@@ -0,0 +1,54 @@
+"""This file contains the GccPlanCache class."""
+import json
+import threading
+import zlib
+from collections import OrderedDict
+
+
+class GccPlanCache:
+    """This class keeps compiled workflow plans keyed by the hash of their specification."""
+
+    __max_entries = None
+    __entries = None
+    __lock = None
+
+    def __init__(self, max_entries: int = 128) -> None:
+        """Constructor for a GccPlanCache object."""
+        self.__max_entries = max_entries
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, plan_cache_key: str) -> dict:
+        """Return the compiled plan stored under a key, or None if it is not cached."""
+        with self.__lock:
+            try:
+                compressed_plan = self.__entries[plan_cache_key]
+            except KeyError:
+                return None
+            self.__entries.move_to_end(plan_cache_key)
+
+        return json.loads(zlib.decompress(compressed_plan))
+
+    def put(self, plan_cache_key: str, compiled_plan: dict) -> None:
+        """Store a compiled plan under a key, evicting the least recently used plans."""
+        compressed_plan = zlib.compress(
+            json.dumps(compiled_plan, separators=(",", ":")).encode()
+        )
+
+        with self.__lock:
+            self.__entries[plan_cache_key] = compressed_plan
+            self.__entries.move_to_end(plan_cache_key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every cached plan."""
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        """Return the number of cached plans."""
+        return len(self.__entries)
+
+
+default_plan_cache = GccPlanCache()
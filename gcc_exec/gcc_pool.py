@@ -0,0 +1,99 @@
+"""This file contains the GccWorkerPool class."""
+import threading
+from concurrent.futures import Future, wait
+from concurrent.futures.thread import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator
+
+PHASES = ("initialize", "configure", "execute", "complete")
+RESOURCES = ("ec2", "ssh", "drbx")
+
+
+class GccWorkerPool:
+    """This class runs node work for every workflow on one bounded set of threads."""
+
+    __max_workers = None
+    __executor = None
+    __phase_limits = None
+    __phase_semaphores = None
+    __resource_limits = None
+    __resource_semaphores = None
+
+    def __init__(
+        self,
+        max_workers: int = 64,
+        phase_limits: dict = None,
+        resource_limits: dict = None,
+    ) -> None:
+        """Constructor for a GccWorkerPool object.
+
+        phase_limits caps how many tasks of a phase (initialize, configure,
+        execute, complete) run at once and resource_limits caps concurrent EC2
+        calls, SSH sessions and Dropbox calls. Anything not given is capped by
+        max_workers alone.
+        """
+        self.__max_workers = max_workers
+        self.__executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="gcc"
+        )
+        self.__phase_limits = {
+            **dict.fromkeys(PHASES, max_workers),
+            **(phase_limits or {}),
+        }
+        self.__resource_limits = {
+            **dict.fromkeys(RESOURCES, max_workers),
+            **(resource_limits or {}),
+        }
+        self.__phase_semaphores = {
+            phase: threading.BoundedSemaphore(limit)
+            for phase, limit in self.__phase_limits.items()
+        }
+        self.__resource_semaphores = {
+            resource: threading.BoundedSemaphore(limit)
+            for resource, limit in self.__resource_limits.items()
+        }
+
+    def get_max_workers(self) -> int:
+        """This method returns the __max_workers private variable."""
+        return self.__max_workers
+
+    def get_phase_limit(self, phase: str) -> int:
+        """This method returns how many tasks of a phase can run at once."""
+        return min(self.__max_workers, self.__phase_limits[phase])
+
+    def get_resource_limit(self, resource: str) -> int:
+        """This method returns how many holders a resource allows at once."""
+        return self.__resource_limits[resource]
+
+    def submit(self, phase: str, function: Callable, *args: Any) -> Future:
+        """Submit a task to a phase, blocking while the phase is at its limit."""
+        semaphore = self.__phase_semaphores[phase]
+        semaphore.acquire()
+        try:
+            future = self.__executor.submit(function, *args)
+        except BaseException:
+            semaphore.release()
+            raise
+        future.add_done_callback(lambda _: semaphore.release())
+        return future
+
+    def map(self, phase: str, function: Callable, items: Iterable) -> list:
+        """Run a function on every item within a phase's limit and wait for them all."""
+        futures = [self.submit(phase, function, item) for item in items]
+        wait(futures)
+        return futures
+
+    @contextmanager
+    def limit(self, resource: str) -> Iterator[None]:
+        """Hold one of a resource's slots, waiting for one to free up if needed."""
+        with self.__resource_semaphores[resource]:
+            yield
+
+    def shutdown(self) -> None:
+        """Wait for submitted tasks and stop the pool's threads."""
+        self.__executor.shutdown(wait=True)
+
+
+default_worker_pool = GccWorkerPool(
+    max_workers=64, resource_limits={"ec2": 8, "drbx": 16}
+)
@@ -0,0 +1,134 @@
+"""This file contains the GccReadinessProber class."""
+# pylint: disable=R0903
+import errno
+import selectors
+import socket
+import time
+
+IN_PROGRESS_ERRNOS = (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN)
+
+
+class GccReadinessProber:
+    """This class waits for many TCP ports to accept connections from a single thread."""
+
+    __connect_timeout = None
+    __min_delay = None
+    __max_delay = None
+    __max_connections = None
+
+    def __init__(
+        self,
+        connect_timeout: float = 1.0,
+        min_delay: float = 0.05,
+        max_delay: float = 0.5,
+        max_connections: int = 256,
+    ) -> None:
+        """Constructor for a GccReadinessProber object.
+
+        Every pending address gets a non-blocking connect attempt that is given
+        up after connect_timeout seconds. Failed addresses are tried again after
+        a delay that doubles from min_delay up to max_delay, and at most
+        max_connections attempts are in flight at once.
+        """
+        self.__connect_timeout = connect_timeout
+        self.__min_delay = min_delay
+        self.__max_delay = max_delay
+        self.__max_connections = max_connections
+
+    def wait(self, addresses: list, timeout: float = 300.0) -> None:
+        """Return once every (host, port) in a list accepts TCP connections.
+
+        Raise TimeoutError naming the addresses that are still closed after
+        timeout seconds.
+        """
+        deadline = time.monotonic() + timeout
+        next_attempts = {address: time.monotonic() for address in set(addresses)}
+        delays = dict.fromkeys(next_attempts, self.__min_delay)
+
+        with selectors.DefaultSelector() as selector:
+            try:
+                while next_attempts or selector.get_map():
+                    now = time.monotonic()
+                    if now >= deadline:
+                        closed = sorted(
+                            list(next_attempts)
+                            + [key.data[0] for key in selector.get_map().values()]
+                        )
+                        raise TimeoutError(
+                            "Timed out waiting for "
+                            f"{', '.join(f'{host}:{port}' for host, port in closed)} "
+                            "to accept connections."
+                        )
+
+                    for address, next_attempt in list(next_attempts.items()):
+                        if len(selector.get_map()) >= self.__max_connections:
+                            break
+                        if next_attempt <= now:
+                            del next_attempts[address]
+                            if not self.__connect(selector, address, now):
+                                self.__retry(next_attempts, delays, address, now)
+
+                    for key, _ in selector.select(
+                        self.__get_select_timeout(selector, next_attempts, deadline)
+                    ):
+                        address = key.data[0]
+                        error = key.fileobj.getsockopt(
+                            socket.SOL_SOCKET, socket.SO_ERROR
+                        )
+                        selector.unregister(key.fileobj)
+                        key.fileobj.close()
+                        if error != 0:
+                            self.__retry(
+                                next_attempts, delays, address, time.monotonic()
+                            )
+
+                    now = time.monotonic()
+                    for key in list(selector.get_map().values()):
+                        if key.data[1] <= now:
+                            selector.unregister(key.fileobj)
+                            key.fileobj.close()
+                            self.__retry(next_attempts, delays, key.data[0], now)
+            finally:
+                for key in list(selector.get_map().values()):
+                    selector.unregister(key.fileobj)
+                    key.fileobj.close()
+
+    def __connect(
+        self, selector: selectors.BaseSelector, address: tuple, now: float
+    ) -> bool:
+        """Start a connection attempt, returning False if it failed straight away."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            error = sock.connect_ex(address)
+        except OSError:
+            error = errno.EHOSTUNREACH
+
+        if error == 0 or error in IN_PROGRESS_ERRNOS:
+            selector.register(
+                sock, selectors.EVENT_WRITE, (address, now + self.__connect_timeout)
+            )
+            return True
+
+        sock.close()
+        return False
+
+    def __retry(
+        self, next_attempts: dict, delays: dict, address: tuple, now: float
+    ) -> None:
+        """Schedule another attempt for an address after its backoff delay."""
+        next_attempts[address] = now + delays[address]
+        delays[address] = min(delays[address] * 2, self.__max_delay)
+
+    def __get_select_timeout(
+        self, selector: selectors.BaseSelector, next_attempts: dict, deadline: float
+    ) -> float:
+        """Return how long to wait for sockets before something else is due."""
+        due = [deadline]
+        if len(selector.get_map()) < self.__max_connections:
+            due += next_attempts.values()
+        due += [key.data[1] for key in selector.get_map().values()]
+        return max(0.0, min(due) - time.monotonic())
+
+
+default_readiness_prober = GccReadinessProber()
@@ -0,0 +1,122 @@
+"""This file contains the GccSharedResources class."""
+# pylint: disable=E0401,W1514
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Callable
+
+from gcc_ec2 import SECURITY_GROUP_PERMISSIONS, GccEc2
+
+SECURITY_GROUP_FINGERPRINT = hashlib.sha256(
+    json.dumps(SECURITY_GROUP_PERMISSIONS, sort_keys=True).encode()
+).hexdigest()[:8]
+
+
+class GccSharedResources:
+    """This class keeps a key pair and security group that every execution reuses."""
+
+    __resource_name = None
+    __key_dir = None
+    __lock = None
+
+    def __init__(
+        self, resource_name: str = "gcc", key_dir: str = "~/.gcc/keys"
+    ) -> None:
+        """Constructor for a GccSharedResources object.
+
+        The key pair is named resource_name and its private key is kept in
+        key_dir under the key pair's fingerprint. The security group's name ends
+        with a fingerprint of the permissions GCC needs, so a change to them
+        gives a new group rather than a stale one.
+        """
+        self.__resource_name = resource_name
+        self.__key_dir = os.path.expanduser(key_dir)
+        self.__lock = threading.Lock()
+
+    def get_resource_name(self) -> str:
+        """This method returns the __resource_name private variable."""
+        return self.__resource_name
+
+    def get_security_group_name(self) -> str:
+        """This method returns the name of the shared security group."""
+        return f"{self.__resource_name}-{SECURITY_GROUP_FINGERPRINT}"
+
+    def get_key_pair(
+        self, gcc_ec2_obj: GccEc2, on_replace: Callable[[], None] = None
+    ) -> dict:
+        """Return the shared key pair with its private key, creating it if needed.
+
+        A key pair whose private key is not stored here is replaced, and
+        on_replace is called first so anything launched with it can be dropped.
+        Private keys are stored under their key pair's fingerprint, so the
+        resources of different AWS accounts never share a key file.
+        """
+        with self.__lock:
+            key_pair = gcc_ec2_obj.find_key_pair(self.__resource_name)
+            if key_pair is not None:
+                key_path = self.__get_key_path(key_pair)
+                if os.path.isfile(key_path):
+                    with open(key_path) as key_file:
+                        return {
+                            "KeyName": self.__resource_name,
+                            "KeyMaterial": key_file.read(),
+                        }
+
+                if on_replace is not None:
+                    on_replace()
+                gcc_ec2_obj.delete_key_pair(self.__resource_name)
+
+            key_pair = gcc_ec2_obj.create_key_pair(self.__resource_name)
+            os.makedirs(self.__key_dir, exist_ok=True)
+            with open(
+                os.open(
+                    self.__get_key_path(key_pair),
+                    os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                    0o600,
+                ),
+                "w",
+            ) as key_file:
+                key_file.write(key_pair["KeyMaterial"])
+
+        return key_pair
+
+    def __get_key_path(self, key_pair: dict) -> str:
+        """Return where the private key of a key pair is stored."""
+        fingerprint = re.sub(r"[^0-9A-Za-z]", "", key_pair["KeyFingerprint"])
+        return os.path.join(self.__key_dir, f"{key_pair['KeyName']}-{fingerprint}.pem")
+
+    def get_security_group(self, gcc_ec2_obj: GccEc2) -> dict:
+        """Return the shared security group, creating it or restoring its permissions if needed."""
+        with self.__lock:
+            security_group = gcc_ec2_obj.find_security_group(
+                self.get_security_group_name()
+            )
+            if security_group is None:
+                return gcc_ec2_obj.create_security_group(self.get_security_group_name())
+
+            if not has_permissions(security_group):
+                gcc_ec2_obj.authorize_security_group(security_group["GroupId"])
+        return security_group
+
+
+def has_permissions(security_group: dict) -> bool:
+    """Return whether a security group allows every connection in SECURITY_GROUP_PERMISSIONS."""
+    return all(
+        any(
+            granted["IpProtocol"] == permission["IpProtocol"]
+            and granted.get("FromPort") == permission["FromPort"]
+            and granted.get("ToPort") == permission["ToPort"]
+            and all(
+                ip_range["CidrIp"]
+                in {granted_range["CidrIp"] for granted_range in granted["IpRanges"]}
+                for ip_range in permission["IpRanges"]
+            )
+            for granted in security_group.get("IpPermissions", [])
+        )
+        for permission in SECURITY_GROUP_PERMISSIONS
+    )
+
+
+default_shared_resources = GccSharedResources()
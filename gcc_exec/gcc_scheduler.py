@@ -0,0 +1,135 @@
+"""This file contains the GccLevelScheduler and GccHeftScheduler classes."""
+# pylint: disable=R0903
+from typing import Any
+
+
+class GccLevelScheduler:
+    """This class hands out pooled machines to nodes in specification order."""
+
+    def schedule(self, gcc_workflow_obj: Any, available_machines: list) -> list:
+        """Assign available machines to nodes without a virtual machine and return the used ones."""
+        used_machines = []
+
+        for node in gcc_workflow_obj.get_workflow_dict()["nodes"].values():
+            if node.get_node_virtual_machine() is None and len(available_machines) > 0:
+                used_machines.append(assign_machine(node, available_machines.pop()))
+
+        return used_machines
+
+
+class GccHeftScheduler:
+    """This class assigns pooled machines to nodes by upward critical-path rank."""
+
+    __boot_time = None
+    __bandwidth = None
+
+    def __init__(self, boot_time: float = 60.0, bandwidth: float = 50.0) -> None:
+        """Constructor for a GccHeftScheduler object.
+
+        boot_time is the estimated number of seconds a new EC2 instance needs
+        before it accepts work, and bandwidth is the estimated node-to-node
+        transfer rate in megabytes per second.
+        """
+        self.__boot_time = boot_time
+        self.__bandwidth = bandwidth
+
+    def schedule(self, gcc_workflow_obj: Any, available_machines: list) -> list:
+        """Assign available machines to the nodes that gain the most from them.
+
+        Return the machines that were used.
+        """
+        workflow_dict = gcc_workflow_obj.get_workflow_dict()
+        node_ranks = self.rank(workflow_dict)
+        ranked_nodes = sorted(
+            workflow_dict["nodes"].values(),
+            key=lambda node: (-node_ranks[node.get_node_id()], node.get_node_level()),
+        )
+        used_machines = []
+
+        # Every node runs on its own machine, so a pooled machine only saves the
+        # boot time of a new instance. Give pooled machines to the highest ranked
+        # nodes that would otherwise wait on that boot time, then hand any left
+        # over to the remaining nodes in rank order.
+        node_finish_times = {}
+        for node in ranked_nodes:
+            ready_time = self.__ready_time(node, node_finish_times)
+            if (
+                node.get_node_virtual_machine() is None
+                and len(available_machines) > 0
+                and ready_time < self.__boot_time
+            ):
+                used_machines.append(assign_machine(node, available_machines.pop()))
+            node_finish_times[node.get_node_id()] = self.__finish_time(node, ready_time)
+
+        for node in ranked_nodes:
+            if node.get_node_virtual_machine() is None and len(available_machines) > 0:
+                used_machines.append(assign_machine(node, available_machines.pop()))
+
+        node_finish_times = {}
+        for node in ranked_nodes:
+            node_finish_times[node.get_node_id()] = self.__finish_time(
+                node, self.__ready_time(node, node_finish_times)
+            )
+
+        workflow_dict["estimated_makespan"] = max(
+            node_finish_times.values(), default=0.0
+        )
+
+        return used_machines
+
+    def rank(self, workflow_dict: dict) -> dict:
+        """Return the upward critical-path rank of every node in a leveled workflow."""
+        node_ranks = {}
+
+        for level in sorted(workflow_dict["plan_raw"], reverse=True):
+            for node in workflow_dict["plan_raw"][level]:
+                successor_rank = 0.0
+                for dependent_id, _ in node.get_node_dependent_items():
+                    dependent = workflow_dict["nodes"][dependent_id]
+                    successor_rank = max(
+                        successor_rank,
+                        self.__transfer_time(dependent, node.get_node_id())
+                        + node_ranks[dependent_id],
+                    )
+                node_ranks[node.get_node_id()] = (
+                    node.get_node_estimate() + successor_rank
+                )
+
+        return node_ranks
+
+    def __transfer_time(self, node: Any, dep_node_id: str) -> float:
+        """Return the estimated time to move a dependency's output to a node."""
+        return node.get_node_dependency_sizes().get(dep_node_id, 0.0) / self.__bandwidth
+
+    def __ready_time(self, node: Any, node_finish_times: dict) -> float:
+        """Return the time at which all of a node's inputs are estimated to have arrived."""
+        ready_time = 0.0
+
+        for dep_node_id, _ in node.get_node_dependency_items():
+            if dep_node_id is not None:
+                ready_time = max(
+                    ready_time,
+                    node_finish_times[dep_node_id]
+                    + self.__transfer_time(node, dep_node_id),
+                )
+
+        return ready_time
+
+    def __finish_time(self, node: Any, ready_time: float) -> float:
+        """Return the estimated finish time of a node given where it runs."""
+        start_time = ready_time
+        if node.get_node_virtual_machine() is None:
+            start_time = max(ready_time, self.__boot_time)
+        return start_time + node.get_node_estimate()
+
+
+def assign_machine(node: Any, available_machine: Any) -> Any:
+    """Set a pooled machine as a node's virtual machine and return the machine."""
+    node.set_node_virtual_machine(
+        {
+            "ip": available_machine.machine_ip,
+            "pem": available_machine.machine_pem.strip("\n"),
+            "instance_id": None,
+        }
+    )
+    return available_machine
@@ -0,0 +1,122 @@
+"""This file contains the GccScript class."""
+import shlex
+import uuid
+
+MAX_PARALLEL_STEPS = 8
+
+SCRIPT_HEADER = """gcc_dir=$(mktemp -d)
+gcc_run() {
+    local start end
+    start=$(date +%s.%N)
+    bash -c "$2" > "$gcc_dir/$1.out" 2>&1
+    local exit_code=$?
+    end=$(date +%s.%N)
+    echo "$exit_code $start $end" > "$gcc_dir/$1.status"
+}
+gcc_report() {
+    cat "$gcc_dir/$1.out"
+    if [ -s "$gcc_dir/$1.out" ] && [ -n "$(tail -c 1 "$gcc_dir/$1.out")" ]; then
+        echo
+    fi
+    echo "{marker} $1 $(cat "$gcc_dir/$1.status")"
+}
+"""
+
+
+class GccScript:
+    """This class compiles a list of commands into one shell script and parses what it reports."""
+
+    __commands = None
+    __marker = None
+
+    def __init__(self, commands: list) -> None:
+        """Constructor for a GccScript object.
+
+        Each command is a step that starts in the directory the script runs
+        in, like a command sent on its own channel. Consecutive downloads do
+        not depend on each other, so they run in parallel, up to
+        MAX_PARALLEL_STEPS at a time.
+        """
+        self.__commands = list(commands)
+        self.__marker = f"__gcc_step_{uuid.uuid4().hex}__"
+
+    def get_commands(self) -> list:
+        """This method returns the __commands private variable."""
+        return self.__commands
+
+    def get_source(self) -> str:
+        """Return the bash source of the script."""
+        lines = [SCRIPT_HEADER.replace("{marker}", self.__marker)]
+
+        for step_group in self.__group_steps():
+            if len(step_group) == 1:
+                index = step_group[0]
+                lines.append(
+                    f"gcc_run {index} {shlex.quote(self.__commands[index])}; "
+                    f"gcc_report {index}"
+                )
+                continue
+
+            for index in step_group:
+                lines.append(
+                    f"while [ $(jobs -r | wc -l) -ge {MAX_PARALLEL_STEPS} ]; "
+                    "do wait -n; done"
+                )
+                lines.append(f"gcc_run {index} {shlex.quote(self.__commands[index])} &")
+            lines.append("wait")
+            lines += [f"gcc_report {index}" for index in step_group]
+
+        lines.append('rm -rf "$gcc_dir"')
+        return "\n".join(lines) + "\n"
+
+    def __group_steps(self) -> list:
+        """Split step indices into groups, where the steps of a group run in parallel."""
+        step_groups = []
+
+        for index, comm in enumerate(self.__commands):
+            if (
+                step_groups
+                and is_independent(comm)
+                and is_independent(self.__commands[step_groups[-1][-1]])
+            ):
+                step_groups[-1].append(index)
+            else:
+                step_groups.append([index])
+
+        return step_groups
+
+    def parse(self, output: str) -> list:
+        """Return the command, output, exit code and seconds taken of each step, in order.
+
+        A step's output includes its standard error. A step the script did not
+        report on has an exit code and time of None.
+        """
+        results = [
+            {"command": comm, "output": "", "exit_code": None, "seconds": None}
+            for comm in self.__commands
+        ]
+        step_lines = []
+
+        for line in output.splitlines(keepends=True):
+            if not line.startswith(self.__marker):
+                step_lines.append(line)
+                continue
+
+            fields = line.split()
+            try:
+                index = int(fields[1])
+                results[index]["output"] = "".join(step_lines)
+                results[index]["exit_code"] = int(fields[2])
+                results[index]["seconds"] = round(
+                    float(fields[4]) - float(fields[3]), 3
+                )
+            except (IndexError, ValueError):
+                pass
+            step_lines = []
+
+        return results
+
+
+def is_independent(command: str) -> bool:
+    """Return whether a command only downloads a file, so it can run next to other downloads."""
+    return command.startswith("wget ")
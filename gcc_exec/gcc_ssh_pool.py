@@ -0,0 +1,183 @@
+"""This file contains the GccSshPool class."""
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from io import StringIO
+from typing import Iterator
+
+import paramiko
+
+
+class GccSshPool:
+    """This class keeps one authenticated SSH connection per machine and key for reuse."""
+
+    __idle_timeout = None
+    __connections = None
+    __keys = None
+    __lock = None
+    __reaper = None
+
+    def __init__(self, idle_timeout: float = 300.0) -> None:
+        """Constructor for a GccSshPool object.
+
+        Connections are keyed by (ip, key fingerprint) and every session on
+        one opens its own channels, so concurrent commands on a machine share a
+        single handshake. Connections nobody has used for idle_timeout seconds
+        are closed by a background thread.
+        """
+        self.__idle_timeout = idle_timeout
+        self.__connections = {}
+        self.__keys = {}
+        self.__lock = threading.Lock()
+
+    def get_idle_timeout(self) -> float:
+        """This method returns the __idle_timeout private variable."""
+        return self.__idle_timeout
+
+    @contextmanager
+    def session(self, ip_address: str, pem: str) -> Iterator[paramiko.SSHClient]:
+        """Yield a connected client for a machine, connecting only if no live one is pooled.
+
+        A connection whose transport fails while in use is dropped, so the next
+        session reconnects, and is closed once no session uses it. Errors that
+        leave the transport connected, such as a missing file, keep it pooled.
+        """
+        pkey = self.__get_key(pem)
+        connection_key = (ip_address, pkey.get_fingerprint().hex())
+        connection = self.__acquire(connection_key, ip_address, pkey)
+
+        try:
+            yield connection["client"]
+        except Exception as error:
+            if isinstance(error, paramiko.SSHException) or not is_active(
+                connection["client"]
+            ):
+                self.__discard(connection_key, connection)
+            raise
+        finally:
+            with self.__lock:
+                connection["users"] -= 1
+                connection["last_used"] = time.monotonic()
+                unused = connection.get("discarded") and connection["users"] == 0
+            if unused:
+                connection["client"].close()
+
+    def __get_key(self, pem: str) -> paramiko.PKey:
+        """Return the parsed private key of a PEM, parsing each PEM only once."""
+        pem_hash = hashlib.sha256(pem.encode()).hexdigest()
+        with self.__lock:
+            pkey = self.__keys.get(pem_hash)
+        if pkey is None:
+            pkey = paramiko.RSAKey.from_private_key(StringIO(pem))
+            with self.__lock:
+                self.__keys[pem_hash] = pkey
+        return pkey
+
+    def __acquire(
+        self, connection_key: tuple, ip_address: str, pkey: paramiko.PKey
+    ) -> dict:
+        """Return a live pooled connection marked as in use, opening one if needed."""
+        with self.__lock:
+            connection = self.__connections.get(connection_key)
+            if connection is not None and is_active(connection["client"]):
+                connection["users"] += 1
+                return connection
+
+        client = paramiko.SSHClient()
+        client.load_system_host_keys()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(ip_address, username="ubuntu", pkey=pkey)
+
+        with self.__lock:
+            pooled = self.__connections.get(connection_key)
+            if pooled is not None and is_active(pooled["client"]):
+                # Another thread connected first, so share its connection.
+                pooled["users"] += 1
+                client.close()
+                return pooled
+
+            connection = {"client": client, "users": 1, "last_used": time.monotonic()}
+            self.__connections[connection_key] = connection
+            self.__start_reaper()
+
+        if pooled is not None:
+            self.__discard(connection_key, pooled)
+        return connection
+
+    def __discard(self, connection_key: tuple, connection: dict) -> None:
+        """Remove a connection from the pool, closing it now if no session uses it."""
+        with self.__lock:
+            if self.__connections.get(connection_key) is connection:
+                del self.__connections[connection_key]
+            connection["discarded"] = True
+            unused = connection["users"] == 0
+        if unused:
+            connection["client"].close()
+
+    def __start_reaper(self) -> None:
+        """Start the thread that closes idle connections, if it is not running."""
+        if self.__reaper is None:
+            self.__reaper = threading.Thread(
+                target=self.__reap, name="gcc-ssh-reaper", daemon=True
+            )
+            self.__reaper.start()
+
+    def __reap(self) -> None:
+        """Close idle connections until the pool is empty."""
+        while True:
+            time.sleep(min(max(self.__idle_timeout, 1.0), 30.0))
+            self.close_idle()
+            with self.__lock:
+                if not self.__connections:
+                    self.__reaper = None
+                    return
+
+    def close_idle(self) -> int:
+        """Close connections nobody has used for the idle timeout and return how many."""
+        expired_before = time.monotonic() - self.__idle_timeout
+        with self.__lock:
+            idle_keys = [
+                connection_key
+                for connection_key, connection in self.__connections.items()
+                if connection["users"] == 0
+                and connection["last_used"] <= expired_before
+            ]
+            idle_connections = [
+                self.__connections.pop(connection_key) for connection_key in idle_keys
+            ]
+
+        for connection in idle_connections:
+            connection["client"].close()
+        return len(idle_connections)
+
+    def close(self, ip_addresses: list = None) -> None:
+        """Close the pooled connections to some machines, or to every machine."""
+        if ip_addresses is not None:
+            ip_addresses = set(ip_addresses)
+
+        with self.__lock:
+            closed_keys = [
+                connection_key
+                for connection_key in self.__connections
+                if ip_addresses is None or connection_key[0] in ip_addresses
+            ]
+            closed_connections = [
+                self.__connections.pop(connection_key) for connection_key in closed_keys
+            ]
+
+        for connection in closed_connections:
+            connection["client"].close()
+
+    def __len__(self) -> int:
+        """Return the number of pooled connections."""
+        return len(self.__connections)
+
+
+def is_active(client: paramiko.SSHClient) -> bool:
+    """Return whether a client's transport is still connected."""
+    transport = client.get_transport()
+    return transport is not None and transport.is_active()
+
+
+default_ssh_pool = GccSshPool()
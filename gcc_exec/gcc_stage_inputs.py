@@ -0,0 +1,128 @@
+"""This file downloads the input files of a node on its machine and verifies them.
+
+It is run on the machine with the path of a JSON manifest as its argument, so
+it only uses the standard library of the machine's Python 3.8. The manifest
+holds the number of workers and attempts, and a list of files, each with a
+download link, a destination path, and the size and Dropbox content hash the
+file must have (either may be None to skip that check).
+"""
+import functools
+import hashlib
+import json
+import os
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+CONTENT_HASH_BLOCK_SIZE = 4 * 1024 * 1024
+READ_SIZE = 1024 * 1024
+
+
+class ContentHasher:
+    """This class computes the Dropbox content hash of data fed to it in chunks."""
+
+    __block_hashes = None
+    __block = None
+    __block_size = None
+
+    def __init__(self) -> None:
+        """Constructor for a ContentHasher object."""
+        self.__block_hashes = []
+        self.__block = hashlib.sha256()
+        self.__block_size = 0
+
+    def update(self, chunk: bytes) -> None:
+        """Add a chunk of data to the hash."""
+        while chunk:
+            block_end = CONTENT_HASH_BLOCK_SIZE - self.__block_size
+            block_chunk = chunk[:block_end]
+            self.__block.update(block_chunk)
+            self.__block_size += len(block_chunk)
+            chunk = chunk[block_end:]
+
+            if self.__block_size == CONTENT_HASH_BLOCK_SIZE:
+                self.__block_hashes.append(self.__block.digest())
+                self.__block = hashlib.sha256()
+                self.__block_size = 0
+
+    def hexdigest(self) -> str:
+        """Return the content hash of the data added so far."""
+        block_hashes = list(self.__block_hashes)
+        if self.__block_size:
+            block_hashes.append(self.__block.digest())
+        return hashlib.sha256(b"".join(block_hashes)).hexdigest()
+
+
+def stage_file(input_file: dict, attempts: int) -> str:
+    """Download one input file and return None, or the reason it failed after every attempt.
+
+    The file is written next to its destination and only moved there once
+    its size and content hash match.
+    """
+    partial_path = f"{input_file['path']}.partial"
+    error = None
+
+    for attempt in range(attempts):
+        if attempt:
+            time.sleep(min(2**attempt, 10))
+
+        try:
+            size = 0
+            content_hasher = ContentHasher()
+            with urllib.request.urlopen(
+                input_file["link"], timeout=60
+            ) as response, open(partial_path, "wb") as partial_file:
+                for chunk in iter(functools.partial(response.read, READ_SIZE), b""):
+                    partial_file.write(chunk)
+                    content_hasher.update(chunk)
+                    size += len(chunk)
+
+            if input_file.get("size") is not None and size != input_file["size"]:
+                raise ValueError(f"got {size} bytes instead of {input_file['size']}")
+            if (
+                input_file.get("content_hash") is not None
+                and content_hasher.hexdigest() != input_file["content_hash"]
+            ):
+                raise ValueError("content hash does not match")
+
+            os.replace(partial_path, input_file["path"])
+            return None
+        except (OSError, ValueError) as stage_error:
+            error = str(stage_error)
+
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+    return error
+
+
+def main(manifest_path: str) -> int:
+    """Stage every file of a manifest and return 1 if any of them failed, or 0."""
+    with open(manifest_path, encoding="utf-8") as manifest_file:
+        manifest = json.load(manifest_file)
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max(1, manifest["workers"])) as executor:
+        errors = list(
+            executor.map(
+                lambda input_file: stage_file(input_file, manifest["attempts"]),
+                manifest["files"],
+            )
+        )
+
+    for input_file, error in zip(manifest["files"], errors):
+        if error is None:
+            print(f"staged {input_file['path']}")
+        else:
+            print(f"failed {input_file['path']}: {error}")
+
+    failed = sum(error is not None for error in errors)
+    print(
+        f"staged {len(errors) - failed} of {len(errors)} inputs "
+        f"in {time.monotonic() - start:.3f}s"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1]))
@@ -0,0 +1,165 @@
+"""This file runs a node's payload on its machine while sampling the machine's resource use.
+
+It is run on the machine as `python3 gcc_telemetry.py <interval> <csv path>
+<command...>`, so it only uses the standard library of the machine's Python
+3.8 and reads /proc directly. Every interval seconds it appends a row to the
+CSV file with the CPU and I/O wait share of the machine, the resident memory
+of the command's process tree, the memory used on the machine, and disk and
+network throughput. It exits with the command's exit code.
+"""
+import os
+import shlex
+import subprocess
+import sys
+import time
+
+CSV_COLUMNS = [
+    "time_s",
+    "cpu_percent",
+    "iowait_percent",
+    "rss_mb",
+    "mem_used_mb",
+    "disk_read_mb_s",
+    "disk_write_mb_s",
+    "net_rx_mb_s",
+    "net_tx_mb_s",
+]
+MB = 1024 * 1024
+
+
+def read_cpu_times() -> tuple:
+    """Return the total, idle and I/O wait CPU time of the machine in clock ticks."""
+    with open("/proc/stat", encoding="utf-8") as stat_file:
+        fields = [int(field) for field in stat_file.readline().split()[1:9]]
+    return sum(fields), fields[3] + fields[4], fields[4]
+
+
+def read_tree_rss(root_pid: int) -> int:
+    """Return the resident memory in bytes of a process and all of its descendants."""
+    children = {}
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/stat", encoding="utf-8") as stat_file:
+                parent_pid = int(stat_file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent_pid, []).append(int(pid))
+
+    rss = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        pending += children.get(pid, [])
+        try:
+            with open(f"/proc/{pid}/statm", encoding="utf-8") as statm_file:
+                rss += int(statm_file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, IndexError, ValueError):
+            continue
+    return rss
+
+
+def read_mem_used() -> int:
+    """Return the memory in bytes used on the machine."""
+    meminfo = {}
+    with open("/proc/meminfo", encoding="utf-8") as meminfo_file:
+        for line in meminfo_file:
+            name, value = line.split(":", 1)
+            meminfo[name] = int(value.split()[0]) * 1024
+    return meminfo["MemTotal"] - meminfo.get("MemAvailable", meminfo["MemFree"])
+
+
+def read_disk_bytes() -> tuple:
+    """Return the bytes read from and written to the machine's disks."""
+    disks = {
+        disk
+        for disk in os.listdir("/sys/block")
+        if not disk.startswith(("loop", "ram"))
+    }
+    read_bytes = written_bytes = 0
+    with open("/proc/diskstats", encoding="utf-8") as diskstats_file:
+        for line in diskstats_file:
+            fields = line.split()
+            if fields[2] in disks:
+                read_bytes += int(fields[5]) * 512
+                written_bytes += int(fields[9]) * 512
+    return read_bytes, written_bytes
+
+
+def read_net_bytes() -> tuple:
+    """Return the bytes received and sent on the machine's network interfaces."""
+    received_bytes = sent_bytes = 0
+    with open("/proc/net/dev", encoding="utf-8") as dev_file:
+        for line in dev_file.readlines()[2:]:
+            interface, counters = line.split(":", 1)
+            if interface.strip() == "lo":
+                continue
+            fields = counters.split()
+            received_bytes += int(fields[0])
+            sent_bytes += int(fields[8])
+    return received_bytes, sent_bytes
+
+
+def read_counters(root_pid: int) -> dict:
+    """Return the current value of every counter the samples are computed from."""
+    return {
+        "time": time.monotonic(),
+        "cpu": read_cpu_times(),
+        "rss": read_tree_rss(root_pid),
+        "mem_used": read_mem_used(),
+        "disk": read_disk_bytes(),
+        "net": read_net_bytes(),
+    }
+
+
+def get_sample(previous: dict, current: dict, start: float) -> list:
+    """Return the CSV row of the interval between two readings of the counters."""
+    elapsed = max(current["time"] - previous["time"], 1e-9)
+    cpu_total = max(current["cpu"][0] - previous["cpu"][0], 1)
+
+    return [
+        f"{current['time'] - start:.3f}",
+        f"{100 * (1 - (current['cpu'][1] - previous['cpu'][1]) / cpu_total):.1f}",
+        f"{100 * (current['cpu'][2] - previous['cpu'][2]) / cpu_total:.1f}",
+        f"{current['rss'] / MB:.1f}",
+        f"{current['mem_used'] / MB:.1f}",
+        *(
+            f"{(current[counter][index] - previous[counter][index]) / MB / elapsed:.3f}"
+            for counter in ("disk", "net")
+            for index in (0, 1)
+        ),
+    ]
+
+
+def main(interval: float, csv_path: str, command: list) -> int:
+    """Run a command while appending samples to a CSV file, and return its exit code."""
+    # The command goes through a shell, which also runs scripts without a shebang.
+    process = subprocess.Popen(shlex.join(command), shell=True)  # pylint: disable=R1732
+
+    if not os.path.isdir("/proc/self"):
+        return process.wait()
+
+    start = time.monotonic()
+    with open(csv_path, "w", encoding="utf-8") as csv_file:
+        csv_file.write(",".join(CSV_COLUMNS) + "\n")
+        previous = read_counters(process.pid)
+        previous["time"] = start
+
+        while True:
+            try:
+                exit_code = process.wait(timeout=interval)
+            except subprocess.TimeoutExpired:
+                exit_code = None
+
+            current = read_counters(process.pid)
+            csv_file.write(",".join(get_sample(previous, current, start)) + "\n")
+            csv_file.flush()
+            previous = current
+
+            if exit_code is not None:
+                return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main(float(sys.argv[1]), sys.argv[2], sys.argv[3:]))
@@ -0,0 +1,321 @@
+"""This file contains the GccWheelhouse and HttpRangeFile classes."""
+# pylint: disable=E0401,R0913
+import contextlib
+import hashlib
+import io
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import zipfile
+from typing import Callable, ContextManager
+
+import requests
+from gcc_drbx import GccDrbx
+
+VM_PYTHON_VERSION = "3.8"
+VM_PLATFORMS = [
+    "manylinux_2_31_x86_64",
+    "manylinux_2_28_x86_64",
+    "manylinux_2_24_x86_64",
+    "manylinux2014_x86_64",
+    "manylinux2010_x86_64",
+    "manylinux1_x86_64",
+]
+
+
+class GccWheelhouse:
+    """This class downloads the wheels of each distinct requirements.txt once for every machine."""
+
+    __cache_dir = None
+    __python_version = None
+    __platforms = None
+    __requirements = None
+    __published = None
+    __locks = None
+    __lock = None
+
+    def __init__(
+        self,
+        cache_dir: str = "~/.gcc/wheelhouse",
+        python_version: str = VM_PYTHON_VERSION,
+        platforms: list = None,
+    ) -> None:
+        """Constructor for a GccWheelhouse object.
+
+        Wheels are downloaded for the machines' python_version and platforms
+        rather than this host's, and kept in cache_dir as one tar file per
+        requirements hash, so later executions reuse them. Requirements that
+        are not available as wheels for those platforms get no wheelhouse, and
+        are installed from PyPI as before.
+        """
+        if platforms is None:
+            platforms = VM_PLATFORMS
+
+        self.__cache_dir = os.path.expanduser(cache_dir)
+        self.__python_version = python_version
+        self.__platforms = platforms
+        self.__requirements = {}
+        self.__published = set()
+        self.__locks = {}
+        self.__lock = threading.Lock()
+
+    def get_cache_dir(self) -> str:
+        """This method returns the __cache_dir private variable."""
+        return self.__cache_dir
+
+    def prepare(
+        self,
+        gcc_drbx_obj: GccDrbx,
+        workflow_name: str,
+        node_id: str,
+        drbx_node_link: str,
+        drbx_node_hash: str,
+        drbx_limit: Callable[[], ContextManager] = contextlib.nullcontext,
+    ) -> str:
+        """Return the Dropbox path of the wheelhouse for a node zip's requirements.txt.
+
+        The wheelhouse is built and uploaded by the first node that needs it,
+        while other nodes with the same requirements wait for it. Every
+        Dropbox request is made within drbx_limit. Return None if the zip has
+        no requirements.txt or its wheels cannot be downloaded.
+        """
+        requirements = self.__get_requirements(
+            node_id, drbx_node_link, drbx_node_hash, drbx_limit
+        )
+        if not requirements:
+            return None
+
+        wheelhouse_hash = self.get_wheelhouse_hash(requirements)
+        drbx_wheelhouse_path = f"/{workflow_name}/wheelhouse/{wheelhouse_hash}.tar"
+
+        with self.__get_lock(wheelhouse_hash):
+            if drbx_wheelhouse_path in self.__published:
+                return drbx_wheelhouse_path
+
+            wheelhouse_path = self.build(requirements)
+            if wheelhouse_path is None:
+                return None
+
+            with drbx_limit():
+                if not gcc_drbx_obj.file_exists(drbx_wheelhouse_path):
+                    gcc_drbx_obj.upload_file(wheelhouse_path, drbx_wheelhouse_path)
+            self.__published.add(drbx_wheelhouse_path)
+
+        return drbx_wheelhouse_path
+
+    def get_wheelhouse_hash(self, requirements: str) -> str:
+        """Return the hash a requirements.txt's wheelhouse is stored under."""
+        requirement_lines = sorted(
+            {
+                line.split("#", 1)[0].strip()
+                for line in requirements.splitlines()
+                if line.split("#", 1)[0].strip()
+            }
+        )
+        return hashlib.sha256(
+            "\n".join(
+                [self.__python_version, *self.__platforms, "", *requirement_lines]
+            ).encode()
+        ).hexdigest()[:16]
+
+    def build(self, requirements: str) -> str:
+        """Return the path of the wheelhouse tar file for a requirements.txt, building it if needed.
+
+        Return None if pip cannot download wheels of every requirement for the
+        machines' platforms.
+        """
+        wheelhouse_path = os.path.join(
+            self.__cache_dir, f"{self.get_wheelhouse_hash(requirements)}.tar"
+        )
+        if os.path.isfile(wheelhouse_path):
+            return wheelhouse_path
+
+        os.makedirs(self.__cache_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=self.__cache_dir) as build_dir:
+            requirements_path = os.path.join(build_dir, "requirements.txt")
+            wheel_dir = os.path.join(build_dir, "wheels")
+            with open(requirements_path, "w", encoding="utf-8") as requirements_file:
+                requirements_file.write(requirements)
+
+            platform_args = []
+            for platform in self.__platforms:
+                platform_args += ["--platform", platform]
+
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "pip",
+                    "download",
+                    "--quiet",
+                    "--only-binary=:all:",
+                    *platform_args,
+                    "--python-version",
+                    self.__python_version,
+                    "--implementation",
+                    "cp",
+                    "--dest",
+                    wheel_dir,
+                    "--requirement",
+                    requirements_path,
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=False,
+            )
+            if result.returncode != 0:
+                return None
+
+            partial_path = os.path.join(build_dir, "wheelhouse.tar")
+            with tarfile.open(partial_path, "w") as wheelhouse_file:
+                for wheel in sorted(os.listdir(wheel_dir)):
+                    wheelhouse_file.add(os.path.join(wheel_dir, wheel), arcname=wheel)
+            os.replace(partial_path, wheelhouse_path)
+
+        return wheelhouse_path
+
+    def get_install_command(
+        self,
+        home_dir: str,
+        node_id: str,
+        drbx_wheelhouse_path: str,
+        drbx_wheelhouse_link: str,
+    ) -> str:
+        """Return a command that installs a node's requirements from a wheelhouse without PyPI.
+
+        The wheelhouse is unpacked once per machine, with nodes sharing the
+        machine taking turns through a lock file. If the offline install
+        fails, a message saying so is written to the node's log and the
+        requirements are installed from PyPI.
+        """
+        wheelhouse_name = os.path.splitext(os.path.basename(drbx_wheelhouse_path))[0]
+        wheelhouse_dir = f"{home_dir}/.gcc/wheelhouse/{wheelhouse_name}"
+
+        return (
+            f"mkdir -p {home_dir}/.gcc/wheelhouse; "
+            "( flock 9 || exit 1; "
+            f"if [ ! -d {wheelhouse_dir} ]; then "
+            f"rm -rf {wheelhouse_dir}.partial; mkdir -p {wheelhouse_dir}.partial "
+            f"&& wget '{drbx_wheelhouse_link}' -O {wheelhouse_dir}.tar "
+            f"&& tar -xf {wheelhouse_dir}.tar -C {wheelhouse_dir}.partial "
+            f"&& mv {wheelhouse_dir}.partial {wheelhouse_dir}; "
+            f"rm -rf {wheelhouse_dir}.partial {wheelhouse_dir}.tar; fi "
+            f") 9>{home_dir}/.gcc/wheelhouse.lock; "
+            f"cd {node_id}; "
+            f"pip3 install --no-index --find-links {wheelhouse_dir} -r requirements.txt "
+            f"|| {{ echo 'Wheelhouse {wheelhouse_name} install failed, installing from PyPI.'; "
+            "pip3 install -r requirements.txt; }"
+        )
+
+    def __get_requirements(
+        self,
+        node_id: str,
+        drbx_node_link: str,
+        drbx_node_hash: str,
+        drbx_limit: Callable[[], ContextManager],
+    ) -> str:
+        """Return the requirements.txt of a node zip, reading only that file from Dropbox."""
+        with self.__lock:
+            if (drbx_node_hash, node_id) in self.__requirements:
+                return self.__requirements[(drbx_node_hash, node_id)]
+
+        try:
+            with drbx_limit(), io.BufferedReader(
+                HttpRangeFile(drbx_node_link), buffer_size=65536
+            ) as node_file, zipfile.ZipFile(node_file) as node_zip:
+                requirements = node_zip.read(f"{node_id}/requirements.txt").decode()
+        except KeyError:
+            requirements = None
+        except (requests.RequestException, zipfile.BadZipFile, OSError, ValueError):
+            return None
+
+        with self.__lock:
+            self.__requirements[(drbx_node_hash, node_id)] = requirements
+        return requirements
+
+    def __get_lock(self, wheelhouse_hash: str) -> threading.Lock:
+        """Return the lock that serializes building one wheelhouse."""
+        with self.__lock:
+            return self.__locks.setdefault(wheelhouse_hash, threading.Lock())
+
+
+class HttpRangeFile(io.RawIOBase):
+    """This class reads a file over HTTP with range requests, downloading only the parts read."""
+
+    __url = None
+    __session = None
+    __size = None
+    __position = None
+
+    def __init__(self, url: str) -> None:
+        """Constructor for a HttpRangeFile object.
+
+        Raise OSError if the server does not report the file's size or does
+        not serve ranges.
+        """
+        super().__init__()
+        self.__url = url
+        self.__session = requests.Session()
+        self.__position = 0
+
+        response = self.__session.get(
+            url, headers={"Range": "bytes=0-0"}, stream=True, timeout=30
+        )
+        response.close()
+        content_range = response.headers.get("Content-Range", "")
+        if response.status_code != 206 or "/" not in content_range:
+            raise OSError(f"{url} does not serve byte ranges.")
+        self.__size = int(content_range.rsplit("/", 1)[1])
+
+    def readable(self) -> bool:
+        """Return True, since the file can be read."""
+        return True
+
+    def seekable(self) -> bool:
+        """Return True, since any position of the file can be read."""
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move to a position in the file and return it."""
+        if whence == io.SEEK_CUR:
+            offset += self.__position
+        elif whence == io.SEEK_END:
+            offset += self.__size
+        self.__position = max(0, offset)
+        return self.__position
+
+    def tell(self) -> int:
+        """Return the current position in the file."""
+        return self.__position
+
+    def readinto(self, buffer: bytearray) -> int:
+        """Read bytes at the current position into a buffer and return how many."""
+        end = min(self.__position + len(buffer), self.__size)
+        if end <= self.__position:
+            return 0
+
+        response = self.__session.get(
+            self.__url,
+            headers={"Range": f"bytes={self.__position}-{end - 1}"},
+            timeout=30,
+        )
+        response.raise_for_status()
+        data = response.content
+        if response.status_code != 206:
+            raise OSError(f"{self.__url} does not serve byte ranges.")
+
+        buffer[: len(data)] = data
+        self.__position += len(data)
+        return len(data)
+
+    def close(self) -> None:
+        """Close the file and its HTTP session."""
+        if not self.closed:
+            self.__session.close()
+        super().close()
+
+
+default_wheelhouse = GccWheelhouse()
@@ -1,20 +1,34 @@
 """This file contains the GccWorkflow class."""
-# pylint: disable=R0914,R0912,R0915,R0902,E0401,R1702
+# pylint: disable=R0914,R0912,R0915,R0902,E0401,R1702,R0904,R0913
+import hashlib
 import os
 import random
 import shutil
-import threading
 import time
-from concurrent.futures.thread import ThreadPoolExecutor
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import OrderedDict
+from typing import Any, Iterator
 
 import xmltodict
 from botocore.exceptions import ClientError
+from gcc_backend import default_backend
 from gcc_drbx import GccDrbx
 from gcc_ec2 import GccEc2
-from gcc_node import GccNode
+from gcc_graph import GccGraph, parse_specification
+from gcc_instance_pool import GccInstancePool
+from gcc_log_uploader import GccLogUploader, default_log_uploader
+from gcc_node import BASE_IMAGE_VERSION, GccNode
+from gcc_payload_cache import GccPayloadCache, default_payload_cache
+from gcc_plan_cache import GccPlanCache, default_plan_cache
+from gcc_pool import GccWorkerPool, default_worker_pool
+from gcc_resources import default_shared_resources
+from gcc_scheduler import GccLevelScheduler
 from gcc_user import GccUser
+from gcc_wheelhouse import GccWheelhouse, default_wheelhouse
+
+MAX_SPOT_RESCHEDULES = 3
 
 
 class GccWorkflow:
@@ -28,10 +42,85 @@ class GccWorkflow:
     __gcc_key_pair = None
     __exec_date_time = None
     __tmp_dir = None
+    __gcc_plan_cache = None
+    __gcc_graph = None
+    __gcc_worker_pool = None
+    __gcc_instance_pool = None
+    __spot_instances = None
+    __per_run_resources = None
+    __gcc_backend = None
+    __gcc_log_uploader = None
+    __gcc_payload_cache = None
+    __gcc_wheelhouse = None
+    __telemetry_interval = None
+
+    def __init__(
+        self,
+        gcc_user_obj: GccUser,
+        workflow_name: str,
+        gcc_plan_cache: GccPlanCache = None,
+        gcc_worker_pool: GccWorkerPool = None,
+        gcc_instance_pool: GccInstancePool = None,
+        spot_instances: bool = False,
+        per_run_resources: bool = False,
+        gcc_backend: Any = None,
+        gcc_log_uploader: GccLogUploader = None,
+        gcc_payload_cache: GccPayloadCache = None,
+        gcc_wheelhouse: GccWheelhouse = None,
+        telemetry_interval: float = 5.0,
+    ) -> None:
+        """Constructor for a GccWorkflow object.
+
+        Without a gcc_instance_pool, every execution launches new instances and
+        terminates them when it completes. With spot_instances, those instances
+        are spot instances where there is spot capacity, and nodes of type 0
+        workflows whose spot instance is reclaimed run again on demand. Pooled
+        instances are stopped between executions, which spot instances cannot
+        be, so spot_instances has no effect with a gcc_instance_pool.
+
+        Executions use the account's shared key pair and security group. With
+        per_run_resources, each execution creates its own instead and deletes
+        them once its instances are terminated.
+
+        gcc_backend provisions, reaches and terminates the nodes' machines, and
+        is a GccEc2Backend by default. A GccLocalBackend runs every node on this
+        host instead, without using AWS.
+
+        While a node executes, gcc_log_uploader uploads its log to Dropbox each
+        time its interval passes, in addition to the upload once it finishes.
+        Machines keep the node zips they unpack in gcc_payload_cache, so a
+        machine that already ran a node does not download its zip again.
+        Nodes install their requirements.txt offline from wheels that
+        gcc_wheelhouse downloads once per distinct requirements.
+
+        While run.sh runs, its machine's resource use is sampled every
+        telemetry_interval seconds and uploaded next to the node log. A
+        telemetry_interval of None turns sampling off.
+        """
+        if gcc_plan_cache is None:
+            gcc_plan_cache = default_plan_cache
+        if gcc_worker_pool is None:
+            gcc_worker_pool = default_worker_pool
+        if gcc_backend is None:
+            gcc_backend = default_backend
+        if gcc_log_uploader is None:
+            gcc_log_uploader = default_log_uploader
+        if gcc_payload_cache is None:
+            gcc_payload_cache = default_payload_cache
+        if gcc_wheelhouse is None:
+            gcc_wheelhouse = default_wheelhouse
 
-    def __init__(self, gcc_user_obj: GccUser, workflow_name: str) -> None:
-        """Constructor for a GccWorkflow object."""
         self.__gcc_user_obj = gcc_user_obj
+        self.__gcc_plan_cache = gcc_plan_cache
+        self.__gcc_worker_pool = gcc_worker_pool
+        self.__gcc_instance_pool = gcc_instance_pool
+        self.__spot_instances = spot_instances and gcc_instance_pool is None
+        self.__per_run_resources = per_run_resources
+        self.__gcc_backend = gcc_backend
+        self.__gcc_log_uploader = gcc_log_uploader
+        self.__gcc_payload_cache = gcc_payload_cache
+        self.__gcc_wheelhouse = gcc_wheelhouse
+        self.__telemetry_interval = telemetry_interval
         self.__gcc_ec2_obj = GccEc2(
             self.__gcc_user_obj.get_aws_access_key_id(),
             self.__gcc_user_obj.get_aws_secret_access_key(),
@@ -40,282 +129,137 @@ class GccWorkflow:
         self.__workflow_dict = {
             "type": 0,
             "plan_raw": {},
-            "plan_human_readable": {},
+            "plan_human_readable": None,
             "nodes": {},
             "name": workflow_name,
             "machines_initialized": None,
+            "timeline": {},
+            "estimated_makespan": None,
         }
-
-    def plan(self, available_machines: list, xml_specification: str = None) -> list:
+        self.__workflow_dict["plan_human_readable"] = GccPlanView(self.__workflow_dict)
+
+    def plan(
+        self,
+        available_machines: list,
+        xml_specification: str = None,
+        gcc_scheduler: Any = None,
+    ) -> list:
         """This method creates an execution plan based on a workflow specification."""
+        if gcc_scheduler is None:
+            gcc_scheduler = GccLevelScheduler()
+
+        graph_dict = None
+        plan_cache_key = None
+
         if xml_specification is None:
-            xml_specification = xmltodict.parse(
-                self.__gcc_drbx_obj.get_file_contents(
-                    f"/{self.__workflow_dict['name']}/spec.xml"
-                )
+            plan_cache_key = self.__gcc_drbx_obj.get_file_content_hash(
+                f"/{self.__workflow_dict['name']}/spec.xml"
             )
         elif isinstance(xml_specification, str):
-            xml_specification = xmltodict.parse(xml_specification)
-
-        self.__workflow_dict["type"] = int(xml_specification["workflow"]["@type"])
+            plan_cache_key = hashlib.sha256(xml_specification.encode()).hexdigest()
+        else:
+            xml_specification = xmltodict.unparse(xml_specification)
+
+        if plan_cache_key is not None:
+            graph_dict = self.__gcc_plan_cache.get(plan_cache_key)
+
+        if graph_dict is not None:
+            self.__gcc_graph = GccGraph.from_dict(graph_dict)
+        else:
+            if xml_specification is None:
+                with self.__gcc_drbx_obj.get_file_stream(
+                    f"/{self.__workflow_dict['name']}/spec.xml"
+                ) as spec_stream:
+                    self.__gcc_graph = parse_specification(spec_stream)
+            else:
+                self.__gcc_graph = parse_specification(xml_specification)
 
-        used_machines = []
-        for node in xml_specification["workflow"]["task"]:
-            gcc_node_object = GccNode(node["@id"], self)
+            if plan_cache_key is not None:
+                self.__gcc_plan_cache.put(plan_cache_key, self.__gcc_graph.to_dict())
 
-            try:
-                gcc_node_vm = node["vm"]
-            except KeyError:
-                gcc_node_vm = None
+        self.__load_plan()
 
-            node_virtual_machine = None
+        used_machines = gcc_scheduler.schedule(self, available_machines)
 
-            if gcc_node_vm is not None:
-                if isinstance(gcc_node_vm, str):
-                    vm_pem = None
-                    vm_ip = gcc_node_vm
-                elif isinstance(gcc_node_vm, OrderedDict):
-                    vm_pem = self.__gcc_drbx_obj.get_file_contents(
-                        f"/{self.__workflow_dict['name']}/pem/{gcc_node_vm['@pem']}"
-                    ).strip("\n")
-
-                    vm_ip = gcc_node_vm["#text"]
-
-                node_virtual_machine = {"ip": vm_ip, "pem": vm_pem, "instance_id": None}
-
-                gcc_node_object.set_node_virtual_machine(node_virtual_machine)
-
-            elif len(available_machines) > 0:
-                available_machine = available_machines.pop()
-
-                node_virtual_machine = {
-                    "ip": available_machine.machine_ip,
-                    "pem": available_machine.machine_pem.strip("\n"),
-                    "instance_id": None,
-                }
-
-                used_machines.append(available_machine)
-                gcc_node_object.set_node_virtual_machine(node_virtual_machine)
-
-            try:
-                gcc_node_deps = node["dep"]
-            except KeyError:
-                gcc_node_deps = None
-
-            if gcc_node_deps is not None:
-                if isinstance(gcc_node_deps, str):
-                    node_dependencies = gcc_node_object.get_node_dependencies()
-                    node_dependency_dict = {None: gcc_node_deps.split(",")}
-
-                    if node_dependencies is None:
-                        gcc_node_object.set_node_dependencies([node_dependency_dict])
-                    elif isinstance(node_dependencies, list):
-                        node_dependencies.append(node_dependency_dict)
-                        gcc_node_object.set_node_dependencies(node_dependencies)
-
-                    gcc_node_object.set_node_level(0)
-
-                    try:
-                        self.__workflow_dict["plan_raw"][0].append(gcc_node_object)
-                        self.__workflow_dict["plan_human_readable"][0].append(
-                            gcc_node_object.get_node_id()
-                        )
-                    except KeyError:
-                        self.__workflow_dict["plan_raw"][0] = [gcc_node_object]
-                        self.__workflow_dict["plan_human_readable"][0] = [
-                            gcc_node_object.get_node_id()
-                        ]
-
-                if isinstance(gcc_node_deps, OrderedDict):
-                    try:
-                        gcc_dep_node_id = gcc_node_deps["@node"]
-                    except KeyError:
-                        gcc_dep_node_id = None
-
-                    try:
-                        gcc_dep_file_dependencies = gcc_node_deps["#text"].split(",")
-                    except KeyError:
-                        gcc_dep_file_dependencies = None
-
-                    if gcc_dep_node_id is not None:
-                        node_dependencies = gcc_node_object.get_node_dependencies()
-                        node_dependency_dict = {
-                            gcc_dep_node_id: gcc_dep_file_dependencies,
-                        }
-                        node_dependents = self.__workflow_dict["nodes"][
-                            gcc_dep_node_id
-                        ].get_node_dependents()
-                        node_dependents_dict = {
-                            gcc_node_object.get_node_id(): gcc_dep_file_dependencies
-                        }
-
-                        if node_dependencies is None:
-                            gcc_node_object.set_node_dependencies(
-                                [node_dependency_dict]
-                            )
-                        elif isinstance(node_dependencies, list):
-                            node_dependencies.append(node_dependency_dict)
-                            gcc_node_object.set_node_dependencies(node_dependencies)
-
-                        if node_dependents is None:
-                            self.__workflow_dict["nodes"][
-                                gcc_dep_node_id
-                            ].set_node_dependents([node_dependents_dict])
-                        elif isinstance(node_dependents, list):
-                            node_dependents.append(node_dependents_dict)
-                            self.__workflow_dict["nodes"][
-                                gcc_dep_node_id
-                            ].set_node_dependents(node_dependents)
-
-                    try:
-                        level = (
-                            self.__workflow_dict["nodes"][
-                                gcc_dep_node_id
-                            ].get_node_level()
-                            + 1
-                        )
-                    except TypeError:
-                        level = 0
-
-                    gcc_node_object.set_node_level(level)
+        if self.__workflow_dict["type"] == 1:
+            self.__workflow_dict["plan_raw"] = dict(
+                reversed(list(self.__workflow_dict["plan_raw"].items()))
+            )
 
-                    try:
-                        self.__workflow_dict["plan_raw"][level].append(gcc_node_object)
-                        self.__workflow_dict["plan_human_readable"][level].append(
-                            gcc_node_object.get_node_id()
-                        )
-                    except KeyError:
-                        self.__workflow_dict["plan_raw"][level] = [gcc_node_object]
-                        self.__workflow_dict["plan_human_readable"][level] = [
-                            gcc_node_object.get_node_id()
-                        ]
-
-                elif isinstance(gcc_node_deps, list):
-                    max_level = 0
-
-                    for dep in gcc_node_deps:
-                        if isinstance(dep, str):
-                            node_dependencies = gcc_node_object.get_node_dependencies()
-                            node_dependency_dict = {None: dep.split(",")}
-
-                            if node_dependencies is None:
-                                gcc_node_object.set_node_dependencies(
-                                    [node_dependency_dict]
-                                )
-                            elif isinstance(node_dependencies, list):
-                                node_dependencies.append(node_dependency_dict)
-                                gcc_node_object.set_node_dependencies(node_dependencies)
-
-                            level = 0
-
-                            if gcc_node_object.get_node_level() is None:
-                                gcc_node_object.set_node_level(0)
-
-                        elif isinstance(dep, OrderedDict):
-                            try:
-                                gcc_dep_node_id = dep["@node"]
-                            except KeyError:
-                                gcc_dep_node_id = None
-
-                            try:
-                                gcc_dep_file_dependencies = dep["#text"].split(",")
-                            except KeyError:
-                                gcc_dep_file_dependencies = None
-
-                            if gcc_dep_node_id is not None:
-                                node_dependencies = (
-                                    gcc_node_object.get_node_dependencies()
-                                )
-                                node_dependency_dict = {
-                                    gcc_dep_node_id: gcc_dep_file_dependencies,
-                                }
-                                node_dependents = self.__workflow_dict["nodes"][
-                                    gcc_dep_node_id
-                                ].get_node_dependents()
-                                node_dependents_dict = {
-                                    gcc_node_object.get_node_id(): gcc_dep_file_dependencies
-                                }
-
-                                if node_dependencies is None:
-                                    gcc_node_object.set_node_dependencies(
-                                        [node_dependency_dict]
-                                    )
-                                elif isinstance(node_dependencies, list):
-                                    node_dependencies.append(node_dependency_dict)
-                                    gcc_node_object.set_node_dependencies(
-                                        node_dependencies
-                                    )
-
-                                if node_dependents is None:
-                                    self.__workflow_dict["nodes"][
-                                        gcc_dep_node_id
-                                    ].set_node_dependents([node_dependents_dict])
-                                elif isinstance(node_dependents, list):
-                                    node_dependents.append(node_dependents_dict)
-                                    self.__workflow_dict["nodes"][
-                                        gcc_dep_node_id
-                                    ].set_node_dependents(node_dependents)
-
-                            try:
-                                level = (
-                                    self.__workflow_dict["nodes"][
-                                        gcc_dep_node_id
-                                    ].get_node_level()
-                                    + 1
-                                )
-                            except TypeError:
-                                level = 0
-
-                            if level > max_level:
-                                max_level = level
-
-                    gcc_node_object.set_node_level(max_level)
-
-                    try:
-                        self.__workflow_dict["plan_raw"][max_level].append(
-                            gcc_node_object
-                        )
-                        self.__workflow_dict["plan_human_readable"][max_level].append(
-                            gcc_node_object.get_node_id()
-                        )
-                    except KeyError:
-                        self.__workflow_dict["plan_raw"][max_level] = [gcc_node_object]
-                        self.__workflow_dict["plan_human_readable"][max_level] = [
-                            gcc_node_object.get_node_id()
-                        ]
+        return used_machines
 
-            else:
-                gcc_node_object.set_node_level(0)
+    def __load_plan(self) -> None:
+        """Build the nodes and level map of a workflow from its graph."""
+        self.__workflow_dict["type"] = self.__gcc_graph.get_workflow_type()
+        nodes = self.__workflow_dict["nodes"]
+        vm_pems = {}
+        plan_raw = {}
 
-                try:
-                    self.__workflow_dict["plan_raw"][0].append(gcc_node_object)
-                    self.__workflow_dict["plan_human_readable"][0].append(
-                        gcc_node_object.get_node_id()
-                    )
-                except KeyError:
-                    self.__workflow_dict["plan_raw"][0] = [gcc_node_object]
-                    self.__workflow_dict["plan_human_readable"][0] = [
-                        gcc_node_object.get_node_id()
-                    ]
+        for node_index in range(len(self.__gcc_graph)):
+            gcc_node_object = GccNode(
+                self.__gcc_graph.get_node_id(node_index), self, node_index
+            )
+            gcc_node_vm = self.__gcc_graph.get_node_virtual_machine(node_index)
 
-            self.__workflow_dict["nodes"][
-                gcc_node_object.get_node_id()
-            ] = gcc_node_object
+            if gcc_node_vm is not None:
+                vm_ip, vm_pem_file = gcc_node_vm
+                vm_pem = None
+
+                if vm_pem_file is not None:
+                    if vm_pem_file not in vm_pems:
+                        vm_pems[vm_pem_file] = self.__gcc_drbx_obj.get_file_contents(
+                            f"/{self.__workflow_dict['name']}/pem/{vm_pem_file}"
+                        ).strip("\n")
+                    vm_pem = vm_pems[vm_pem_file]
+
+                gcc_node_object.set_node_virtual_machine(
+                    {"ip": vm_ip, "pem": vm_pem, "instance_id": None}
+                )
 
-        if self.__workflow_dict["type"] == 1:
-            self.__workflow_dict["plan_raw"] = dict(
-                reversed(list(self.__workflow_dict["plan_raw"].items()))
-            )
-            self.__workflow_dict["plan_human_readable"] = dict(
-                reversed(list(self.__workflow_dict["plan_human_readable"].items()))
+            nodes[gcc_node_object.get_node_id()] = gcc_node_object
+            plan_raw.setdefault(self.__gcc_graph.get_node_level(node_index), []).append(
+                gcc_node_object
             )
 
-        return used_machines
+        for level in sorted(plan_raw):
+            self.__workflow_dict["plan_raw"][level] = plan_raw[level]
 
     def get_workflow_dict(self) -> dict:
         """This method returns the __workflow_dict private variable."""
         return self.__workflow_dict
 
+    def get_gcc_graph(self) -> GccGraph:
+        """This method returns the __gcc_graph private variable."""
+        return self.__gcc_graph
+
+    def get_gcc_worker_pool(self) -> GccWorkerPool:
+        """This method returns the __gcc_worker_pool private variable."""
+        return self.__gcc_worker_pool
+
+    def get_gcc_backend(self) -> Any:
+        """This method returns the __gcc_backend private variable."""
+        return self.__gcc_backend
+
+    def get_gcc_log_uploader(self) -> GccLogUploader:
+        """This method returns the __gcc_log_uploader private variable."""
+        return self.__gcc_log_uploader
+
+    def get_gcc_payload_cache(self) -> GccPayloadCache:
+        """This method returns the __gcc_payload_cache private variable."""
+        return self.__gcc_payload_cache
+
+    def get_gcc_wheelhouse(self) -> GccWheelhouse:
+        """This method returns the __gcc_wheelhouse private variable."""
+        return self.__gcc_wheelhouse
+
+    def get_telemetry_interval(self) -> float:
+        """This method returns the __telemetry_interval private variable."""
+        return self.__telemetry_interval
+
+    def get_spot_instances(self) -> bool:
+        """This method returns the __spot_instances private variable."""
+        return self.__spot_instances
+
     def get_gcc_key_pair(self) -> dict:
         """This method returns the __gcc_key_pair private variable."""
         return self.__gcc_key_pair
@@ -332,34 +276,90 @@ class GccWorkflow:
         """Set configuration commands and execute them on a virtual machine."""
         if self.__workflow_dict["type"] == 1:
             for level in self.__workflow_dict["plan_raw"]:
-                with ThreadPoolExecutor(
-                    max_workers=len(self.__workflow_dict["plan_raw"][level])
-                ) as executor:
-                    for node in self.__workflow_dict["plan_raw"][level]:
-                        executor.submit(node.set_config_commands)
-                    executor.shutdown()
+                self.__gcc_worker_pool.map(
+                    "configure",
+                    GccNode.set_config_commands,
+                    self.__workflow_dict["plan_raw"][level],
+                )
 
         elif self.__workflow_dict["type"] == 0:
-            with ThreadPoolExecutor(
-                max_workers=len(self.__workflow_dict["nodes"])
-            ) as executor:
-                for node in self.__workflow_dict["nodes"]:
-                    executor.submit(
-                        self.__workflow_dict["nodes"][node].set_config_commands
-                    )
-                executor.shutdown()
-
-        with ThreadPoolExecutor(
-            max_workers=len(self.__workflow_dict["nodes"])
-        ) as executor:
-            for node in self.__workflow_dict["nodes"]:
-                executor.submit(
-                    self.__workflow_dict["nodes"][node].configure_virtual_machine
-                )
-            executor.shutdown()
+            self.__gcc_worker_pool.map(
+                "configure",
+                GccNode.set_config_commands,
+                self.__workflow_dict["nodes"].values(),
+            )
+
+        self.__gcc_worker_pool.map(
+            "configure",
+            GccNode.configure_virtual_machine,
+            self.__workflow_dict["nodes"].values(),
+        )
 
     def initialize(self) -> None:
         """Initialize a virtual machine for a node if needed."""
+        pooled_nodes = self.create_execution_resources()
+
+        if pooled_nodes:
+            self.__gcc_backend.provision(self, pooled_nodes)
+
+    def create_instances(self, nodes: list) -> dict:
+        """Give each node an instance of its instance type and wait until they all run.
+
+        Nodes are grouped by instance type. For each group, instances are leased
+        from the instance pool when there is one, and the rest are launched with
+        a single request. Return the public ip address of each instance by id.
+        """
+        type_nodes = {}
+        for node in nodes:
+            type_nodes.setdefault(node.get_node_instance_type(), []).append(node)
+
+        instance_ids = []
+        base_image_id = None
+
+        with self.__gcc_worker_pool.limit("ec2"):
+            for instance_type, group_nodes in type_nodes.items():
+                warm_instance_ids = []
+                if self.__gcc_instance_pool is not None:
+                    warm_instance_ids = self.__gcc_instance_pool.lease(
+                        self.__gcc_ec2_obj, len(group_nodes), instance_type
+                    )
+
+                new_instance_ids = []
+                if len(warm_instance_ids) < len(group_nodes):
+                    if base_image_id is None:
+                        base_image_id = self.__gcc_ec2_obj.find_base_image(
+                            BASE_IMAGE_VERSION
+                        )
+                    new_instance_ids = self.__gcc_ec2_obj.create_instances(
+                        self.__gcc_key_pair["KeyName"],
+                        self.__gcc_security_group["GroupId"],
+                        len(group_nodes) - len(warm_instance_ids),
+                        tags=self.__gcc_instance_pool.get_leased_tags()
+                        if self.__gcc_instance_pool is not None
+                        else None,
+                        image_id=base_image_id,
+                        instance_type=instance_type,
+                        spot=self.__spot_instances,
+                    )
+
+                for index, (node, instance_id) in enumerate(
+                    zip(group_nodes, warm_instance_ids + new_instance_ids)
+                ):
+                    node.set_node_virtual_machine(
+                        {
+                            "ip": None,
+                            "pem": self.__gcc_key_pair["KeyMaterial"],
+                            "instance_id": instance_id,
+                            "bootstrapped": index < len(warm_instance_ids)
+                            or base_image_id is not None,
+                        }
+                    )
+                instance_ids += warm_instance_ids + new_instance_ids
+
+        return self.__gcc_ec2_obj.wait_until_running(instance_ids)
+
+    def create_execution_resources(self) -> list:
+        """Create the resources of an execution and return the nodes that need a new machine."""
         self.__exec_date_time = datetime.now().strftime("%m:%d:%Y-%H:%M:%S")
         self.__gcc_drbx_obj.create_folder(
             f"/{self.__workflow_dict['name']}/exec/{self.__exec_date_time}"
@@ -368,71 +368,203 @@ class GccWorkflow:
 
         os.makedirs(f"{os.getcwd()}/tmp/{self.__tmp_dir}", exist_ok=True)
 
-        with ThreadPoolExecutor(
-            max_workers=len(self.__workflow_dict["nodes"])
-        ) as executor:
-            for node in self.__workflow_dict["nodes"]:
-                if (
-                    self.__workflow_dict["nodes"][node].get_node_virtual_machine()
-                    is None
-                ):
-                    if (
-                        self.__gcc_security_group is None
-                        and self.__gcc_key_pair is None
-                    ):
-                        self.__gcc_security_group = (
-                            self.__gcc_ec2_obj.create_security_group(self.__tmp_dir)
-                        )
-                        self.__gcc_key_pair = self.__gcc_ec2_obj.create_key_pair(
-                            self.__tmp_dir
-                        )
-                    executor.submit(self.__workflow_dict["nodes"][node].initialize)
-            executor.shutdown()
+        return [
+            node
+            for node in self.__workflow_dict["nodes"].values()
+            if node.get_node_virtual_machine() is None
+        ]
+
+    def create_access_resources(self) -> None:
+        """Get the key pair and security group new instances are launched with."""
+        if self.__gcc_instance_pool is not None:
+            with self.__gcc_worker_pool.limit("ec2"):
+                self.__gcc_security_group = self.__gcc_instance_pool.get_security_group(
+                    self.__gcc_ec2_obj
+                )
+                self.__gcc_key_pair = self.__gcc_instance_pool.get_key_pair(
+                    self.__gcc_ec2_obj
+                )
+        elif self.__gcc_security_group is None and self.__gcc_key_pair is None:
+            if self.__per_run_resources:
+                self.__gcc_security_group = self.__gcc_ec2_obj.create_security_group(
+                    self.__tmp_dir
+                )
+                self.__gcc_key_pair = self.__gcc_ec2_obj.create_key_pair(self.__tmp_dir)
+            else:
+                with self.__gcc_worker_pool.limit("ec2"):
+                    self.__gcc_security_group = (
+                        default_shared_resources.get_security_group(self.__gcc_ec2_obj)
+                    )
+                    self.__gcc_key_pair = default_shared_resources.get_key_pair(
+                        self.__gcc_ec2_obj
+                    )
 
     def execute(self) -> None:
         """This method executes a node payload on a virtual machine."""
         if self.__workflow_dict["type"] == 1:
-            threads = []
-            for level in self.__workflow_dict["plan_raw"]:
-                for node in self.__workflow_dict["plan_raw"][level]:
-                    thread = threading.Thread(target=node.execute)
-                    threads.append(thread)
-                    thread.start()
-                time.sleep(5)
-            for thread in threads:
-                thread.join()
+            # Type 1 nodes stream to each other, so they all run at once on
+            # threads of their own rather than queueing for the shared pool.
+            nodes = [
+                node
+                for level in self.__workflow_dict["plan_raw"]
+                for node in self.__workflow_dict["plan_raw"][level]
+            ]
+            with ThreadPoolExecutor(
+                max_workers=max(1, len(nodes)), thread_name_prefix="gcc-stream"
+            ) as executor:
+                wait([executor.submit(node.execute) for node in nodes])
 
         elif self.__workflow_dict["type"] == 0:
-            for level in self.__workflow_dict["plan_raw"]:
-                with ThreadPoolExecutor(
-                    max_workers=len(self.__workflow_dict["plan_raw"][level])
-                ) as executor:
-                    for node in self.__workflow_dict["plan_raw"][level]:
-                        executor.submit(node.execute)
-                    executor.shutdown()
+            self.__execute_ready_queue()
+
+    def __execute_ready_queue(self) -> None:
+        """Execute each node as soon as all of the nodes it depends on have finished."""
+        nodes = [
+            node
+            for level in self.__workflow_dict["plan_raw"]
+            for node in self.__workflow_dict["plan_raw"][level]
+        ]
+        pending_producers = {}
+        node_consumers = {}
+
+        for node in nodes:
+            producers = {
+                node_id
+                for node_id, _ in node.get_node_dependency_items()
+                if node_id is not None
+            }
+            pending_producers[node.get_node_id()] = len(producers)
+            for producer in producers:
+                node_consumers.setdefault(producer, []).append(node)
+
+        running = {}
+        reschedules = {}
+        ready = deque(
+            node for node in nodes if pending_producers[node.get_node_id()] == 0
+        )
+
+        while ready or running:
+            while ready and len(running) < self.__gcc_worker_pool.get_phase_limit(
+                "execute"
+            ):
+                node = ready.popleft()
+                running[
+                    self.__gcc_worker_pool.submit("execute", self.__execute_node, node)
+                ] = node
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                if future.exception() is not None and self.was_interrupted(
+                    node, reschedules
+                ):
+                    running[
+                        self.__gcc_worker_pool.submit(
+                            "execute", self.__reschedule_node, node
+                        )
+                    ] = node
+                    continue
+
+                for consumer in node_consumers.get(node.get_node_id(), []):
+                    pending_producers[consumer.get_node_id()] -= 1
+                    if pending_producers[consumer.get_node_id()] == 0:
+                        ready.append(consumer)
+
+    def was_interrupted(self, node: GccNode, reschedules: dict) -> bool:
+        """Return whether a failed node lost its spot instance and can run again.
+
+        reschedules counts the reschedules of each node id of an execution, and
+        is updated when the node can run again.
+        """
+        node_virtual_machine = node.get_node_virtual_machine()
+        if (
+            not self.__spot_instances
+            or node_virtual_machine is None
+            or node_virtual_machine["instance_id"] is None
+            or reschedules.get(node.get_node_id(), 0) >= MAX_SPOT_RESCHEDULES
+        ):
+            return False
+
+        with self.__gcc_worker_pool.limit("ec2"):
+            interrupted = self.__gcc_ec2_obj.find_interrupted_instances(
+                [node_virtual_machine["instance_id"]]
+            )
+        if not interrupted:
+            return False
+
+        reschedules[node.get_node_id()] = reschedules.get(node.get_node_id(), 0) + 1
+        return True
+
+    def __reschedule_node(self, node: GccNode) -> None:
+        """Move a node to an on-demand instance and execute it again."""
+        node.reschedule()
+        self.__execute_node(node)
+
+    def __execute_node(self, node: GccNode) -> None:
+        """Execute a node and record its start and finish times in the timeline."""
+        node_timeline = {"start": time.time(), "finish": None}
+        self.__workflow_dict["timeline"][node.get_node_id()] = node_timeline
+        try:
+            node.execute()
+        finally:
+            node_timeline["finish"] = time.time()
 
     def complete(self) -> None:
         """Delete tmp directory and terminate created instances."""
+        self.__gcc_backend.terminate(self)
+        self.delete_execution_resources()
+
+    def release_instances(self) -> None:
+        """Return created instances to the instance pool, or terminate them without one."""
+        if self.__gcc_instance_pool is None:
+            self.__gcc_worker_pool.map(
+                "complete", GccNode.terminate, self.__workflow_dict["nodes"].values()
+            )
+            return
+
+        with self.__gcc_worker_pool.limit("ec2"):
+            self.__gcc_instance_pool.release(
+                self.__gcc_ec2_obj, self.__get_instance_ids()
+            )
+
+    def __get_instance_ids(self) -> list:
+        """Return the ids of the instances created or leased for the nodes."""
+        return [
+            node.get_node_virtual_machine()["instance_id"]
+            for node in self.__workflow_dict["nodes"].values()
+            if node.get_node_virtual_machine() is not None
+            and node.get_node_virtual_machine()["instance_id"] is not None
+        ]
+
+    def delete_execution_resources(self) -> None:
+        """Delete the tmp directory, and the key pair and security group of an execution.
+
+        Shared resources are kept. Per-run ones are deleted once the
+        execution's instances are terminated, since a security group cannot
+        be deleted while an instance still uses it.
+        """
         shutil.rmtree(f"{os.getcwd()}/tmp/{self.__tmp_dir}")
 
-        with ThreadPoolExecutor(
-            max_workers=len(self.__workflow_dict["nodes"])
-        ) as executor:
-            for node in self.__workflow_dict["nodes"]:
-                executor.submit(self.__workflow_dict["nodes"][node].terminate)
-            executor.shutdown()
+        if self.__gcc_instance_pool is not None or not self.__per_run_resources:
+            return
 
         if self.__gcc_key_pair is not None:
             self.__gcc_ec2_obj.delete_key_pair(self.__gcc_key_pair["KeyName"])
         if self.__gcc_security_group is not None:
-            while True:
+            instance_ids = self.__get_instance_ids()
+            if instance_ids:
+                self.__gcc_ec2_obj.wait_until_terminated(instance_ids)
+            for attempt in range(5):
                 try:
                     self.__gcc_ec2_obj.delete_security_group(
                         self.__gcc_security_group["GroupId"]
                     )
                     break
                 except ClientError:
-                    time.sleep(10)
+                    # Network interfaces can outlive their instance by a moment.
+                    if attempt == 4:
+                        raise
+                    time.sleep(2)
 
     def get_gcc_user_obj(self) -> GccUser:
         """Return gcc user object."""
@@ -463,3 +595,29 @@ def generate_random_string() -> str:
     """Generate a random 7 character string."""
     choices = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ-"
     return "".join([random.choice(choices) for _ in range(7)])
+
+
+class GccPlanView(Mapping):
+    """This class presents a workflow's plan_raw as node ids, computed when it is read."""
+
+    __workflow_dict = None
+
+    def __init__(self, workflow_dict: dict) -> None:
+        """Constructor for a GccPlanView object."""
+        self.__workflow_dict = workflow_dict
+
+    def __getitem__(self, level: int) -> list:
+        """Return the ids of the nodes in a level."""
+        return [node.get_node_id() for node in self.__workflow_dict["plan_raw"][level]]
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the levels in execution order."""
+        return iter(self.__workflow_dict["plan_raw"])
+
+    def __len__(self) -> int:
+        """Return the number of levels."""
+        return len(self.__workflow_dict["plan_raw"])
+
+    def __repr__(self) -> str:
+        """Return the plan as it would print as a dict."""
+        return repr(dict(self.items()))
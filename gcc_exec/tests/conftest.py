@@ -0,0 +1,56 @@
+"""This file contains the fixtures shared by the test modules."""
+# pylint: disable=E0401
+import os
+from os.path import dirname, join
+from typing import Any, Callable
+
+import pytest
+from dotenv import load_dotenv
+from gcc_user import GccUser
+from gcc_workflow import GccWorkflow
+
+
+@pytest.fixture(name="gcc_user_obj", scope="session")
+def fixture_gcc_user_obj() -> GccUser:
+    """This function returns a GccUser with the credentials of the test environment."""
+    if os.path.isfile(join(dirname(__file__), ".env")):
+        load_dotenv()
+
+    return GccUser(
+        oauth2_refresh_token=os.environ.get("OAUTH2_REFRESH_TOKEN"),
+        aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
+        aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
+    )
+
+
+@pytest.fixture(name="read_specification", scope="session")
+def fixture_read_specification() -> Callable[[str], str]:
+    """This function returns a function that reads a test specification by file name."""
+
+    def read_specification(xml_specification_filename: str) -> str:
+        with open(
+            join(dirname(__file__), f"data/spec/{xml_specification_filename}"),
+            encoding="utf-8",
+        ) as xml_specification_file:
+            return xml_specification_file.read()
+
+    return read_specification
+
+
+@pytest.fixture(name="initialize_workflow")
+def fixture_initialize_workflow(gcc_user_obj: GccUser) -> Callable[..., GccWorkflow]:
+    """This function returns a function that plans and initializes a workflow."""
+
+    def initialize_workflow(
+        workflow_name: str, xml_specification: str, **kwargs: Any
+    ) -> GccWorkflow:
+        gcc_workflow_obj = GccWorkflow(
+            gcc_user_obj=gcc_user_obj, workflow_name=workflow_name, **kwargs
+        )
+        gcc_workflow_obj.plan(
+            available_machines=[], xml_specification=xml_specification
+        )
+        gcc_workflow_obj.initialize()
+        return gcc_workflow_obj
+
+    return initialize_workflow
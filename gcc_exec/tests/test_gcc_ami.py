@@ -0,0 +1,47 @@
+"""This file contains the TestGccAmi class."""
+# pylint: disable=E0401
+from unittest import mock
+
+from gcc_ami import build_base_image
+from gcc_ec2 import BASE_IMAGE_TAG, GccEc2
+from gcc_node import BASE_IMAGE_VERSION
+
+
+class TestGccAmi:
+    """This class contains methods to test the GCC base image builder."""
+
+    @mock.patch("gcc_ami.run_bootstrap_commands", return_value=None)
+    def test_build_base_image(self, mock_run_bootstrap_commands: mock.MagicMock):
+        """This method ensures a bootstrapped instance is imaged and cleaned up."""
+        gcc_ec2_obj = mock.MagicMock(spec=GccEc2)
+        gcc_ec2_obj.find_base_image.return_value = None
+        gcc_ec2_obj.create_security_group.return_value = {"GroupId": "group"}
+        gcc_ec2_obj.create_key_pair.return_value = {
+            "KeyName": "key",
+            "KeyMaterial": "pem",
+        }
+        gcc_ec2_obj.create_instance.return_value = {
+            "Instances": [{"InstanceId": "i-0"}]
+        }
+        gcc_ec2_obj.wait_until_running.return_value = {"i-0": "10.0.0.1"}
+        gcc_ec2_obj.create_image.return_value = "ami-0"
+
+        assert build_base_image(gcc_ec2_obj) == "ami-0"
+
+        mock_run_bootstrap_commands.assert_called_once_with("10.0.0.1", "pem")
+        gcc_ec2_obj.create_image.assert_called_once_with(
+            "i-0",
+            f"gcc-base-{BASE_IMAGE_VERSION}",
+            {BASE_IMAGE_TAG: BASE_IMAGE_VERSION},
+        )
+        gcc_ec2_obj.terminate_instance.assert_called_once_with("i-0")
+        gcc_ec2_obj.delete_key_pair.assert_called_once_with("key")
+        gcc_ec2_obj.delete_security_group.assert_called_once_with("group")
+
+    def test_build_base_image_exists(self):
+        """This method ensures an existing base image is reused."""
+        gcc_ec2_obj = mock.MagicMock(spec=GccEc2)
+        gcc_ec2_obj.find_base_image.return_value = "ami-0"
+
+        assert build_base_image(gcc_ec2_obj) == "ami-0"
+        assert not gcc_ec2_obj.create_instance.called
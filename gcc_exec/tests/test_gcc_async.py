@@ -0,0 +1,306 @@
+"""This file contains the TestGccAsyncWorkflow class."""
+# pylint: disable=W1514,E0401,R0913
+import asyncio
+import threading
+from typing import Any, Callable
+from unittest import mock
+
+import pytest
+from gcc_async import GccAsyncWorkflow, probe_port
+from gcc_user import GccUser
+from gcc_workflow import GccWorkflow
+
+
+@pytest.fixture(name="plan_workflow")
+def fixture_plan_workflow(
+    gcc_user_obj: GccUser, read_specification: Callable[[str], str]
+) -> Callable[..., GccAsyncWorkflow]:
+    """This function returns a function that plans a test specification in the async engine."""
+
+    def plan_workflow(
+        xml_specification_filename: str,
+        gcc_async_kwargs: dict = None,
+        **kwargs: Any,
+    ) -> GccAsyncWorkflow:
+        gcc_async_workflow_obj = GccAsyncWorkflow(
+            GccWorkflow(
+                gcc_user_obj=gcc_user_obj, workflow_name="workflow_async", **kwargs
+            ),
+            **(gcc_async_kwargs or {}),
+        )
+        asyncio.run(
+            gcc_async_workflow_obj.plan(
+                [],
+                xml_specification=read_specification(xml_specification_filename),
+            )
+        )
+        return gcc_async_workflow_obj
+
+    return plan_workflow
+
+
+class TestGccAsyncWorkflow:
+    """This class contains methods to test the GccAsyncWorkflow class."""
+
+    @mock.patch("gcc_async.probe_port", return_value=True)
+    @mock.patch(
+        "gcc_ec2.GccEc2.wait_until_running",
+        side_effect=lambda instance_ids: dict.fromkeys(instance_ids, "10.0.0.1"),
+    )
+    @mock.patch("gcc_ec2.GccEc2.find_base_image", return_value=None)
+    @mock.patch(
+        "gcc_ec2.GccEc2.create_instances",
+        side_effect=lambda _key_pair_name, _security_group_id, instance_count, **_: [
+            f"i-{index}" for index in range(instance_count)
+        ],
+    )
+    @mock.patch("gcc_workflow.GccWorkflow.create_execution_resources")
+    def test_initialize(
+        self,
+        mock_create_execution_resources: mock.MagicMock,
+        mock_create_instances: mock.MagicMock,
+        mock_find_base_image: mock.MagicMock,
+        mock_wait_until_running: mock.MagicMock,
+        mock_probe_port: mock.MagicMock,
+        plan_workflow: Callable[..., GccAsyncWorkflow],
+    ):
+        """This method ensures pooled nodes get the address of their running instance."""
+        gcc_async_workflow_obj = plan_workflow("spec_1.xml")
+        gcc_workflow_obj = gcc_async_workflow_obj.get_gcc_workflow_obj()
+        gcc_workflow_obj.set_gcc_key_pair({"KeyName": "key", "KeyMaterial": "pem"})
+        gcc_workflow_obj.set_gcc_security_group({"GroupId": "group"})
+        nodes = gcc_workflow_obj.get_workflow_dict()["nodes"]
+        mock_create_execution_resources.return_value = list(nodes.values())
+
+        asyncio.run(gcc_async_workflow_obj.initialize())
+
+        assert mock_find_base_image.called
+        assert mock_create_instances.call_count == 1
+        assert mock_wait_until_running.call_count == 1
+        assert mock_probe_port.call_count == 4
+        assert all(
+            node.get_node_virtual_machine()["ip"] == "10.0.0.1"
+            for node in nodes.values()
+        )
+
+    @mock.patch("gcc_async.asyncssh", None)
+    @mock.patch("gcc_node.GccNode.upload_log", return_value=None)
+    @mock.patch("gcc_node.GccNode.upload_telemetry", return_value=None)
+    @mock.patch("gcc_node.GccNode.run_commands", return_value=None)
+    @mock.patch("gcc_node.GccNode.get_exec_commands", return_value=["exit"])
+    def test_execute(
+        self,
+        mock_get_exec_commands: mock.MagicMock,
+        mock_run_commands: mock.MagicMock,
+        mock_upload_telemetry: mock.MagicMock,
+        mock_upload_log: mock.MagicMock,
+        plan_workflow: Callable[..., GccAsyncWorkflow],
+    ):
+        """This method ensures type 0 nodes start once their producers finish."""
+        gcc_async_workflow_obj = plan_workflow("spec_1.xml")
+
+        asyncio.run(gcc_async_workflow_obj.execute())
+        gcc_async_workflow_obj.shutdown()
+
+        timeline = gcc_async_workflow_obj.get_gcc_workflow_obj().get_workflow_dict()[
+            "timeline"
+        ]
+
+        assert mock_get_exec_commands.call_count == 4
+        assert mock_run_commands.call_count == 4
+        assert mock_upload_telemetry.call_count == 4
+        assert mock_upload_log.call_count == 4
+        assert timeline["n2"]["start"] >= timeline["n1"]["finish"]
+        assert timeline["n3"]["start"] >= timeline["n1"]["finish"]
+        assert timeline["n4"]["start"] >= max(
+            timeline["n2"]["finish"], timeline["n3"]["finish"]
+        )
+
+    @mock.patch("gcc_async.asyncssh", None)
+    @mock.patch("gcc_node.GccNode.upload_log", return_value=None)
+    @mock.patch("gcc_node.GccNode.upload_telemetry", return_value=None)
+    @mock.patch("gcc_node.GccNode.run_commands")
+    @mock.patch("gcc_node.GccNode.get_exec_commands", return_value=["exit"])
+    def test_execute_type_1(
+        self,
+        mock_get_exec_commands: mock.MagicMock,
+        mock_run_commands: mock.MagicMock,
+        mock_upload_telemetry: mock.MagicMock,
+        mock_upload_log: mock.MagicMock,
+        plan_workflow: Callable[..., GccAsyncWorkflow],
+    ):
+        """This method ensures type 1 nodes all run at once, even past max_connections."""
+        gcc_async_workflow_obj = plan_workflow(
+            "spec_2.xml", gcc_async_kwargs={"max_connections": 1}
+        )
+        streaming = threading.Barrier(4, timeout=5)
+        mock_run_commands.side_effect = lambda *_: streaming.wait()
+
+        asyncio.run(gcc_async_workflow_obj.execute())
+        gcc_async_workflow_obj.shutdown()
+
+        assert not streaming.broken
+        assert mock_get_exec_commands.call_count == 4
+        assert mock_run_commands.call_count == 4
+        assert mock_upload_telemetry.call_count == 4
+        assert mock_upload_log.call_count == 4
+
+    @mock.patch("gcc_async.asyncssh", None)
+    @mock.patch("gcc_node.GccNode.run_commands")
+    def test_execute_type_1_blocking_calls(
+        self,
+        mock_run_commands: mock.MagicMock,
+        plan_workflow: Callable[..., GccAsyncWorkflow],
+    ):
+        """This method ensures type 1 nodes that cannot all run on its threads fail early."""
+        gcc_async_workflow_obj = plan_workflow(
+            "spec_2.xml", gcc_async_kwargs={"max_blocking_calls": 3}
+        )
+
+        with pytest.raises(ValueError, match="4 nodes exceed max_blocking_calls=3"):
+            asyncio.run(gcc_async_workflow_obj.execute())
+        gcc_async_workflow_obj.shutdown()
+
+        assert not mock_run_commands.called
+
+    @mock.patch("gcc_async.asyncssh", None)
+    @mock.patch(
+        "gcc_ec2.GccEc2.find_interrupted_instances",
+        side_effect=lambda instance_ids: [
+            instance_id for instance_id in instance_ids if instance_id == "i-n1"
+        ],
+    )
+    @mock.patch("gcc_node.GccNode.reschedule", return_value=None)
+    @mock.patch("gcc_node.GccNode.upload_log", return_value=None)
+    @mock.patch("gcc_node.GccNode.upload_telemetry", return_value=None)
+    @mock.patch("gcc_node.GccNode.run_commands", autospec=True)
+    @mock.patch("gcc_node.GccNode.get_exec_commands", return_value=["exit"])
+    def test_execute_reschedules_interrupted_spot_nodes(
+        self,
+        mock_get_exec_commands: mock.MagicMock,
+        mock_run_commands: mock.MagicMock,
+        mock_upload_telemetry: mock.MagicMock,
+        mock_upload_log: mock.MagicMock,
+        mock_reschedule: mock.MagicMock,
+        mock_find_interrupted_instances: mock.MagicMock,
+        plan_workflow: Callable[..., GccAsyncWorkflow],
+    ):
+        """This method ensures a node whose spot instance was reclaimed runs again first."""
+        gcc_async_workflow_obj = plan_workflow("spec_1.xml", spot_instances=True)
+        gcc_workflow_obj = gcc_async_workflow_obj.get_gcc_workflow_obj()
+        for node_id, node in gcc_workflow_obj.get_workflow_dict()["nodes"].items():
+            node.set_node_virtual_machine(
+                {"ip": "10.0.0.1", "pem": "pem", "instance_id": f"i-{node_id}"}
+            )
+        executed = []
+
+        def run_commands(node, *_):
+            executed.append(node.get_node_id())
+            if executed == ["n1"]:
+                raise OSError("Connection reset")
+
+        mock_run_commands.side_effect = run_commands
+
+        asyncio.run(gcc_async_workflow_obj.execute())
+        gcc_async_workflow_obj.shutdown()
+
+        timeline = gcc_workflow_obj.get_workflow_dict()["timeline"]
+
+        assert sorted(executed) == ["n1", "n1", "n2", "n3", "n4"]
+        assert mock_get_exec_commands.call_count == 5
+        assert mock_upload_telemetry.call_count == 4
+        assert mock_upload_log.call_count == 4
+        assert mock_reschedule.call_count == 1
+        assert mock_find_interrupted_instances.call_args.args[0] == ["i-n1"]
+        assert timeline["n2"]["start"] >= timeline["n1"]["finish"]
+
+    @mock.patch("gcc_workflow.GccWorkflow.delete_execution_resources")
+    @mock.patch("gcc_backend.GccEc2Backend.terminate")
+    @mock.patch("gcc_node.GccNode.write_script_log", return_value=[])
+    @mock.patch(
+        "gcc_node.GccNode.get_node_config", return_value={"config_commands": ["true"]}
+    )
+    @mock.patch("gcc_node.GccNode.set_config_commands", return_value=None)
+    @mock.patch("gcc_async.asyncssh")
+    def test_configure_reuses_connections(
+        self,
+        mock_asyncssh: mock.MagicMock,
+        mock_set_config_commands: mock.MagicMock,
+        mock_get_node_config: mock.MagicMock,
+        mock_write_script_log: mock.MagicMock,
+        mock_terminate: mock.MagicMock,
+        mock_delete_execution_resources: mock.MagicMock,
+        plan_workflow: Callable[..., GccAsyncWorkflow],
+    ):
+        """This method ensures sessions on a machine share one connection until it fails."""
+        connections = []
+
+        def connect(ip_address, **_):
+            connection = mock.MagicMock(ip_address=ip_address)
+            connection.run = mock.AsyncMock(return_value=mock.MagicMock(stdout=""))
+            connection.wait_closed = mock.AsyncMock()
+            connections.append(connection)
+            return connection
+
+        mock_asyncssh.connect = mock.AsyncMock(side_effect=connect)
+        gcc_async_workflow_obj = plan_workflow("spec_1.xml")
+        nodes = gcc_async_workflow_obj.get_gcc_workflow_obj().get_workflow_dict()[
+            "nodes"
+        ]
+        for node_id, node in nodes.items():
+            node.set_node_virtual_machine(
+                {
+                    "ip": "10.0.0.1" if node_id in ("n1", "n2") else "10.0.0.2",
+                    "pem": "pem",
+                    "instance_id": None,
+                }
+            )
+
+        async def run() -> None:
+            await gcc_async_workflow_obj.configure()
+            await gcc_async_workflow_obj.configure()
+            assert [connection.ip_address for connection in connections] == [
+                "10.0.0.1",
+                "10.0.0.2",
+            ]
+
+            connections[0].run.side_effect = OSError("Connection reset")
+            with pytest.raises(OSError):
+                await gcc_async_workflow_obj.configure()
+            await gcc_async_workflow_obj.configure()
+            assert [connection.ip_address for connection in connections] == [
+                "10.0.0.1",
+                "10.0.0.2",
+                "10.0.0.1",
+            ]
+
+            await gcc_async_workflow_obj.complete()
+
+        asyncio.run(run())
+        gcc_async_workflow_obj.shutdown()
+
+        assert mock_set_config_commands.call_count == 16
+        assert mock_get_node_config.called
+        assert mock_write_script_log.called
+        assert [connection.close.call_count for connection in connections] == [
+            1,
+            1,
+            1,
+        ]
+        assert mock_terminate.called
+        assert mock_delete_execution_resources.called
+
+    def test_probe_port(self):
+        """This method ensures ports are only reported open while something listens."""
+
+        async def probe() -> tuple:
+            server = await asyncio.start_server(
+                lambda reader, writer: writer.close(), "127.0.0.1", 0
+            )
+            port = server.sockets[0].getsockname()[1]
+            listening = await probe_port("127.0.0.1", port)
+            server.close()
+            await server.wait_closed()
+            return listening, await probe_port("127.0.0.1", port, timeout=1.0)
+
+        assert asyncio.run(probe()) == (True, False)
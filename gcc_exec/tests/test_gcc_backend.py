@@ -0,0 +1,235 @@
+"""This file contains the TestGccLocalBackend class."""
+# pylint: disable=E0401,W1514,R0913,R0914
+import os
+from typing import Callable
+from unittest import mock
+
+import pytest
+from gcc_backend import GccEc2Backend, GccLocalBackend, stream_to_log
+from gcc_log_uploader import GccLogUploader
+from gcc_user import GccUser
+from gcc_workflow import GccWorkflow
+
+
+class TestGccLocalBackend:
+    """This class contains methods to test the GccLocalBackend class."""
+
+    @mock.patch("gcc_drbx.GccDrbx.upload_file", return_value=None)
+    @mock.patch("gcc_drbx.GccDrbx.get_file_content_hash", return_value="0" * 64)
+    @mock.patch("gcc_drbx.GccDrbx.get_file_link", return_value="link")
+    @mock.patch("gcc_drbx.GccDrbx.create_folder", return_value=None)
+    def test_execute(
+        self,
+        mock_create_folder: mock.MagicMock,
+        mock_get_file_link: mock.MagicMock,
+        mock_get_file_content_hash: mock.MagicMock,
+        mock_upload_file: mock.MagicMock,
+        tmp_path,
+        monkeypatch,
+        initialize_workflow: Callable[..., GccWorkflow],
+    ):
+        """This method ensures nodes run in their own home directory on this host."""
+        monkeypatch.chdir(tmp_path)
+        gcc_workflow_obj = initialize_workflow(
+            "workflow_local",
+            '<workflow type="0"><task id="a"/><task id="b"/></workflow>',
+            gcc_backend=GccLocalBackend(max_processes=2),
+        )
+
+        nodes = gcc_workflow_obj.get_workflow_dict()["nodes"]
+        for node_id, node in nodes.items():
+            home_dir = node.get_node_virtual_machine()["home_dir"]
+            os.makedirs(f"{home_dir}/{node_id}")
+            with open(f"{home_dir}/{node_id}/run.sh", "w") as run_file:
+                run_file.write(
+                    f'echo "{node_id} in $(pwd) at $HOME"\necho "{node_id} error" >&2\n'
+                )
+            node.set_config_commands()
+            assert node.get_node_config()["config_commands"][0] == (
+                f"rm -rf {home_dir}/{node_id}"
+            )
+
+        gcc_workflow_obj.execute()
+
+        for node_id, node in nodes.items():
+            home_dir = node.get_node_virtual_machine()["home_dir"]
+            with open(node.get_log_path()) as log_file:
+                log = log_file.read()
+            assert f"{node_id} in {home_dir}/{node_id} at {home_dir}" in log
+            assert f"{node_id} error" in log
+
+        gcc_workflow_obj.complete()
+
+        assert not os.path.exists(f"{tmp_path}/tmp/{gcc_workflow_obj.get_tmp_dir()}")
+        assert mock_create_folder.called
+        assert mock_get_file_link.called
+        assert mock_get_file_content_hash.called
+        assert mock_upload_file.call_count == 4
+        assert {
+            os.path.basename(call.args[1]) for call in mock_upload_file.call_args_list
+        } >= {"a_telemetry.csv", "b_telemetry.csv"}
+
+    @mock.patch("gcc_drbx.GccDrbx.delete", return_value=None)
+    @mock.patch("gcc_drbx.GccDrbx.upload_data", return_value=None)
+    @mock.patch("gcc_drbx.GccDrbx.upload_file", return_value=None)
+    @mock.patch("gcc_drbx.GccDrbx.get_file_content_hash", return_value="0" * 64)
+    @mock.patch("gcc_drbx.GccDrbx.get_file_link", return_value="link")
+    @mock.patch("gcc_drbx.GccDrbx.create_folder", return_value=None)
+    def test_upload_log_parts(
+        self,
+        mock_create_folder: mock.MagicMock,
+        mock_get_file_link: mock.MagicMock,
+        mock_get_file_content_hash: mock.MagicMock,
+        mock_upload_file: mock.MagicMock,
+        mock_upload_data: mock.MagicMock,
+        mock_delete: mock.MagicMock,
+        tmp_path,
+        monkeypatch,
+        initialize_workflow: Callable[..., GccWorkflow],
+    ):
+        """This method ensures logs are uploaded in parts while nodes run and whole after."""
+        monkeypatch.chdir(tmp_path)
+        gcc_workflow_obj = initialize_workflow(
+            "workflow_local",
+            '<workflow type="0"><task id="a"/></workflow>',
+            gcc_backend=GccLocalBackend(),
+            gcc_log_uploader=GccLogUploader(interval=0.05),
+            telemetry_interval=None,
+        )
+
+        node = gcc_workflow_obj.get_workflow_dict()["nodes"]["a"]
+        home_dir = node.get_node_virtual_machine()["home_dir"]
+        os.makedirs(f"{home_dir}/a")
+        with open(f"{home_dir}/a/run.sh", "w") as run_file:
+            run_file.write("echo first\nsleep 0.5\necho second\nsleep 0.5\n")
+        node.set_config_commands()
+
+        gcc_workflow_obj.execute()
+
+        drbx_log_path = (
+            f"/workflow_local/exec/{gcc_workflow_obj.get_exec_date_time()}/a/a_logs"
+        )
+        parts = [call.args for call in mock_upload_data.call_args_list]
+        assert len(parts) >= 2
+        assert [path for _, path in parts] == [
+            f"{drbx_log_path}/{number:05d}.txt" for number in range(1, len(parts) + 1)
+        ]
+        with open(node.get_log_path(), "rb") as log_file:
+            assert log_file.read().startswith(b"".join(part for part, _ in parts))
+        mock_upload_file.assert_called_with(node.get_log_path(), f"{drbx_log_path}.txt")
+        mock_delete.assert_called_once_with(drbx_log_path)
+
+        gcc_workflow_obj.complete()
+
+        assert mock_create_folder.called
+        assert mock_get_file_link.called
+        assert mock_get_file_content_hash.called
+
+    @mock.patch("gcc_drbx.GccDrbx.create_folder", return_value=None)
+    def test_provision_remote_nodes(
+        self,
+        mock_create_folder: mock.MagicMock,
+        tmp_path,
+        monkeypatch,
+        gcc_user_obj: GccUser,
+    ):
+        """This method ensures nodes with a machine are not silently run locally."""
+        monkeypatch.chdir(tmp_path)
+        gcc_workflow_obj = GccWorkflow(
+            gcc_user_obj=gcc_user_obj,
+            workflow_name="workflow_local",
+            gcc_backend=GccLocalBackend(),
+        )
+        gcc_workflow_obj.plan(
+            available_machines=[],
+            xml_specification='<workflow type="0"><task id="a"><vm>10.0.0.1</vm></task>'
+            '<task id="b"/></workflow>',
+        )
+
+        with pytest.raises(ValueError, match="Nodes a have a machine"):
+            gcc_workflow_obj.initialize()
+        assert mock_create_folder.called
+
+    def test_reserve_ports(self):
+        """This method ensures local nodes never receive streams on the same port."""
+        gcc_local_backend = GccLocalBackend(port_base=30000)
+
+        assert gcc_local_backend.reserve_ports(None, 2) == 30000
+        assert gcc_local_backend.reserve_ports(None, 3) == 30002
+        assert gcc_local_backend.reserve_ports(None, 1) == 30005
+
+    def test_get_cleanup_command(self):
+        """This method ensures only instance home directories are removed as root."""
+        assert (
+            GccLocalBackend().get_cleanup_command(None, "/tmp/x/a") == "rm -rf /tmp/x/a"
+        )
+        assert GccEc2Backend().get_cleanup_command(None, "/home/ubuntu/a") == (
+            "sudo rm -rf /home/ubuntu/a"
+        )
+
+    def test_stream_to_log(self, tmp_path):
+        """This method ensures characters split across chunks are decoded whole."""
+        with open(tmp_path / "log.txt", "w+", encoding="utf-8") as log_file:
+            stream_to_log(iter(["caf\u00e9 ".encode()[:4], b"\xa9 ok\n"]), log_file)
+            log_file.seek(0)
+
+            assert log_file.read() == "caf\u00e9 ok\n"
+
+    @mock.patch("gcc_drbx.GccDrbx.upload_file", return_value=None)
+    @mock.patch("gcc_drbx.GccDrbx.get_file_content_hash", return_value="0" * 64)
+    @mock.patch("gcc_drbx.GccDrbx.get_file_link", return_value="link")
+    @mock.patch("gcc_drbx.GccDrbx.create_folder", return_value=None)
+    def test_stage_inputs(
+        self,
+        mock_create_folder: mock.MagicMock,
+        mock_get_file_link: mock.MagicMock,
+        mock_get_file_content_hash: mock.MagicMock,
+        mock_upload_file: mock.MagicMock,
+        tmp_path,
+        monkeypatch,
+        initialize_workflow: Callable[..., GccWorkflow],
+    ):
+        """This method ensures type 0 inputs are staged and verified before run.sh starts."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "x.csv").write_text("1,2,3\n")
+        gcc_workflow_obj = initialize_workflow(
+            "workflow_local",
+            '<workflow type="0"><task id="a"/>'
+            '<task id="b"><dep node="a">*</dep></task></workflow>',
+            gcc_backend=GccLocalBackend(),
+        )
+
+        nodes = gcc_workflow_obj.get_workflow_dict()["nodes"]
+        for node_id, node in nodes.items():
+            home_dir = node.get_node_virtual_machine()["home_dir"]
+            os.makedirs(f"{home_dir}/{node_id}/data/in")
+            with open(f"{home_dir}/{node_id}/run.sh", "w") as run_file:
+                run_file.write("cat data/in/*\n")
+            node.set_config_commands()
+
+        with mock.patch(
+            "gcc_drbx.GccDrbx.list_file_metadata",
+            return_value={"x.csv": {"size": 6, "content_hash": None}},
+        ) as mock_list_file_metadata, mock.patch(
+            "gcc_drbx.GccDrbx.get_file_links",
+            side_effect=lambda paths, _: [(tmp_path / "x.csv").as_uri() for _ in paths],
+        ):
+            gcc_workflow_obj.execute()
+
+        mock_list_file_metadata.assert_called_once_with(
+            f"/workflow_local/exec/{gcc_workflow_obj.get_exec_date_time()}/a/data/out"
+        )
+        with open(nodes["b"].get_log_path()) as log_file:
+            log = log_file.read()
+        assert "staged 1 of 1 inputs" in log
+        assert log.index("staged 1 of 1 inputs") < log.index("1,2,3")
+
+        gcc_workflow_obj.complete()
+
+        assert mock_create_folder.called
+        assert mock_get_file_link.called
+        assert mock_get_file_content_hash.called
+        assert mock_upload_file.call_count == 4
+        assert {
+            os.path.basename(call.args[1]) for call in mock_upload_file.call_args_list
+        } >= {"a_telemetry.csv", "b_telemetry.csv"}
@@ -0,0 +1,221 @@
+"""This file contains the TestGccBenchmark class and synthetic workflow generators."""
+# pylint: disable=E0401,W1514
+import gc
+import json
+import os
+import random
+import time
+import tracemalloc
+from os.path import dirname, join
+from unittest import mock
+
+import pytest
+from gcc_plan_cache import GccPlanCache
+from gcc_user import GccUser
+from gcc_workflow import GccWorkflow
+
+BASELINE_PATH = join(dirname(__file__), "data/benchmark/plan_baseline.json")
+BENCHMARK_SIZES = [10, 100, 1000, 10000, 100000]
+BENCHMARK_MAX_TASKS = int(os.environ.get("GCC_BENCHMARK_MAX_TASKS", "1000"))
+BENCHMARK_UPDATE = os.environ.get("GCC_BENCHMARK_UPDATE") == "1"
+TIME_TOLERANCE = float(os.environ.get("GCC_BENCHMARK_TIME_TOLERANCE", "2.0"))
+MEMORY_TOLERANCE = float(os.environ.get("GCC_BENCHMARK_MEMORY_TOLERANCE", "1.25"))
+MIN_COMPARED_TIME = 0.05
+
+
+def generate_chain(task_count: int) -> list:
+    """Return (task id, dependency ids) pairs for a single chain of tasks."""
+    return [
+        (f"t{index}", [f"t{index - 1}"] if index > 0 else [])
+        for index in range(task_count)
+    ]
+
+
+def generate_fan_out_fan_in(task_count: int) -> list:
+    """Return (task id, dependency ids) pairs for one source, a wide middle and one sink."""
+    middle_ids = [f"t{index}" for index in range(1, task_count - 1)]
+    return (
+        [("t0", [])]
+        + [(middle_id, ["t0"]) for middle_id in middle_ids]
+        + [(f"t{task_count - 1}", middle_ids)]
+    )
+
+
+def generate_diamond(task_count: int) -> list:
+    """Return (task id, dependency ids) pairs for a chain of four-task diamonds."""
+    tasks = []
+    for index in range(task_count):
+        position = index % 4
+        if index == 0:
+            dependencies = []
+        elif position == 0:
+            dependencies = [f"t{index - 1}"]
+        elif position in (1, 2):
+            dependencies = [f"t{index - position}"]
+        else:
+            dependencies = [f"t{index - 2}", f"t{index - 1}"]
+        tasks.append((f"t{index}", dependencies))
+    return tasks
+
+
+def generate_random_layered(task_count: int, seed: int = 0) -> list:
+    """Return shuffled (task id, dependency ids) pairs for random layers of tasks."""
+    generator = random.Random(seed)
+    layer_width = max(1, int(task_count**0.5))
+    tasks = []
+    previous_layer = []
+
+    for start in range(0, task_count, layer_width):
+        layer = [
+            f"t{index}" for index in range(start, min(start + layer_width, task_count))
+        ]
+        for task_id in layer:
+            dependencies = []
+            if previous_layer:
+                dependencies = generator.sample(
+                    previous_layer, min(len(previous_layer), generator.randint(1, 3))
+                )
+            tasks.append((task_id, dependencies))
+        previous_layer = layer
+
+    generator.shuffle(tasks)
+    return tasks
+
+
+def generate_wide_shallow(task_count: int) -> list:
+    """Return (task id, dependency ids) pairs for a few roots that each feed many tasks."""
+    root_count = max(1, task_count // 100)
+    return [
+        (f"t{index}", [f"t{index % root_count}"] if index >= root_count else [])
+        for index in range(task_count)
+    ]
+
+
+GENERATORS = {
+    "chain": generate_chain,
+    "fan_out_fan_in": generate_fan_out_fan_in,
+    "diamond": generate_diamond,
+    "random_layered": generate_random_layered,
+    "wide_shallow": generate_wide_shallow,
+}
+
+
+def generate_specification(tasks: list) -> str:
+    """Return a type 0 spec.xml for (task id, dependency ids) pairs."""
+    lines = ['<?xml version="1.0"?>', '<workflow type="0">']
+    for task_id, dependencies in tasks:
+        deps = "".join(f'<dep node="{dep_id}">out.txt</dep>' for dep_id in dependencies)
+        lines.append(f'<task id="{task_id}">{deps}</task>')
+    lines.append("</workflow>")
+    return "\n".join(lines)
+
+
+def plan_specification(xml_specification: str) -> GccWorkflow:
+    """Plan a specification offline with an empty plan cache."""
+    gcc_workflow_obj = GccWorkflow(
+        GccUser(None, None, None), "benchmark", gcc_plan_cache=GccPlanCache()
+    )
+    gcc_workflow_obj.plan(available_machines=[], xml_specification=xml_specification)
+    return gcc_workflow_obj
+
+
+def measure_plan(xml_specification: str, repeats: int) -> dict:
+    """Return the wall time, peak traced memory and blocks still allocated by a planned spec."""
+    wall_time = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        plan_specification(xml_specification)
+        elapsed = time.perf_counter() - start
+        wall_time = elapsed if wall_time is None else min(wall_time, elapsed)
+
+    gc.collect()
+    tracemalloc.start()
+    gcc_workflow_obj = plan_specification(xml_specification)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    allocated_blocks = sum(
+        statistic.count
+        for statistic in tracemalloc.take_snapshot().statistics("filename")
+    )
+    tracemalloc.stop()
+    del gcc_workflow_obj
+
+    return {
+        "wall_time": round(wall_time, 4),
+        "peak_memory": peak_memory,
+        "allocated_blocks": allocated_blocks,
+    }
+
+
+@pytest.mark.benchmark
+class TestGccBenchmark:
+    """This class contains methods to benchmark GccWorkflow.plan on synthetic workflows."""
+
+    __baseline = {}
+
+    @classmethod
+    def setup_class(cls):
+        """Load the recorded baseline."""
+        with open(BASELINE_PATH) as baseline_file:
+            cls.__baseline = json.load(baseline_file)
+
+    @classmethod
+    def teardown_class(cls):
+        """Write the baseline back when it is being updated."""
+        if BENCHMARK_UPDATE:
+            with open(BASELINE_PATH, "w") as baseline_file:
+                json.dump(cls.__baseline, baseline_file, indent=2, sort_keys=True)
+                baseline_file.write("\n")
+
+    @mock.patch("gcc_workflow.GccEc2")
+    @mock.patch("gcc_workflow.GccDrbx")
+    @pytest.mark.parametrize("task_count", BENCHMARK_SIZES)
+    @pytest.mark.parametrize("shape", list(GENERATORS))
+    def test_plan(
+        self,
+        mock_gcc_drbx: mock.MagicMock,
+        mock_gcc_ec2: mock.MagicMock,
+        shape: str,
+        task_count: int,
+    ):
+        """This method ensures planning stays within the recorded baseline."""
+        if task_count > BENCHMARK_MAX_TASKS:
+            pytest.skip(f"GCC_BENCHMARK_MAX_TASKS is {BENCHMARK_MAX_TASKS}")
+
+        tasks = GENERATORS[shape](task_count)
+        xml_specification = generate_specification(tasks)
+
+        gcc_workflow_obj = plan_specification(xml_specification)
+        assert len(gcc_workflow_obj.get_workflow_dict()["nodes"]) == task_count
+        del gcc_workflow_obj
+
+        result = measure_plan(xml_specification, 3 if task_count <= 10000 else 1)
+        benchmark_name = f"{shape}-{task_count}"
+
+        assert not mock_gcc_drbx.return_value.method_calls
+        assert not mock_gcc_ec2.return_value.method_calls
+
+        if BENCHMARK_UPDATE:
+            self.__baseline[benchmark_name] = result
+            return
+
+        assert (
+            benchmark_name in self.__baseline
+        ), f"{benchmark_name} has no baseline, run with GCC_BENCHMARK_UPDATE=1"
+        baseline = self.__baseline[benchmark_name]
+
+        if result["wall_time"] > MIN_COMPARED_TIME:
+            assert result["wall_time"] <= baseline["wall_time"] * TIME_TOLERANCE, (
+                f"{benchmark_name} planned in {result['wall_time']}s, "
+                f"baseline is {baseline['wall_time']}s"
+            )
+        assert (
+            result["allocated_blocks"]
+            <= baseline["allocated_blocks"] * MEMORY_TOLERANCE + 1000
+        ), (
+            f"{benchmark_name} retained {result['allocated_blocks']} blocks, "
+            f"baseline is {baseline['allocated_blocks']} blocks"
+        )
+        assert result["peak_memory"] <= baseline["peak_memory"] * MEMORY_TOLERANCE, (
+            f"{benchmark_name} peaked at {result['peak_memory']} bytes, "
+            f"baseline is {baseline['peak_memory']} bytes"
+        )
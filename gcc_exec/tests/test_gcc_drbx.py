@@ -1,7 +1,11 @@
 """This file contains the TestGccDrbx class."""
 # pylint: disable=E0401
 import os
+import threading
+import time
 from os.path import dirname, join
+from types import SimpleNamespace
+from unittest import mock
 
 from dotenv import load_dotenv
 from dropbox.files import CreateFolderResult, DeleteResult, FileMetadata, FolderMetadata
@@ -48,6 +52,13 @@ class TestGccDrbx:
         assert isinstance(response, str)
         assert len(response.splitlines()) > 0
 
+    def test_get_file_content_hash(self):
+        """This method ensures file content hashes are retrieved properly."""
+        response = self.__gcc_drbx_obj.get_file_content_hash(self.__drbx_file_path)
+
+        assert isinstance(response, str)
+        assert len(response) == 64
+
     def test_get_file_link(self):
         """This method ensures file links are retrieved properly."""
         response = self.__gcc_drbx_obj.get_file_link(self.__drbx_file_path)
@@ -61,3 +72,109 @@ class TestGccDrbx:
 
         assert isinstance(response, DeleteResult)
         assert response.metadata.path_lower == self.__drbx_folder_path
+
+
+class TestGccDrbxLinks:
+    """This class contains methods to test the download link cache of the GccDrbx class."""
+
+    def test_get_file_links(self):
+        """This method ensures each distinct file gets one link request while it is cached."""
+        requested = []
+        lock = threading.Lock()
+
+        def get_temporary_link(drbx_file_path):
+            time.sleep(0.05)
+            with lock:
+                requested.append(drbx_file_path)
+            return SimpleNamespace(link=f"https://dl{drbx_file_path}")
+
+        gcc_drbx_obj = GccDrbx(oauth2_refresh_token="token", link_workers=4)
+        drbx_file_paths = [f"/w/data/{index % 5}.csv" for index in range(20)]
+
+        with mock.patch(
+            "dropbox.Dropbox.files_get_temporary_link", side_effect=get_temporary_link
+        ):
+            start = time.monotonic()
+            links = gcc_drbx_obj.get_file_links(drbx_file_paths)
+            assert time.monotonic() - start < 0.2
+            assert (
+                gcc_drbx_obj.get_file_link("/w/data/3.csv") == "https://dl/w/data/3.csv"
+            )
+
+        assert links == [f"https://dl{path}" for path in drbx_file_paths]
+        assert sorted(requested) == sorted(set(drbx_file_paths))
+
+    def test_get_file_links_limit(self):
+        """This method ensures link requests never exceed the limit callers share."""
+        in_flight = [0]
+        most_in_flight = []
+        lock = threading.Lock()
+        drbx_limit = threading.BoundedSemaphore(2)
+
+        def get_temporary_link(drbx_file_path):
+            with lock:
+                in_flight[0] += 1
+                most_in_flight.append(in_flight[0])
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+            return SimpleNamespace(link=f"https://dl{drbx_file_path}")
+
+        gcc_drbx_obj = GccDrbx(oauth2_refresh_token="token", link_workers=8)
+
+        with mock.patch(
+            "dropbox.Dropbox.files_get_temporary_link", side_effect=get_temporary_link
+        ):
+            links = gcc_drbx_obj.get_file_links(
+                [f"/w/data/{index}.csv" for index in range(8)], lambda: drbx_limit
+            )
+
+        assert links == [f"https://dl/w/data/{index}.csv" for index in range(8)]
+        assert max(most_in_flight) == 2
+
+    def test_link_ttl(self):
+        """This method ensures links are requested again once their time to live has passed."""
+        gcc_drbx_obj = GccDrbx(oauth2_refresh_token="token", link_ttl=0.05)
+
+        with mock.patch(
+            "dropbox.Dropbox.files_get_temporary_link",
+            side_effect=[SimpleNamespace(link="first"), SimpleNamespace(link="second")],
+        ) as mock_get_temporary_link:
+            assert gcc_drbx_obj.get_file_link("/w/data/a.csv") == "first"
+            assert gcc_drbx_obj.get_file_link("/w/data/a.csv") == "first"
+            time.sleep(0.1)
+            assert gcc_drbx_obj.get_file_link("/w/data/a.csv") == "second"
+
+        assert mock_get_temporary_link.call_count == 2
+
+    def test_concurrent_link(self):
+        """This method ensures threads asking for the same link share one request and its error."""
+        gcc_drbx_obj = GccDrbx(oauth2_refresh_token="token")
+        started = threading.Event()
+
+        def get_temporary_link(_):
+            started.set()
+            time.sleep(0.1)
+            raise ConnectionError("Dropbox is unreachable.")
+
+        errors = []
+
+        def get_file_link():
+            try:
+                gcc_drbx_obj.get_file_link("/w/data/a.csv")
+            except ConnectionError as error:
+                errors.append(error)
+
+        with mock.patch(
+            "dropbox.Dropbox.files_get_temporary_link", side_effect=get_temporary_link
+        ) as mock_get_temporary_link:
+            threads = [threading.Thread(target=get_file_link) for _ in range(4)]
+            threads[0].start()
+            started.wait(5.0)
+            for thread in threads[1:]:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert mock_get_temporary_link.call_count == 1
+        assert len(errors) == 4
@@ -3,11 +3,12 @@
 import os
 import time
 from os.path import dirname, join
+from unittest import mock
 
 import pytest
 from botocore.exceptions import ClientError
 from dotenv import load_dotenv
-from gcc_ec2 import GccEc2
+from gcc_ec2 import GccEc2, call_with_backoff
 
 
 class TestGccEc2:
@@ -81,3 +82,150 @@ class TestGccEc2:
 
         assert isinstance(response, dict)
         assert response["ResponseMetadata"] is not None
+
+    @mock.patch("boto3.resource")
+    @mock.patch("boto3.client")
+    def test_create_instances(
+        self, mock_client: mock.MagicMock, mock_resource: mock.MagicMock
+    ):
+        """This method ensures many instances are created with one request."""
+        mock_client.return_value.run_instances.return_value = {
+            "Instances": [{"InstanceId": "i-0"}, {"InstanceId": "i-1"}]
+        }
+        gcc_ec2_obj = GccEc2("key_id", "secret")
+
+        response = gcc_ec2_obj.create_instances("key", "group", 2)
+
+        assert response == ["i-0", "i-1"]
+        assert mock_client.return_value.run_instances.call_count == 1
+        assert mock_client.return_value.run_instances.call_args.kwargs["MinCount"] == 2
+        assert mock_resource.called
+
+    @mock.patch("boto3.resource")
+    @mock.patch("boto3.client")
+    def test_create_instances_spot(
+        self, mock_client: mock.MagicMock, mock_resource: mock.MagicMock
+    ):
+        """This method ensures spot shortfalls and spot capacity errors fall back to on-demand."""
+        run_instances = mock_client.return_value.run_instances
+        run_instances.side_effect = [
+            {"Instances": [{"InstanceId": "i-spot"}]},
+            {"Instances": [{"InstanceId": "i-0"}, {"InstanceId": "i-1"}]},
+        ]
+        gcc_ec2_obj = GccEc2("key_id", "secret")
+
+        assert gcc_ec2_obj.create_instances("key", "group", 3, spot=True) == [
+            "i-spot",
+            "i-0",
+            "i-1",
+        ]
+        assert run_instances.call_args_list[0].kwargs["MinCount"] == 1
+        assert run_instances.call_args_list[0].kwargs["MaxCount"] == 3
+        assert "InstanceMarketOptions" in run_instances.call_args_list[0].kwargs
+        assert run_instances.call_args_list[1].kwargs["MinCount"] == 2
+        assert "InstanceMarketOptions" not in run_instances.call_args_list[1].kwargs
+
+        run_instances.reset_mock()
+        run_instances.side_effect = [
+            ClientError(
+                {"Error": {"Code": "InsufficientInstanceCapacity"}}, "RunInstances"
+            ),
+            {"Instances": [{"InstanceId": "i-0"}]},
+        ]
+        response = gcc_ec2_obj.create_instance("key", "group", spot=True)
+
+        assert response["Instances"][0]["InstanceId"] == "i-0"
+        assert run_instances.call_count == 2
+        assert mock_resource.called
+
+    @mock.patch("boto3.resource")
+    @mock.patch("boto3.client")
+    def test_find_interrupted_instances(
+        self, mock_client: mock.MagicMock, mock_resource: mock.MagicMock
+    ):
+        """This method ensures only reclaimed spot instances are reported."""
+        mock_client.return_value.describe_instances.return_value = {
+            "Reservations": [
+                {
+                    "Instances": [
+                        {
+                            "InstanceId": "i-reclaimed",
+                            "InstanceLifecycle": "spot",
+                            "State": {"Name": "terminated"},
+                        },
+                        {
+                            "InstanceId": "i-spot",
+                            "InstanceLifecycle": "spot",
+                            "State": {"Name": "running"},
+                        },
+                        {"InstanceId": "i-on-demand", "State": {"Name": "terminated"}},
+                    ]
+                }
+            ]
+        }
+        gcc_ec2_obj = GccEc2("key_id", "secret")
+
+        assert gcc_ec2_obj.find_interrupted_instances(
+            ["i-reclaimed", "i-spot", "i-on-demand"]
+        ) == ["i-reclaimed"]
+        assert mock_resource.called
+
+    @mock.patch("time.sleep", return_value=None)
+    @mock.patch("boto3.resource")
+    @mock.patch("boto3.client")
+    def test_wait_until_running(
+        self,
+        mock_client: mock.MagicMock,
+        mock_resource: mock.MagicMock,
+        mock_sleep: mock.MagicMock,
+    ):
+        """This method ensures readiness is polled for every instance at once."""
+
+        def reservation(instance_id: str, state: str, ip_address: str) -> dict:
+            instance = {"InstanceId": instance_id, "State": {"Name": state}}
+            if ip_address is not None:
+                instance["PublicIpAddress"] = ip_address
+            return {"Instances": [instance]}
+
+        mock_client.return_value.describe_instances.side_effect = [
+            ClientError(
+                {"Error": {"Code": "InvalidInstanceID.NotFound"}}, "DescribeInstances"
+            ),
+            {
+                "Reservations": [
+                    reservation("i-0", "running", "10.0.0.0"),
+                    reservation("i-1", "pending", None),
+                ]
+            },
+            {"Reservations": [reservation("i-1", "running", "10.0.0.1")]},
+        ]
+        gcc_ec2_obj = GccEc2("key_id", "secret")
+
+        response = gcc_ec2_obj.wait_until_running(["i-0", "i-1"])
+
+        assert response == {"i-0": "10.0.0.0", "i-1": "10.0.0.1"}
+        assert mock_client.return_value.describe_instances.call_args_list[2].kwargs == {
+            "InstanceIds": ["i-1"]
+        }
+        assert mock_sleep.call_count == 2
+        assert mock_resource.called
+
+    @mock.patch("time.sleep", return_value=None)
+    def test_call_with_backoff(self, mock_sleep: mock.MagicMock):
+        """This method ensures only throttled requests are retried."""
+        throttled = ClientError(
+            {"Error": {"Code": "RequestLimitExceeded"}}, "RunInstances"
+        )
+        operation = mock.MagicMock(side_effect=[throttled, throttled, {"ok": True}])
+
+        assert call_with_backoff(operation, InstanceIds=["i-0"]) == {"ok": True}
+        assert operation.call_count == 3
+        assert mock_sleep.call_count == 2
+        assert all(0 <= call.args[0] <= 1.0 for call in mock_sleep.call_args_list)
+
+        operation = mock.MagicMock(
+            side_effect=ClientError({"Error": {"Code": "UnauthorizedOperation"}}, "")
+        )
+        with pytest.raises(ClientError):
+            call_with_backoff(operation)
+        assert operation.call_count == 1
@@ -0,0 +1,90 @@
+"""This file contains the TestGccGraph class."""
+# pylint: disable=E0401
+import json
+
+import pytest
+from gcc_graph import GccGraph, parse_specification
+
+XML_SPECIFICATION = """<?xml version="1.0"?>
+<workflow type="1">
+    <task id="n3" est="30">
+        <vm pem="n3.pem">10.0.0.3</vm>
+        <dep node="n2" size="12.5">a,b</dep>
+        <dep>words.txt</dep>
+    </task>
+    <task id="n2">
+        <dep node="n1">x</dep>
+    </task>
+    <task id="n1">
+        <vm>10.0.0.1</vm>
+    </task>
+</workflow>"""
+
+
+class TestGccGraph:
+    """This class contains methods to test the GccGraph class."""
+
+    def test_parse_specification(self):
+        """This method ensures specifications are parsed into a leveled graph."""
+        gcc_graph = parse_specification(XML_SPECIFICATION)
+
+        assert len(gcc_graph) == 3
+        assert gcc_graph.get_workflow_type() == 1
+        assert [gcc_graph.get_node_level(index) for index in range(3)] == [2, 1, 0]
+        assert gcc_graph.get_node_estimate(0) == 30.0
+        assert gcc_graph.get_node_virtual_machine(0) == ("10.0.0.3", "n3.pem")
+        assert gcc_graph.get_node_virtual_machine(1) is None
+        assert gcc_graph.get_node_virtual_machine(2) == ("10.0.0.1", None)
+        assert list(gcc_graph.get_node_dependencies(0)) == [
+            ("n2", ("a", "b"), 12.5),
+            (None, ("words.txt",), None),
+        ]
+        assert list(gcc_graph.get_node_dependents(2)) == [("n2", ("x",))]
+
+    def test_to_dict_and_from_dict(self):
+        """This method ensures a serialized graph is restored without changes."""
+        gcc_graph = parse_specification(XML_SPECIFICATION)
+
+        graph_dict = json.loads(json.dumps(gcc_graph.to_dict()))
+        restored_gcc_graph = GccGraph.from_dict(graph_dict)
+
+        assert json.loads(json.dumps(restored_gcc_graph.to_dict())) == graph_dict
+        for index in range(len(gcc_graph)):
+            assert list(restored_gcc_graph.get_node_dependencies(index)) == list(
+                gcc_graph.get_node_dependencies(index)
+            )
+            assert list(restored_gcc_graph.get_node_dependents(index)) == list(
+                gcc_graph.get_node_dependents(index)
+            )
+
+    def test_parse_specification_instance_types(self):
+        """This method ensures task resource hints are resolved to instance types."""
+        gcc_graph = parse_specification(
+            """<workflow type="0">
+                <task id="a"/>
+                <task id="b" cpu="4"/>
+                <task id="c" cpu="2" mem="12"/>
+                <task id="d" class="small" cpu="8"/>
+                <task id="e" instance="p3.2xlarge" class="small"/>
+            </workflow>"""
+        )
+
+        assert [gcc_graph.get_node_instance_type(index) for index in range(5)] == [
+            None,
+            "c5.xlarge",
+            "r5.large",
+            "t2.small",
+            "p3.2xlarge",
+        ]
+        assert GccGraph.from_dict(gcc_graph.to_dict()).get_node_instance_type(1) == (
+            "c5.xlarge"
+        )
+
+        with pytest.raises(ValueError, match="Task 'a'"):
+            parse_specification(
+                '<workflow type="0"><task id="a" cpu="512"/></workflow>'
+            )
+        with pytest.raises(ValueError, match="Unknown size class 'huge'"):
+            parse_specification(
+                '<workflow type="0"><task id="a" class="huge"/></workflow>'
+            )
@@ -0,0 +1,172 @@
+"""This file contains the TestGccInstancePool class."""
+# pylint: disable=E0401,R0913
+import time
+from typing import Callable
+from unittest import mock
+
+from gcc_ec2 import GccEc2
+from gcc_instance_pool import GccInstancePool
+from gcc_workflow import GccWorkflow
+
+
+def idle_instance(instance_id: str, state: str, idle_since: float) -> dict:
+    """Return an idle pool instance as describe_instances would."""
+    return {
+        "InstanceId": instance_id,
+        "State": {"Name": state},
+        "Tags": [{"Key": "gcc:idle-since", "Value": str(int(idle_since))}],
+    }
+
+
+class TestGccInstancePool:
+    """This class contains methods to test the GccInstancePool class."""
+
+    def test_lease(self):
+        """This method ensures running idle instances are leased first and stopped ones started."""
+        gcc_ec2_obj = mock.MagicMock(spec=GccEc2)
+        gcc_ec2_obj.find_instances.side_effect = [
+            [
+                idle_instance("i-stopped", "stopped", time.time()),
+                idle_instance("i-running", "running", time.time()),
+                idle_instance("i-spare", "stopped", time.time()),
+            ],
+            [
+                idle_instance("i-stopped", "stopped", time.time()),
+                idle_instance("i-running", "running", time.time()),
+            ],
+        ]
+
+        instance_ids = GccInstancePool("test", lease_settle=0).lease(gcc_ec2_obj, 2)
+
+        assert instance_ids == ["i-running", "i-stopped"]
+        gcc_ec2_obj.tag_instances.assert_called_once()
+        tagged_ids, tags = gcc_ec2_obj.tag_instances.call_args.args
+        assert tagged_ids == ["i-running", "i-stopped"]
+        assert tags["gcc:pool"] == "test"
+        assert tags["gcc:state"] == "leased"
+        assert gcc_ec2_obj.find_instances.call_args.args[0] == {
+            "gcc:pool": "test",
+            "gcc:lease": tags["gcc:lease"],
+        }
+        gcc_ec2_obj.start_instances.assert_called_once_with(["i-stopped"])
+
+    def test_lease_contended(self):
+        """This method ensures instances another process claimed at the same time are not leased."""
+        gcc_ec2_obj = mock.MagicMock(spec=GccEc2)
+        gcc_ec2_obj.find_instances.side_effect = [
+            [
+                idle_instance("i-running", "running", time.time()),
+                idle_instance("i-stopped", "stopped", time.time()),
+            ],
+            [idle_instance("i-running", "running", time.time())],
+        ]
+
+        instance_ids = GccInstancePool("test", lease_settle=0).lease(gcc_ec2_obj, 2)
+
+        assert instance_ids == ["i-running"]
+        assert not gcc_ec2_obj.start_instances.called
+
+    def test_release(self):
+        """This method ensures released instances are stopped and old or extra ones evicted."""
+        gcc_ec2_obj = mock.MagicMock(spec=GccEc2)
+        gcc_ec2_obj.find_instances.return_value = [
+            idle_instance("i-new", "stopped", time.time()),
+            idle_instance("i-newer", "stopped", time.time() + 1),
+            idle_instance("i-expired", "stopped", time.time() - 120),
+            idle_instance("i-extra", "stopped", time.time() - 1),
+        ]
+        gcc_instance_pool = GccInstancePool("test", idle_ttl=60, max_idle=3)
+
+        gcc_instance_pool.release(gcc_ec2_obj, ["i-new"])
+
+        assert gcc_ec2_obj.tag_instances.call_args_list[0].args[0] == ["i-new"]
+        assert (
+            gcc_ec2_obj.tag_instances.call_args_list[0].args[1]["gcc:state"] == "idle"
+        )
+        gcc_ec2_obj.stop_instances.assert_called_once_with(["i-new"])
+        gcc_ec2_obj.terminate_instances.assert_called_once_with(["i-expired"])
+
+        gcc_ec2_obj.reset_mock()
+        assert GccInstancePool("test", idle_ttl=60, max_idle=1).evict(gcc_ec2_obj) == [
+            "i-new",
+            "i-extra",
+            "i-expired",
+        ]
+
+    def test_get_key_pair(self, tmp_path):
+        """This method ensures the pool's private key is stored once and reused."""
+        gcc_ec2_obj = mock.MagicMock(spec=GccEc2)
+        gcc_ec2_obj.find_key_pair.return_value = None
+        gcc_ec2_obj.create_key_pair.return_value = {
+            "KeyName": "gcc-pool-test",
+            "KeyFingerprint": "aa:bb",
+            "KeyMaterial": "pem",
+        }
+        gcc_instance_pool = GccInstancePool("test", key_dir=str(tmp_path))
+
+        assert gcc_instance_pool.get_key_pair(gcc_ec2_obj)["KeyMaterial"] == "pem"
+        assert (tmp_path / "gcc-pool-test-aabb.pem").read_text() == "pem"
+
+        gcc_ec2_obj.find_key_pair.return_value = {
+            "KeyName": "gcc-pool-test",
+            "KeyFingerprint": "aa:bb",
+        }
+        assert gcc_instance_pool.get_key_pair(gcc_ec2_obj) == {
+            "KeyName": "gcc-pool-test",
+            "KeyMaterial": "pem",
+        }
+        assert gcc_ec2_obj.create_key_pair.call_count == 1
+        assert not gcc_ec2_obj.delete_key_pair.called
+
+    @mock.patch(
+        "gcc_ec2.GccEc2.wait_until_running",
+        side_effect=lambda instance_ids: dict.fromkeys(instance_ids, "10.0.0.1"),
+    )
+    @mock.patch("gcc_ec2.GccEc2.find_base_image", return_value=None)
+    @mock.patch("gcc_ec2.GccEc2.create_instances", return_value=["i-new"])
+    @mock.patch("gcc_drbx.GccDrbx.create_folder", return_value=None)
+    @mock.patch("gcc_readiness.GccReadinessProber.wait", return_value=None)
+    def test_workflow_leases_and_releases(
+        self,
+        mock_wait: mock.MagicMock,
+        mock_create_folder: mock.MagicMock,
+        mock_create_instances: mock.MagicMock,
+        mock_find_base_image: mock.MagicMock,
+        mock_wait_until_running: mock.MagicMock,
+        initialize_workflow: Callable[..., GccWorkflow],
+    ):
+        """This method ensures a workflow leases warm instances and returns them."""
+        gcc_instance_pool = mock.MagicMock(spec=GccInstancePool)
+        gcc_instance_pool.get_key_pair.return_value = {
+            "KeyName": "gcc-pool-test",
+            "KeyMaterial": "pem",
+        }
+        gcc_instance_pool.get_security_group.return_value = {"GroupId": "group"}
+        gcc_instance_pool.get_leased_tags.return_value = {"gcc:state": "leased"}
+        gcc_instance_pool.lease.return_value = ["i-warm"]
+        gcc_workflow_obj = initialize_workflow(
+            "workflow_pool",
+            '<workflow type="0"><task id="a"/><task id="b"/></workflow>',
+            gcc_instance_pool=gcc_instance_pool,
+        )
+
+        nodes = gcc_workflow_obj.get_workflow_dict()["nodes"]
+        assert nodes["a"].get_node_virtual_machine()["instance_id"] == "i-warm"
+        assert nodes["a"].get_node_virtual_machine()["bootstrapped"]
+        assert nodes["b"].get_node_virtual_machine()["instance_id"] == "i-new"
+        assert not nodes["b"].get_node_virtual_machine()["bootstrapped"]
+        assert mock_find_base_image.called
+        assert mock_create_instances.call_args.args[2] == 1
+        assert mock_create_instances.call_args.kwargs["tags"] == {"gcc:state": "leased"}
+        assert mock_wait_until_running.call_args.args[0] == ["i-warm", "i-new"]
+        assert mock_wait.call_args.args[0] == [("10.0.0.1", 22)] * 2
+        assert mock_create_folder.called
+
+        with mock.patch("shutil.rmtree", return_value=None), mock.patch(
+            "gcc_ec2.GccEc2.delete_key_pair"
+        ) as mock_delete_key_pair:
+            gcc_workflow_obj.complete()
+
+        gcc_instance_pool.release.assert_called_once()
+        assert gcc_instance_pool.release.call_args.args[1] == ["i-warm", "i-new"]
+        assert not mock_delete_key_pair.called
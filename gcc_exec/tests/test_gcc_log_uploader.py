@@ -0,0 +1,75 @@
+"""This file contains the TestGccLogUploader class."""
+# pylint: disable=E0401,W1514
+import threading
+import time
+
+from gcc_log_uploader import GccLogUploader
+
+
+class TestGccLogUploader:
+    """This class contains methods to test the GccLogUploader class."""
+
+    def test_flush(self, tmp_path):
+        """This method ensures only the bytes appended since the last upload are uploaded."""
+        log_path = str(tmp_path / "log.txt")
+        uploads = []
+        gcc_log_uploader = GccLogUploader(interval=3600.0)
+
+        with gcc_log_uploader.watch(
+            log_path, lambda part, number: uploads.append((number, part))
+        ):
+            assert gcc_log_uploader.flush() == 0
+
+            with open(log_path, "w") as log_file:
+                log_file.write("first line\n")
+            assert gcc_log_uploader.flush() == 1
+            assert gcc_log_uploader.flush() == 0
+
+            with open(log_path, "a") as log_file:
+                log_file.write("second line\n")
+            assert gcc_log_uploader.flush() == 1
+
+        assert len(gcc_log_uploader) == 0
+        assert gcc_log_uploader.flush() == 0
+        assert uploads == [(1, b"first line\n"), (2, b"second line\n")]
+
+    def test_failed_upload(self, tmp_path):
+        """This method ensures a failed part is sent again at the next flush with newer bytes."""
+        log_path = str(tmp_path / "log.txt")
+        attempts = []
+
+        def upload(part, number):
+            attempts.append((number, part))
+            if len(attempts) == 1:
+                raise ConnectionError("Dropbox is unreachable.")
+
+        with open(log_path, "w") as log_file:
+            log_file.write("line\n")
+
+        gcc_log_uploader = GccLogUploader(interval=3600.0)
+        with gcc_log_uploader.watch(log_path, upload):
+            assert gcc_log_uploader.flush() == 0
+            with open(log_path, "a") as log_file:
+                log_file.write("next\n")
+            assert gcc_log_uploader.flush() == 1
+
+        assert attempts == [(1, b"line\n"), (1, b"line\nnext\n")]
+
+    def test_background_upload(self, tmp_path):
+        """This method ensures watched logs are uploaded while they are written."""
+        log_path = str(tmp_path / "log.txt")
+        uploaded = threading.Event()
+        gcc_log_uploader = GccLogUploader(interval=0.05)
+
+        with open(log_path, "w") as log_file:
+            log_file.write("line\n")
+
+        with gcc_log_uploader.watch(log_path, lambda *_: uploaded.set()):
+            assert uploaded.wait(5.0)
+
+        uploaded.clear()
+        with open(log_path, "a") as log_file:
+            log_file.write("line after the node finished\n")
+        time.sleep(0.2)
+
+        assert not uploaded.is_set()
@@ -0,0 +1,127 @@
+"""This file contains the TestGccPayloadCache class."""
+# pylint: disable=E0401,W1514
+import os
+import shutil
+import subprocess
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from gcc_payload_cache import GccPayloadCache
+
+
+@pytest.mark.skipif(shutil.which("unzip") is None, reason="unzip is not installed")
+class TestGccPayloadCache:
+    """This class contains methods to test the GccPayloadCache class."""
+
+    def install(
+        self,
+        gcc_payload_cache: GccPayloadCache,
+        tmp_path,
+        node_zip: str,
+        content_hash: str,
+    ) -> subprocess.CompletedProcess:
+        """This method runs an install command where wget copies a local zip and logs its link."""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir(exist_ok=True)
+        # Concurrent installs run wget while it is written, so it is replaced whole.
+        with tempfile.NamedTemporaryFile("w", dir=bin_dir, delete=False) as wget_file:
+            wget_file.write(
+                f'#!/bin/sh\necho "$1" >> {tmp_path}/downloads.txt\ncp "$1" "$3"\n'
+            )
+        os.chmod(wget_file.name, 0o755)
+        os.replace(wget_file.name, bin_dir / "wget")
+
+        return subprocess.run(
+            gcc_payload_cache.get_install_command(
+                str(tmp_path / "home"), node_zip, content_hash
+            ),
+            shell=True,
+            env=dict(os.environ, PATH=f"{bin_dir}:{os.environ['PATH']}"),
+            stdout=subprocess.PIPE,
+            check=False,
+        )
+
+    def make_zip(self, tmp_path, node_id: str, size: int) -> str:
+        """This method creates a node zip with a payload of size bytes."""
+        zip_path = str(tmp_path / f"{node_id}.zip")
+        with zipfile.ZipFile(zip_path, "w") as node_zip:
+            node_zip.writestr(f"{node_id}/run.sh", f"echo {node_id}\n")
+            node_zip.writestr(f"{node_id}/model.bin", os.urandom(size))
+        return zip_path
+
+    def test_install(self, tmp_path):
+        """This method ensures a cached node zip is neither downloaded nor unpacked again."""
+        gcc_payload_cache = GccPayloadCache()
+        node_zip = self.make_zip(tmp_path, "n1", 1024)
+        content_hash = "a" * 64
+
+        for _ in range(2):
+            result = self.install(gcc_payload_cache, tmp_path, node_zip, content_hash)
+            assert result.returncode == 0
+            with open(tmp_path / "home/n1/run.sh") as run_file:
+                assert run_file.read() == "echo n1\n"
+            shutil.rmtree(tmp_path / "home/n1")
+
+        assert b"is cached" in result.stdout
+        with open(tmp_path / "downloads.txt") as downloads_file:
+            assert downloads_file.read().splitlines() == [node_zip]
+        assert os.listdir(tmp_path / "home/.gcc/payloads") == [content_hash]
+
+    def test_concurrent_install(self, tmp_path):
+        """This method ensures nodes installing the same zip at once download it only once."""
+        gcc_payload_cache = GccPayloadCache(quota_mb=1)
+        node_zip = self.make_zip(tmp_path, "n1", 300 * 1024)
+
+        with ThreadPoolExecutor(4) as executor:
+            results = list(
+                executor.map(
+                    lambda content_hash: self.install(
+                        gcc_payload_cache, tmp_path, node_zip, content_hash
+                    ),
+                    ["c" * 64] * 3 + ["d" * 64] * 3,
+                )
+            )
+
+        assert all(result.returncode == 0 for result in results)
+        with open(tmp_path / "downloads.txt") as downloads_file:
+            assert downloads_file.read().splitlines() == [node_zip] * 2
+        with open(tmp_path / "home/n1/run.sh") as run_file:
+            assert run_file.read() == "echo n1\n"
+
+    def test_failed_download(self, tmp_path):
+        """This method ensures nothing is cached when a node zip cannot be downloaded."""
+        result = self.install(
+            GccPayloadCache(), tmp_path, str(tmp_path / "missing.zip"), "b" * 64
+        )
+
+        assert result.returncode != 0
+        assert os.listdir(tmp_path / "home/.gcc/payloads") == []
+        assert not os.path.exists(tmp_path / "home/n1")
+
+    def test_eviction(self, tmp_path):
+        """This method ensures the least recently used node zips are evicted first."""
+        gcc_payload_cache = GccPayloadCache(quota_mb=1)
+        payloads_dir = tmp_path / "home/.gcc/payloads"
+
+        for content_hash, last_used in [
+            ("1" * 64, 300),
+            ("2" * 64, 100),
+            ("3" * 64, 200),
+        ]:
+            node_zip = self.make_zip(tmp_path, "n1", 300 * 1024)
+            result = self.install(gcc_payload_cache, tmp_path, node_zip, content_hash)
+            assert result.returncode == 0
+            os.utime(payloads_dir / content_hash, (last_used, last_used))
+
+        node_zip = self.make_zip(tmp_path, "n1", 300 * 1024)
+        result = self.install(gcc_payload_cache, tmp_path, node_zip, "4" * 64)
+
+        assert result.returncode == 0
+        assert sorted(os.listdir(payloads_dir)) == ["1" * 64, "3" * 64, "4" * 64]
+
+    def test_invalid_hash(self):
+        """This method ensures only Dropbox content hashes are put into shell commands."""
+        with pytest.raises(ValueError, match="is not a Dropbox content hash"):
+            GccPayloadCache().get_install_command("/home/ubuntu", "link", "x; rm -rf /")
@@ -0,0 +1,62 @@
+"""This file contains the TestGccPlanCache class."""
+# pylint: disable=E0401
+import io
+from typing import Callable
+from unittest import mock
+
+from gcc_plan_cache import GccPlanCache
+from gcc_user import GccUser
+from gcc_workflow import GccWorkflow
+
+
+class TestGccPlanCache:
+    """This class contains methods to test the GccPlanCache class."""
+
+    def test_put_and_get(self):
+        """This method ensures the least recently used plan is evicted first."""
+        gcc_plan_cache = GccPlanCache(max_entries=2)
+
+        gcc_plan_cache.put("a", {"type": 0, "tasks": [], "levels": []})
+        gcc_plan_cache.put("b", {"type": 1, "tasks": [], "levels": []})
+        gcc_plan_cache.get("a")
+        gcc_plan_cache.put("c", {"type": 0, "tasks": [], "levels": []})
+
+        assert len(gcc_plan_cache) == 2
+        assert gcc_plan_cache.get("b") is None
+        assert gcc_plan_cache.get("a") == {"type": 0, "tasks": [], "levels": []}
+
+    @mock.patch(
+        "gcc_drbx.GccDrbx.get_file_content_hash",
+        return_value="content_hash",
+    )
+    @mock.patch("gcc_drbx.GccDrbx.get_file_stream")
+    def test_plan_reuses_cached_plan(
+        self,
+        mock_get_file_stream: mock.MagicMock,
+        mock_get_file_content_hash: mock.MagicMock,
+        gcc_user_obj: GccUser,
+        read_specification: Callable[[str], str],
+    ):
+        """This method ensures an unchanged specification is only downloaded once."""
+        mock_get_file_stream.return_value = io.BytesIO(
+            read_specification("spec_1.xml").encode()
+        )
+
+        gcc_plan_cache = GccPlanCache()
+        plans_human_readable = []
+
+        for _ in range(2):
+            gcc_workflow_obj = GccWorkflow(
+                gcc_user_obj=gcc_user_obj,
+                workflow_name="workflow_1",
+                gcc_plan_cache=gcc_plan_cache,
+            )
+            gcc_workflow_obj.plan(available_machines=[])
+            plans_human_readable.append(
+                gcc_workflow_obj.get_workflow_dict()["plan_human_readable"]
+            )
+
+        assert mock_get_file_content_hash.call_count == 2
+        assert mock_get_file_stream.call_count == 1
+        assert plans_human_readable[0] == plans_human_readable[1]
+        assert plans_human_readable[1] == {0: ["n1"], 1: ["n2", "n3"], 2: ["n4"]}
@@ -0,0 +1,108 @@
+"""This file contains the TestGccWorkerPool class."""
+# pylint: disable=E0401
+import threading
+import time
+from typing import Callable
+from unittest import mock
+
+import pytest
+from gcc_pool import GccWorkerPool
+from gcc_user import GccUser
+from gcc_workflow import GccWorkflow
+
+
+def count_stream_threads() -> int:
+    """Return the number of threads running type 1 nodes."""
+    return sum(thread.name.startswith("gcc-stream") for thread in threading.enumerate())
+
+
+class TestGccWorkerPool:
+    """This class contains methods to test the GccWorkerPool class."""
+
+    @pytest.mark.parametrize(
+        "phase_limits,resource_limits,expected_concurrency",
+        [
+            ({"configure": 2}, None, 2),
+            (None, {"ssh": 3}, 3),
+            ({"configure": 16}, None, 4),
+        ],
+    )
+    def test_map(
+        self,
+        phase_limits: dict,
+        resource_limits: dict,
+        expected_concurrency: int,
+    ):
+        """This method ensures phase, resource and pool limits bound concurrency."""
+        gcc_worker_pool = GccWorkerPool(
+            max_workers=4, phase_limits=phase_limits, resource_limits=resource_limits
+        )
+        lock = threading.Lock()
+        concurrency = {"current": 0, "peak": 0}
+
+        def work(_: int) -> None:
+            with gcc_worker_pool.limit("ssh"):
+                with lock:
+                    concurrency["current"] += 1
+                    concurrency["peak"] = max(
+                        concurrency["peak"], concurrency["current"]
+                    )
+                time.sleep(0.01)
+                with lock:
+                    concurrency["current"] -= 1
+
+        futures = gcc_worker_pool.map("configure", work, range(20))
+        gcc_worker_pool.shutdown()
+
+        assert len(futures) == 20
+        assert all(future.done() for future in futures)
+        assert concurrency["peak"] == expected_concurrency
+
+    @mock.patch("gcc_node.GccNode.upload_log", return_value=None)
+    @mock.patch("gcc_node.GccNode.run_commands")
+    @mock.patch("gcc_node.GccNode.get_exec_commands", return_value=["exit"])
+    def test_execute_streaming_capacity(
+        self,
+        mock_get_exec_commands: mock.MagicMock,
+        mock_run_commands: mock.MagicMock,
+        mock_upload_log: mock.MagicMock,
+        gcc_user_obj: GccUser,
+        read_specification: Callable[[str], str],
+    ):
+        """This method ensures type 1 workflows larger than the pool run every node at once.
+
+        Each node gets one thread for the execution, and the threads are gone
+        once it finishes.
+        """
+        gcc_worker_pool = GccWorkerPool(max_workers=2, resource_limits={"ssh": 1})
+        gcc_workflow_obj = GccWorkflow(
+            gcc_user_obj=gcc_user_obj,
+            workflow_name="workflow_2",
+            gcc_worker_pool=gcc_worker_pool,
+            telemetry_interval=None,
+        )
+
+        gcc_workflow_obj.plan(
+            available_machines=[],
+            xml_specification=read_specification("spec_2.xml"),
+        )
+        nodes = gcc_workflow_obj.get_workflow_dict()["nodes"]
+        barrier = threading.Barrier(len(nodes), timeout=5)
+        stream_thread_counts = []
+
+        def run_commands(*_):
+            stream_thread_counts.append(count_stream_threads())
+            barrier.wait()
+
+        mock_run_commands.side_effect = run_commands
+
+        gcc_workflow_obj.execute()
+        gcc_worker_pool.shutdown()
+
+        assert len(nodes) > gcc_worker_pool.get_max_workers()
+        assert mock_get_exec_commands.call_count == len(nodes)
+        assert mock_run_commands.call_count == len(nodes)
+        assert mock_upload_log.call_count == len(nodes)
+        assert not barrier.broken
+        assert max(stream_thread_counts) == len(nodes)
+        assert count_stream_threads() == 0
@@ -0,0 +1,56 @@
+"""This file contains the TestGccReadinessProber class."""
+# pylint: disable=E0401
+import socket
+import threading
+import time
+
+import pytest
+from gcc_readiness import GccReadinessProber
+
+
+def get_free_port() -> int:
+    """Return a local port that nothing listens on."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestGccReadinessProber:
+    """This class contains methods to test the GccReadinessProber class."""
+
+    def test_wait(self):
+        """This method ensures the prober returns soon after every port opens."""
+        open_server = socket.create_server(("127.0.0.1", 0))
+        late_port = get_free_port()
+        late_servers = []
+
+        def listen_later() -> None:
+            time.sleep(0.5)
+            late_servers.append(socket.create_server(("127.0.0.1", late_port)))
+
+        listener = threading.Thread(target=listen_later)
+        listener.start()
+        start = time.monotonic()
+        try:
+            GccReadinessProber().wait(
+                [
+                    ("127.0.0.1", open_server.getsockname()[1]),
+                    ("127.0.0.1", late_port),
+                ],
+                timeout=10.0,
+            )
+            assert time.monotonic() - start < 1.5
+        finally:
+            listener.join()
+            open_server.close()
+            for server in late_servers:
+                server.close()
+
+    def test_wait_timeout(self):
+        """This method ensures the prober gives up on ports that stay closed."""
+        closed_port = get_free_port()
+
+        start = time.monotonic()
+        with pytest.raises(TimeoutError, match=f"127.0.0.1:{closed_port}"):
+            GccReadinessProber().wait([("127.0.0.1", closed_port)], timeout=0.5)
+        assert time.monotonic() - start < 1.5
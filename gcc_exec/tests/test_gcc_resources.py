@@ -0,0 +1,64 @@
+"""This file contains the TestGccSharedResources class."""
+# pylint: disable=E0401
+from unittest import mock
+
+from gcc_ec2 import SECURITY_GROUP_PERMISSIONS, GccEc2
+from gcc_resources import GccSharedResources
+
+
+class TestGccSharedResources:
+    """This class contains methods to test the GccSharedResources class."""
+
+    def test_get_security_group(self):
+        """This method ensures the shared security group is created once and repaired."""
+        gcc_ec2_obj = mock.MagicMock(spec=GccEc2)
+        gcc_ec2_obj.find_security_group.return_value = None
+        gcc_ec2_obj.create_security_group.return_value = {"GroupId": "group"}
+        gcc_shared_resources = GccSharedResources("test")
+
+        assert gcc_shared_resources.get_security_group(gcc_ec2_obj) == {
+            "GroupId": "group"
+        }
+        gcc_ec2_obj.create_security_group.assert_called_once_with(
+            gcc_shared_resources.get_security_group_name()
+        )
+        assert gcc_shared_resources.get_security_group_name().startswith("test-")
+
+        gcc_ec2_obj.reset_mock()
+        gcc_ec2_obj.find_security_group.return_value = {
+            "GroupId": "group",
+            "IpPermissions": SECURITY_GROUP_PERMISSIONS,
+        }
+        gcc_shared_resources.get_security_group(gcc_ec2_obj)
+        assert not gcc_ec2_obj.create_security_group.called
+        assert not gcc_ec2_obj.authorize_security_group.called
+
+        gcc_ec2_obj.find_security_group.return_value = {
+            "GroupId": "group",
+            "IpPermissions": [],
+        }
+        gcc_shared_resources.get_security_group(gcc_ec2_obj)
+        gcc_ec2_obj.authorize_security_group.assert_called_once_with("group")
+
+    def test_get_key_pair_replaced(self, tmp_path):
+        """This method ensures a key pair without a stored private key is replaced."""
+        gcc_ec2_obj = mock.MagicMock(spec=GccEc2)
+        gcc_ec2_obj.find_key_pair.return_value = {
+            "KeyName": "test",
+            "KeyFingerprint": "aa:bb",
+        }
+        gcc_ec2_obj.create_key_pair.return_value = {
+            "KeyName": "test",
+            "KeyFingerprint": "cc:dd",
+            "KeyMaterial": "pem",
+        }
+        on_replace = mock.MagicMock()
+
+        key_pair = GccSharedResources("test", str(tmp_path)).get_key_pair(
+            gcc_ec2_obj, on_replace
+        )
+
+        assert key_pair["KeyMaterial"] == "pem"
+        assert on_replace.called
+        gcc_ec2_obj.delete_key_pair.assert_called_once_with("test")
+        assert (tmp_path / "test-ccdd.pem").read_text() == "pem"
@@ -0,0 +1,85 @@
+"""This file contains the TestGccScheduler class."""
+# pylint: disable=E0401,R0903
+import pytest
+from gcc_scheduler import GccHeftScheduler, GccLevelScheduler
+from gcc_user import GccUser
+from gcc_workflow import GccWorkflow
+
+XML_SPECIFICATION = """<?xml version="1.0"?>
+<workflow type="0">
+    <task id="b" est="5"></task>
+    <task id="a" est="10"></task>
+    <task id="c" est="100">
+        <dep node="a" size="500">x</dep>
+    </task>
+</workflow>"""
+
+
+class Machine:
+    """This class mirrors the attributes GCC reads from a pooled machine."""
+
+    def __init__(self, machine_ip: str) -> None:
+        """Constructor for a Machine object."""
+        self.machine_ip = machine_ip
+        self.machine_pem = "pem\n"
+
+
+class TestGccScheduler:
+    """This class contains methods to test the GCC scheduling policies."""
+
+    @pytest.mark.parametrize(
+        "gcc_scheduler,machine_count,pooled_nodes,estimated_makespan",
+        [
+            (GccLevelScheduler(), 1, ["b"], None),
+            (GccHeftScheduler(), 1, ["a"], 160.0),
+            (GccHeftScheduler(), 2, ["a", "c"], 120.0),
+            (GccHeftScheduler(), 3, ["a", "b", "c"], 120.0),
+        ],
+    )
+    def test_schedule(
+        self,
+        gcc_scheduler: object,
+        machine_count: int,
+        pooled_nodes: list,
+        estimated_makespan: float,
+        gcc_user_obj: GccUser,
+    ):
+        """This method ensures pooled machines go to the nodes the policy ranks first."""
+        gcc_workflow_obj = GccWorkflow(
+            gcc_user_obj=gcc_user_obj, workflow_name="workflow_schedule"
+        )
+        available_machines = [Machine(f"10.0.0.{i}") for i in range(machine_count)]
+
+        used_machines = gcc_workflow_obj.plan(
+            available_machines=available_machines,
+            xml_specification=XML_SPECIFICATION,
+            gcc_scheduler=gcc_scheduler,
+        )
+
+        workflow_dict = gcc_workflow_obj.get_workflow_dict()
+
+        assert len(used_machines) == len(pooled_nodes)
+        assert (
+            sorted(
+                node_id
+                for node_id, node in workflow_dict["nodes"].items()
+                if node.get_node_virtual_machine() is not None
+            )
+            == pooled_nodes
+        )
+        assert workflow_dict["estimated_makespan"] == estimated_makespan
+
+    def test_rank(self, gcc_user_obj: GccUser):
+        """This method ensures upward ranks include runtimes and transfer times."""
+        gcc_workflow_obj = GccWorkflow(
+            gcc_user_obj=gcc_user_obj, workflow_name="workflow_rank"
+        )
+        gcc_workflow_obj.plan(
+            available_machines=[], xml_specification=XML_SPECIFICATION
+        )
+
+        node_ranks = GccHeftScheduler(bandwidth=50.0).rank(
+            gcc_workflow_obj.get_workflow_dict()
+        )
+
+        assert node_ranks == {"a": 120.0, "b": 5.0, "c": 100.0}
@@ -0,0 +1,84 @@
+"""This file contains the TestGccScript class."""
+# pylint: disable=E0401,W1514
+import os
+import re
+import subprocess
+import time
+
+from gcc_script import GccScript
+
+
+class TestGccScript:
+    """This class contains methods to test the GccScript class."""
+
+    def run_script(self, gcc_script_obj: GccScript, tmp_path) -> str:
+        """This method runs a script in a directory where wget sleeps for half a second."""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        (bin_dir / "wget").write_text('#!/bin/sh\nsleep 0.5\necho "got $1"\n')
+        os.chmod(bin_dir / "wget", 0o755)
+
+        return subprocess.run(
+            ["bash", "-s"],
+            input=gcc_script_obj.get_source().encode(),
+            cwd=tmp_path,
+            env=dict(os.environ, PATH=f"{bin_dir}:{os.environ['PATH']}"),
+            stdout=subprocess.PIPE,
+            check=True,
+        ).stdout.decode()
+
+    def test_parse(self, tmp_path):
+        """This method ensures each step reports its own output, errors and exit code, in order."""
+        gcc_script_obj = GccScript(
+            [
+                "mkdir node",
+                "cd node;printf 'no newline'",
+                "echo 'it''s' $HOME; exit 3",
+                "echo out; echo err >&2; ls missing",
+            ]
+        )
+
+        results = gcc_script_obj.parse(self.run_script(gcc_script_obj, tmp_path))
+
+        assert [result["exit_code"] for result in results] == [0, 0, 3, 2]
+        assert [result["output"] for result in results[:3]] == [
+            "",
+            "no newline\n",
+            f"its {os.environ['HOME']}\n",
+        ]
+        assert results[3]["output"].startswith("out\nerr\nls: ")
+        assert "missing" in results[3]["output"]
+        assert all(result["seconds"] >= 0 for result in results)
+        assert os.path.isdir(tmp_path / "node")
+
+    def test_parallel_downloads(self, tmp_path):
+        """This method ensures consecutive downloads run at the same time."""
+        gcc_script_obj = GccScript(["wget a", "wget b", "wget c", "echo done"])
+
+        start = time.monotonic()
+        results = gcc_script_obj.parse(self.run_script(gcc_script_obj, tmp_path))
+
+        assert time.monotonic() - start < 1.4
+        assert [result["output"] for result in results] == [
+            "got a\n",
+            "got b\n",
+            "got c\n",
+            "done\n",
+        ]
+        assert all(result["seconds"] >= 0.5 for result in results[:3])
+
+    def test_parse_incomplete(self):
+        """This method ensures steps the script never reported on have no exit code."""
+        gcc_script_obj = GccScript(["true", "false"])
+        marker = re.search(r"__gcc_step_\w+__", gcc_script_obj.get_source()).group()
+
+        results = gcc_script_obj.parse(f"{marker} 0 0 1.0 1.25\npartial")
+
+        assert results[0]["exit_code"] == 0
+        assert results[0]["seconds"] == 0.25
+        assert results[1] == {
+            "command": "false",
+            "output": "",
+            "exit_code": None,
+            "seconds": None,
+        }
@@ -0,0 +1,86 @@
+"""This file contains the TestGccSshPool class."""
+# pylint: disable=E0401
+from io import StringIO
+from unittest import mock
+
+import paramiko
+import pytest
+from gcc_ssh_pool import GccSshPool
+
+
+def generate_pem() -> str:
+    """Return a new RSA private key as a PEM string."""
+    pem_file = StringIO()
+    paramiko.RSAKey.generate(1024).write_private_key(pem_file)
+    return pem_file.getvalue()
+
+
+class TestGccSshPool:
+    """This class contains methods to test the GccSshPool class."""
+
+    __pem = generate_pem()
+
+    @mock.patch("paramiko.SSHClient")
+    def test_session(self, mock_ssh_client: mock.MagicMock):
+        """This method ensures sessions reuse a live connection per machine and key."""
+        gcc_ssh_pool = GccSshPool(idle_timeout=300.0)
+
+        with gcc_ssh_pool.session("10.0.0.1", self.__pem) as client:
+            first_client = client
+        with gcc_ssh_pool.session("10.0.0.1", self.__pem) as client:
+            assert client is first_client
+        with gcc_ssh_pool.session("10.0.0.2", self.__pem):
+            pass
+
+        assert mock_ssh_client.return_value.connect.call_count == 2
+        assert len(gcc_ssh_pool) == 2
+
+        mock_ssh_client.return_value.get_transport.return_value.is_active.return_value = (
+            False
+        )
+        with gcc_ssh_pool.session("10.0.0.1", self.__pem):
+            pass
+        assert mock_ssh_client.return_value.connect.call_count == 3
+
+        gcc_ssh_pool.close(["10.0.0.1"])
+        assert len(gcc_ssh_pool) == 1
+        gcc_ssh_pool.close()
+        assert len(gcc_ssh_pool) == 0
+
+    @mock.patch("paramiko.SSHClient")
+    def test_close_idle(self, mock_ssh_client: mock.MagicMock):
+        """This method ensures idle and failed connections leave the pool."""
+        gcc_ssh_pool = GccSshPool(idle_timeout=0.0)
+
+        with gcc_ssh_pool.session("10.0.0.1", self.__pem):
+            assert gcc_ssh_pool.close_idle() == 0
+        assert gcc_ssh_pool.close_idle() == 1
+        assert len(gcc_ssh_pool) == 0
+
+        with pytest.raises(paramiko.SSHException):
+            with gcc_ssh_pool.session("10.0.0.1", self.__pem):
+                raise paramiko.SSHException("Connection reset")
+        assert len(gcc_ssh_pool) == 0
+        assert mock_ssh_client.return_value.close.call_count == 2
+
+    @mock.patch("paramiko.SSHClient")
+    def test_session_error(self, mock_ssh_client: mock.MagicMock):
+        """This method ensures only failed transports are dropped, and closed once unused."""
+        gcc_ssh_pool = GccSshPool(idle_timeout=300.0)
+        transport = mock_ssh_client.return_value.get_transport.return_value
+
+        with pytest.raises(FileNotFoundError):
+            with gcc_ssh_pool.session("10.0.0.1", self.__pem):
+                raise FileNotFoundError("No such file")
+        assert len(gcc_ssh_pool) == 1
+        assert not mock_ssh_client.return_value.close.called
+
+        with gcc_ssh_pool.session("10.0.0.1", self.__pem):
+            with pytest.raises(OSError):
+                with gcc_ssh_pool.session("10.0.0.1", self.__pem):
+                    transport.is_active.return_value = False
+                    raise OSError("Socket is closed")
+            assert len(gcc_ssh_pool) == 0
+            assert not mock_ssh_client.return_value.close.called
+        assert mock_ssh_client.return_value.close.call_count == 1
+        assert mock_ssh_client.return_value.connect.call_count == 1
@@ -0,0 +1,77 @@
+"""This file contains the TestGccStageInputs class."""
+# pylint: disable=E0401,W1514
+import hashlib
+import json
+import os
+
+import gcc_stage_inputs
+from gcc_stage_inputs import ContentHasher
+
+
+def get_content_hash(data: bytes) -> str:
+    """Return the Dropbox content hash of some data, hashed block by block."""
+    block_size = gcc_stage_inputs.CONTENT_HASH_BLOCK_SIZE
+    block_hashes = b""
+    for block_start in range(0, len(data), block_size):
+        block_end = block_start + block_size
+        block_hashes += hashlib.sha256(data[block_start:block_end]).digest()
+    return hashlib.sha256(block_hashes).hexdigest()
+
+
+class TestGccStageInputs:
+    """This class contains methods to test the input staging script."""
+
+    def test_content_hasher(self):
+        """This method ensures the content hash does not depend on how data is chunked."""
+        data = os.urandom(9 * 1024 * 1024 + 17)
+
+        for chunk_size in (1000, 4 * 1024 * 1024, len(data)):
+            content_hasher = ContentHasher()
+            for chunk_start in range(0, len(data), chunk_size):
+                chunk_end = chunk_start + chunk_size
+                content_hasher.update(data[chunk_start:chunk_end])
+            assert content_hasher.hexdigest() == get_content_hash(data)
+
+        assert ContentHasher().hexdigest() == hashlib.sha256(b"").hexdigest()
+
+    def test_main(self, tmp_path, capsys):
+        """This method ensures inputs are only kept when their size and content hash match."""
+        source_dir = tmp_path / "source"
+        in_dir = tmp_path / "data/in"
+        source_dir.mkdir()
+        in_dir.mkdir(parents=True)
+
+        files = []
+        for index in range(6):
+            data = os.urandom(1024 * (index + 1))
+            (source_dir / f"{index}.bin").write_bytes(data)
+            files.append(
+                {
+                    "link": (source_dir / f"{index}.bin").as_uri(),
+                    "path": str(in_dir / f"{index}.bin"),
+                    "size": len(data),
+                    "content_hash": get_content_hash(data),
+                }
+            )
+        files[1]["size"] = None
+        files[2]["content_hash"] = None
+        files[4]["content_hash"] = "0" * 64
+        files[5]["link"] = (source_dir / "missing.bin").as_uri()
+
+        manifest_path = tmp_path / "inputs.json"
+        manifest_path.write_text(
+            json.dumps({"workers": 3, "attempts": 1, "files": files})
+        )
+
+        assert gcc_stage_inputs.main(str(manifest_path)) == 1
+
+        assert sorted(os.listdir(in_dir)) == ["0.bin", "1.bin", "2.bin", "3.bin"]
+        for index in range(4):
+            assert (in_dir / f"{index}.bin").read_bytes() == (
+                source_dir / f"{index}.bin"
+            ).read_bytes()
+
+        output = capsys.readouterr().out
+        assert f"failed {in_dir}/4.bin: content hash does not match" in output
+        assert f"failed {in_dir}/5.bin" in output
+        assert "staged 4 of 6 inputs" in output
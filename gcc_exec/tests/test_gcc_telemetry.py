@@ -0,0 +1,55 @@
+"""This file contains the TestGccTelemetry class."""
+# pylint: disable=E0401,W1514
+import gcc_telemetry
+
+
+class TestGccTelemetry:
+    """This class contains methods to test the resource telemetry script."""
+
+    def test_main(self, tmp_path, monkeypatch):
+        """This method ensures samples are written while a command runs and its exit code kept."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "run.sh").write_text("sleep 0.5\nexit 3\n")
+        (tmp_path / "run.sh").chmod(0o755)
+        csv_path = tmp_path / "telemetry.csv"
+
+        assert gcc_telemetry.main(0.1, str(csv_path), ["./run.sh", "a b"]) == 3
+
+        rows = [line.split(",") for line in csv_path.read_text().splitlines()]
+        assert rows[0] == gcc_telemetry.CSV_COLUMNS
+        assert len(rows) >= 4
+        assert all(len(row) == len(gcc_telemetry.CSV_COLUMNS) for row in rows[1:])
+        times = [float(row[0]) for row in rows[1:]]
+        assert times == sorted(times)
+        assert times[-1] >= 0.5
+
+    def test_get_sample(self):
+        """This method ensures counters are turned into shares and rates per second."""
+        previous = {
+            "time": 10.0,
+            "cpu": (1000, 800, 50),
+            "rss": 0,
+            "mem_used": 0,
+            "disk": (0, 0),
+            "net": (0, 1024 * 1024),
+        }
+        current = {
+            "time": 12.0,
+            "cpu": (1200, 900, 70),
+            "rss": 64 * 1024 * 1024,
+            "mem_used": 512 * 1024 * 1024,
+            "disk": (4 * 1024 * 1024, 2 * 1024 * 1024),
+            "net": (1024 * 1024, 5 * 1024 * 1024),
+        }
+
+        assert gcc_telemetry.get_sample(previous, current, 9.0) == [
+            "3.000",
+            "50.0",
+            "10.0",
+            "64.0",
+            "512.0",
+            "2.000",
+            "1.000",
+            "0.500",
+            "2.000",
+        ]
@@ -0,0 +1,226 @@
+"""This file contains the TestGccWheelhouse class."""
+# pylint: disable=E0401,W1514,C0301
+import io
+import os
+import subprocess
+import tarfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+from gcc_wheelhouse import GccWheelhouse, HttpRangeFile
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """This class serves the server's content, honouring byte ranges."""
+
+    def do_GET(self):  # pylint: disable=C0103
+        """This method answers a GET request with the requested range of the content."""
+        content = self.server.content
+        first, last = self.headers["Range"].split("=", 1)[1].split("-")
+        start = int(first)
+        end = int(last) + 1
+        body = content[start:end]
+        self.server.requested_bytes += len(body)
+
+        self.send_response(206)
+        self.send_header("Content-Range", f"bytes {first}-{last}/{len(content)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=W0221
+        """This method keeps requests out of the test output."""
+
+
+@pytest.fixture(name="node_zip_url")
+def fixture_node_zip_url():
+    """This function serves a node zip with a large model and a requirements.txt."""
+    node_zip = io.BytesIO()
+    with zipfile.ZipFile(node_zip, "w") as zip_file:
+        zip_file.writestr("n1/model.bin", os.urandom(4 * 1024 * 1024))
+        zip_file.writestr("n1/requirements.txt", "rpyc==5.1.0\ndropbox\n")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeRequestHandler)
+    server.content = node_zip.getvalue()
+    server.requested_bytes = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_port}/n1.zip"
+    server.shutdown()
+    server.server_close()
+
+
+class TestGccWheelhouse:
+    """This class contains methods to test the GccWheelhouse class."""
+
+    def test_http_range_file(self, node_zip_url):
+        """This method ensures a requirements.txt is read without downloading the whole zip."""
+        server, url = node_zip_url
+
+        with io.BufferedReader(HttpRangeFile(url)) as node_file, zipfile.ZipFile(
+            node_file
+        ) as node_zip:
+            assert node_zip.read("n1/requirements.txt") == b"rpyc==5.1.0\ndropbox\n"
+
+        assert server.requested_bytes < 64 * 1024
+
+    def test_prepare(self, node_zip_url, tmp_path):
+        """This method ensures nodes with the same requirements share one upload."""
+        _, url = node_zip_url
+        wheelhouse_path = tmp_path / "wheelhouse.tar"
+        wheelhouse_path.write_bytes(b"wheels")
+        gcc_drbx_obj = mock.MagicMock()
+        gcc_drbx_obj.file_exists.return_value = False
+        gcc_wheelhouse = GccWheelhouse(cache_dir=str(tmp_path))
+        drbx_limit = mock.MagicMock()
+
+        with mock.patch.object(
+            GccWheelhouse, "build", return_value=str(wheelhouse_path)
+        ) as mock_build, ThreadPoolExecutor(4) as executor:
+            drbx_wheelhouse_paths = set(
+                executor.map(
+                    lambda _: gcc_wheelhouse.prepare(
+                        gcc_drbx_obj, "workflow", "n1", url, "0" * 64, drbx_limit
+                    ),
+                    range(8),
+                )
+            )
+
+        wheelhouse_hash = gcc_wheelhouse.get_wheelhouse_hash("dropbox\nrpyc==5.1.0")
+        assert drbx_wheelhouse_paths == {f"/workflow/wheelhouse/{wheelhouse_hash}.tar"}
+        assert mock_build.call_count == 1
+        gcc_drbx_obj.upload_file.assert_called_once_with(
+            str(wheelhouse_path), drbx_wheelhouse_paths.pop()
+        )
+        assert drbx_limit.call_count >= 2
+        assert drbx_limit.return_value.__exit__.call_count == drbx_limit.call_count
+
+    def test_prepare_unreachable(self, tmp_path):
+        """This method ensures nodes whose zip cannot be read install from PyPI."""
+        gcc_drbx_obj = mock.MagicMock()
+
+        assert (
+            GccWheelhouse(cache_dir=str(tmp_path)).prepare(
+                gcc_drbx_obj, "workflow", "n1", "link", "0" * 64
+            )
+            is None
+        )
+        assert not gcc_drbx_obj.upload_file.called
+
+    def test_wheelhouse_hash(self):
+        """This method ensures the order of requirements and comments do not matter."""
+        gcc_wheelhouse = GccWheelhouse()
+
+        assert gcc_wheelhouse.get_wheelhouse_hash(
+            "rpyc==5.1.0\n# models\ndropbox\n"
+        ) == gcc_wheelhouse.get_wheelhouse_hash("dropbox  # api\n\nrpyc==5.1.0")
+        assert gcc_wheelhouse.get_wheelhouse_hash("dropbox") != GccWheelhouse(
+            python_version="3.10"
+        ).get_wheelhouse_hash("dropbox")
+
+    def test_build(self, tmp_path):
+        """This method ensures wheels are downloaded for the machines once and kept."""
+        gcc_wheelhouse = GccWheelhouse(cache_dir=str(tmp_path))
+
+        def download(args, **_):
+            assert "--only-binary=:all:" in args
+            assert args[args.index("--python-version") + 1] == "3.8"
+            wheel_dir = args[args.index("--dest") + 1]
+            os.makedirs(wheel_dir)
+            with open(f"{wheel_dir}/rpyc-5.1.0-py3-none-any.whl", "w") as wheel_file:
+                wheel_file.write("wheel")
+            return subprocess.CompletedProcess(args, 0)
+
+        with mock.patch("subprocess.run", side_effect=download) as mock_run:
+            wheelhouse_path = gcc_wheelhouse.build("rpyc==5.1.0")
+            assert gcc_wheelhouse.build("rpyc==5.1.0") == wheelhouse_path
+
+        assert mock_run.call_count == 1
+        with tarfile.open(wheelhouse_path) as wheelhouse_file:
+            assert wheelhouse_file.getnames() == ["rpyc-5.1.0-py3-none-any.whl"]
+        assert os.listdir(tmp_path) == [os.path.basename(wheelhouse_path)]
+
+        with mock.patch(
+            "subprocess.run", return_value=subprocess.CompletedProcess([], 1)
+        ):
+            assert gcc_wheelhouse.build("sdist-only==1.0") is None
+
+    def test_install_command(self, tmp_path):
+        """This method ensures a wheelhouse is unpacked once and installed from offline."""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        (bin_dir / "wget").write_text('#!/bin/sh\ncp "$1" "$3"\n')
+        (bin_dir / "pip3").write_text(f'#!/bin/sh\necho "$@" >> {tmp_path}/pip.txt\n')
+        for tool in ("wget", "pip3"):
+            os.chmod(bin_dir / tool, 0o755)
+        with tarfile.open(tmp_path / "abc.tar", "w") as wheelhouse_file:
+            wheelhouse_file.add(__file__, arcname="rpyc-5.1.0-py3-none-any.whl")
+        home_dir = tmp_path / "home"
+        (home_dir / "n1").mkdir(parents=True)
+
+        command = GccWheelhouse().get_install_command(
+            str(home_dir),
+            "n1",
+            "/workflow/wheelhouse/abc.tar",
+            str(tmp_path / "abc.tar"),
+        )
+        for _ in range(2):
+            subprocess.run(
+                command,
+                shell=True,
+                cwd=home_dir,
+                env=dict(os.environ, PATH=f"{bin_dir}:{os.environ['PATH']}"),
+                check=True,
+            )
+
+        assert os.listdir(home_dir / ".gcc/wheelhouse") == ["abc"]
+        assert os.listdir(home_dir / ".gcc/wheelhouse/abc") == [
+            "rpyc-5.1.0-py3-none-any.whl"
+        ]
+        with open(tmp_path / "pip.txt") as pip_file:
+            assert (
+                pip_file.read().splitlines()
+                == [
+                    f"install --no-index --find-links {home_dir}/.gcc/wheelhouse/abc -r requirements.txt"
+                ]
+                * 2
+            )
+
+    def test_install_command_fallback(self, tmp_path):
+        """This method ensures a failed offline install is logged before installing from PyPI."""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        (bin_dir / "wget").write_text('#!/bin/sh\ncp "$1" "$3"\n')
+        (bin_dir / "pip3").write_text(
+            f'#!/bin/sh\necho "$@" >> {tmp_path}/pip.txt\n[ "$2" != --no-index ]\n'
+        )
+        for tool in ("wget", "pip3"):
+            os.chmod(bin_dir / tool, 0o755)
+        with tarfile.open(tmp_path / "abc.tar", "w") as wheelhouse_file:
+            wheelhouse_file.add(__file__, arcname="rpyc-5.1.0-py3-none-any.whl")
+        home_dir = tmp_path / "home"
+        (home_dir / "n1").mkdir(parents=True)
+
+        result = subprocess.run(
+            GccWheelhouse().get_install_command(
+                str(home_dir),
+                "n1",
+                "/workflow/wheelhouse/abc.tar",
+                str(tmp_path / "abc.tar"),
+            ),
+            shell=True,
+            cwd=home_dir,
+            env=dict(os.environ, PATH=f"{bin_dir}:{os.environ['PATH']}"),
+            stdout=subprocess.PIPE,
+            check=True,
+        )
+
+        assert (
+            result.stdout == b"Wheelhouse abc install failed, installing from PyPI.\n"
+        )
+        with open(tmp_path / "pip.txt") as pip_file:
+            assert pip_file.read().splitlines()[1] == "install -r requirements.txt"
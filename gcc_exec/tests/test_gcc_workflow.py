@@ -1,11 +1,12 @@
 """This file contains the TestGccWorkflow class."""
-# pylint: disable=W1514,R0913,E0401
+# pylint: disable=W1514,R0913,R0914,C0301,E0401
 import os
 from os.path import dirname, join
 from unittest import mock
 
 import pytest
 from dotenv import load_dotenv
+from gcc_node import GccNode
 from gcc_user import GccUser
 from gcc_workflow import GccWorkflow
 
@@ -58,6 +59,13 @@ class TestGccWorkflow:
                 {2: ["n4"], 1: ["n2", "n3"], 0: ["n1"]},
                 [dict, dict, dict, dict],
             ),
+            (
+                "spec_5.xml",
+                "workflow_5",
+                0,
+                {0: ["n1"], 1: ["n3", "n2"], 2: ["n4"]},
+                [None, None, None, None],
+            ),
         ],
     )
     def test_plan(
@@ -103,17 +111,64 @@ class TestGccWorkflow:
                     node_virtual_machine,
                 )
 
+    @pytest.mark.parametrize(
+        "xml_specification,error_message",
+        [
+            (
+                '<workflow type="0"><task id="n1"><dep node="n2">x</dep></task>'
+                '<task id="n2"><dep node="n1">x</dep></task></workflow>',
+                "dependency cycle: n1 -> n2 -> n1",
+            ),
+            (
+                '<workflow type="0"><task id="n1"><dep node="n1">x</dep></task></workflow>',
+                "dependency cycle: n1 -> n1",
+            ),
+            (
+                '<workflow type="0"><task id="n1"><dep node="n9">x</dep></task></workflow>',
+                "unknown task 'n9'",
+            ),
+            (
+                '<workflow type="0"><task id="n1"></task><task id="n1"></task></workflow>',
+                "declared more than once",
+            ),
+        ],
+    )
+    def test_plan_invalid(self, xml_specification: str, error_message: str):
+        """This method ensures invalid workflow graphs are rejected."""
+        gcc_workflow_obj = GccWorkflow(
+            gcc_user_obj=self.__gcc_user_obj, workflow_name="workflow_invalid"
+        )
+
+        with pytest.raises(ValueError, match=error_message):
+            gcc_workflow_obj.plan(
+                available_machines=[], xml_specification=xml_specification
+            )
+
     @mock.patch(
-        "gcc_node.GccNode.initialize",
+        "gcc_readiness.GccReadinessProber.wait",
         return_value=None,
     )
+    @mock.patch(
+        "gcc_ec2.GccEc2.wait_until_running",
+        side_effect=lambda instance_ids: {
+            instance_id: f"10.0.0.{index}"
+            for index, instance_id in enumerate(instance_ids)
+        },
+    )
+    @mock.patch("gcc_ec2.GccEc2.find_base_image", return_value=None)
+    @mock.patch(
+        "gcc_ec2.GccEc2.create_instances",
+        side_effect=lambda key_pair_name, security_group_id, instance_count, tags, image_id, instance_type, spot: [
+            f"i-{index}" for index in range(instance_count)
+        ],
+    )
     @mock.patch(
         "gcc_ec2.GccEc2.create_key_pair",
-        return_value=None,
+        return_value={"KeyName": "key", "KeyMaterial": "pem"},
     )
     @mock.patch(
         "gcc_ec2.GccEc2.create_security_group",
-        return_value=None,
+        return_value={"GroupId": "group"},
     )
     @mock.patch(
         "gcc_drbx.GccDrbx.create_folder",
@@ -132,8 +187,8 @@ class TestGccWorkflow:
             (
                 "spec_2.xml",
                 "workflow_2",
-                {},
-                {},
+                {"GroupId": "group_2"},
+                {"KeyName": "key_2", "KeyMaterial": "pem_2"},
             ),
         ],
     )
@@ -143,7 +198,10 @@ class TestGccWorkflow:
         mock_create_folder: mock.MagicMock,
         mock_create_security_group: mock.MagicMock,
         mock_create_key_pair: mock.MagicMock,
-        mock_initialize: mock.MagicMock,
+        mock_create_instances: mock.MagicMock,
+        mock_find_base_image: mock.MagicMock,
+        mock_wait_until_running: mock.MagicMock,
+        mock_wait: mock.MagicMock,
         xml_specification_filename: str,
         workflow_name: str,
         security_group: dict,
@@ -151,7 +209,9 @@ class TestGccWorkflow:
     ):
         """This method ensures all nodes have a virtual machine initialized."""
         gcc_workflow_obj = GccWorkflow(
-            gcc_user_obj=self.__gcc_user_obj, workflow_name=workflow_name
+            gcc_user_obj=self.__gcc_user_obj,
+            workflow_name=workflow_name,
+            per_run_resources=True,
         )
 
         with open(
@@ -172,10 +232,69 @@ class TestGccWorkflow:
             assert mock_create_key_pair.called
             assert mock_create_security_group.called
 
-        assert mock_initialize.called
+        workflow_dict = gcc_workflow_obj.get_workflow_dict()
+
+        assert mock_find_base_image.called
+        assert mock_create_instances.call_count == 1
+        assert mock_create_instances.call_args.args[2] == len(workflow_dict["nodes"])
+        assert mock_wait_until_running.call_count == 1
+        assert mock_wait.call_count == 1
+        assert len(mock_wait.call_args.args[0]) == len(workflow_dict["nodes"])
+        assert all(
+            node.get_node_virtual_machine()["ip"] is not None
+            for node in workflow_dict["nodes"].values()
+        )
+        assert sorted(
+            node.get_node_virtual_machine()["instance_id"]
+            for node in workflow_dict["nodes"].values()
+        ) == [f"i-{index}" for index in range(len(workflow_dict["nodes"]))]
         assert mock_create_folder.called
         assert mock_makedirs.called
 
+    @mock.patch(
+        "gcc_ec2.GccEc2.wait_until_running",
+        side_effect=lambda instance_ids: dict.fromkeys(instance_ids, "10.0.0.1"),
+    )
+    @mock.patch("gcc_ec2.GccEc2.find_base_image", return_value="ami-base")
+    @mock.patch(
+        "gcc_ec2.GccEc2.create_instances",
+        side_effect=lambda key_pair_name, security_group_id, instance_count, tags, image_id, instance_type, spot: [
+            f"{instance_type}-{index}" for index in range(instance_count)
+        ],
+    )
+    def test_create_instances_by_instance_type(
+        self,
+        mock_create_instances: mock.MagicMock,
+        mock_find_base_image: mock.MagicMock,
+        mock_wait_until_running: mock.MagicMock,
+    ):
+        """This method ensures nodes are launched with one request per instance type."""
+        gcc_workflow_obj = GccWorkflow(
+            gcc_user_obj=self.__gcc_user_obj, workflow_name="workflow_types"
+        )
+        gcc_workflow_obj.plan(
+            available_machines=[],
+            xml_specification='<workflow type="0"><task id="a"/><task id="b" cpu="4"/>'
+            '<task id="c"/><task id="d" cpu="4"/></workflow>',
+        )
+        gcc_workflow_obj.set_gcc_key_pair({"KeyName": "key", "KeyMaterial": "pem"})
+        gcc_workflow_obj.set_gcc_security_group({"GroupId": "group"})
+        nodes = gcc_workflow_obj.get_workflow_dict()["nodes"]
+
+        gcc_workflow_obj.create_instances(list(nodes.values()))
+
+        assert mock_find_base_image.call_count == 1
+        assert [
+            (call.args[2], call.kwargs["instance_type"])
+            for call in mock_create_instances.call_args_list
+        ] == [(2, None), (2, "c5.xlarge")]
+        assert mock_wait_until_running.call_count == 1
+        assert {
+            node_id: node.get_node_virtual_machine()["instance_id"]
+            for node_id, node in nodes.items()
+        } == {"a": "None-0", "b": "c5.xlarge-0", "c": "None-1", "d": "c5.xlarge-1"}
+        assert nodes["b"].get_node_virtual_machine()["bootstrapped"]
+
     @mock.patch(
         "gcc_node.GccNode.set_config_commands",
         return_value=None,
@@ -272,10 +391,87 @@ class TestGccWorkflow:
         gcc_workflow_obj.execute()
 
         if workflow_dict["type"] == 1:
-            assert mock_sleep.called
+            assert not mock_sleep.called
 
         assert mock_execute.called
 
+    @mock.patch("gcc_node.GccNode.execute", return_value=None)
+    def test_execute_ready_queue(self, mock_execute: mock.MagicMock):
+        """This method ensures type 0 nodes start once their producers finish."""
+        gcc_workflow_obj = GccWorkflow(
+            gcc_user_obj=self.__gcc_user_obj, workflow_name="workflow_1"
+        )
+
+        with open(
+            join(dirname(__file__), "data/spec/spec_1.xml")
+        ) as xml_specification_file:
+            xml_specification = xml_specification_file.read()
+
+        gcc_workflow_obj.plan(
+            available_machines=[], xml_specification=xml_specification
+        )
+
+        gcc_workflow_obj.execute()
+
+        timeline = gcc_workflow_obj.get_workflow_dict()["timeline"]
+
+        assert mock_execute.call_count == 4
+        assert set(timeline) == {"n1", "n2", "n3", "n4"}
+        assert timeline["n2"]["start"] >= timeline["n1"]["finish"]
+        assert timeline["n3"]["start"] >= timeline["n1"]["finish"]
+        assert timeline["n4"]["start"] >= max(
+            timeline["n2"]["finish"], timeline["n3"]["finish"]
+        )
+
+    @mock.patch(
+        "gcc_ec2.GccEc2.find_interrupted_instances",
+        side_effect=lambda instance_ids: [
+            instance_id for instance_id in instance_ids if instance_id == "i-a"
+        ],
+    )
+    @mock.patch("gcc_node.GccNode.reschedule", return_value=None)
+    @mock.patch("gcc_node.GccNode.execute", autospec=True)
+    def test_execute_reschedules_interrupted_spot_nodes(
+        self,
+        mock_execute: mock.MagicMock,
+        mock_reschedule: mock.MagicMock,
+        mock_find_interrupted_instances: mock.MagicMock,
+    ):
+        """This method ensures a node whose spot instance was reclaimed runs again."""
+        gcc_workflow_obj = GccWorkflow(
+            gcc_user_obj=self.__gcc_user_obj,
+            workflow_name="workflow_spot",
+            spot_instances=True,
+        )
+        gcc_workflow_obj.plan(
+            available_machines=[],
+            xml_specification='<workflow type="0"><task id="a"/>'
+            '<task id="b"><dep node="a">x</dep></task><task id="c"/></workflow>',
+        )
+        nodes = gcc_workflow_obj.get_workflow_dict()["nodes"]
+        for node_id, node in nodes.items():
+            node.set_node_virtual_machine(
+                {"ip": "10.0.0.1", "pem": "pem", "instance_id": f"i-{node_id}"}
+            )
+        executed = []
+
+        def execute(node: GccNode) -> None:
+            executed.append(node.get_node_id())
+            if executed.count("a") == 1 and node.get_node_id() == "a":
+                raise OSError("Connection reset")
+
+        mock_execute.side_effect = execute
+
+        gcc_workflow_obj.execute()
+
+        timeline = gcc_workflow_obj.get_workflow_dict()["timeline"]
+
+        assert sorted(executed) == ["a", "a", "b", "c"]
+        assert mock_execute.call_count == 4
+        assert mock_reschedule.call_count == 1
+        assert mock_find_interrupted_instances.call_args.args[0] == ["i-a"]
+        assert timeline["b"]["start"] >= timeline["a"]["finish"]
+
     @mock.patch(
         "gcc_node.GccNode.terminate",
         return_value=None,
@@ -288,6 +484,7 @@ class TestGccWorkflow:
         "gcc_ec2.GccEc2.delete_security_group",
         return_value=None,
     )
+    @mock.patch("gcc_ec2.GccEc2.wait_until_terminated", return_value=None)
     @mock.patch("shutil.rmtree", return_value=None)
     @pytest.mark.parametrize(
         "xml_specification_filename,workflow_name,security_group,key_pair",
@@ -321,6 +518,7 @@ class TestGccWorkflow:
     def test_complete(
         self,
         mock_rmtree: mock.MagicMock,
+        mock_wait_until_terminated: mock.MagicMock,
         mock_delete_security_group: mock.MagicMock,
         mock_delete_key_pair: mock.MagicMock,
         mock_teminate: mock.MagicMock,
@@ -331,7 +529,9 @@ class TestGccWorkflow:
     ):
         """This method ensures that a workflow completes correctly."""
         gcc_workflow_obj = GccWorkflow(
-            gcc_user_obj=self.__gcc_user_obj, workflow_name=workflow_name
+            gcc_user_obj=self.__gcc_user_obj,
+            workflow_name=workflow_name,
+            per_run_resources=True,
         )
 
         with open(
@@ -352,5 +552,72 @@ class TestGccWorkflow:
             assert mock_delete_key_pair.called
             assert mock_delete_security_group.called
 
+        assert not mock_wait_until_terminated.called
         assert mock_teminate.called
         assert mock_rmtree.called
+
+    @mock.patch("gcc_node.GccNode.terminate", return_value=None)
+    @mock.patch("gcc_ec2.GccEc2.delete_key_pair", return_value=None)
+    @mock.patch("gcc_ec2.GccEc2.delete_security_group", return_value=None)
+    @mock.patch("gcc_ec2.GccEc2.wait_until_terminated", return_value=None)
+    @mock.patch("gcc_ec2.GccEc2.create_key_pair", return_value={"KeyName": "run"})
+    @mock.patch("gcc_ec2.GccEc2.create_security_group", return_value={"GroupId": "run"})
+    @mock.patch(
+        "gcc_resources.GccSharedResources.get_key_pair",
+        return_value={"KeyName": "gcc", "KeyMaterial": "pem"},
+    )
+    @mock.patch(
+        "gcc_resources.GccSharedResources.get_security_group",
+        return_value={"GroupId": "gcc"},
+    )
+    @mock.patch("gcc_drbx.GccDrbx.create_folder", return_value=None)
+    @mock.patch("shutil.rmtree", return_value=None)
+    @mock.patch("os.makedirs", return_value=None)
+    @pytest.mark.parametrize("per_run_resources", [False, True])
+    def test_execution_resources(
+        self,
+        mock_makedirs: mock.MagicMock,
+        mock_rmtree: mock.MagicMock,
+        mock_create_folder: mock.MagicMock,
+        mock_get_security_group: mock.MagicMock,
+        mock_get_key_pair: mock.MagicMock,
+        mock_create_security_group: mock.MagicMock,
+        mock_create_key_pair: mock.MagicMock,
+        mock_wait_until_terminated: mock.MagicMock,
+        mock_delete_security_group: mock.MagicMock,
+        mock_delete_key_pair: mock.MagicMock,
+        mock_terminate: mock.MagicMock,
+        per_run_resources: bool,
+    ):
+        """This method ensures shared resources are reused and per-run ones are deleted."""
+        gcc_workflow_obj = GccWorkflow(
+            gcc_user_obj=self.__gcc_user_obj,
+            workflow_name="workflow_resources",
+            per_run_resources=per_run_resources,
+        )
+        gcc_workflow_obj.plan(
+            available_machines=[],
+            xml_specification='<workflow type="0"><task id="a"/></workflow>',
+        )
+
+        pooled_nodes = gcc_workflow_obj.create_execution_resources()
+        gcc_workflow_obj.create_access_resources()
+        pooled_nodes[0].set_node_virtual_machine(
+            {"ip": "10.0.0.1", "pem": "pem", "instance_id": "i-a"}
+        )
+        gcc_workflow_obj.complete()
+
+        assert mock_makedirs.called
+        assert mock_rmtree.called
+        assert mock_create_folder.called
+        assert mock_terminate.called
+        assert mock_get_security_group.called != per_run_resources
+        assert mock_get_key_pair.called != per_run_resources
+        assert mock_create_security_group.called == per_run_resources
+        assert mock_create_key_pair.called == per_run_resources
+        assert mock_delete_key_pair.called == per_run_resources
+        assert mock_delete_security_group.called == per_run_resources
+        if per_run_resources:
+            mock_wait_until_terminated.assert_called_once_with(["i-a"])
+        else:
+            assert not mock_wait_until_terminated.called
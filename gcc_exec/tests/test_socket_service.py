@@ -0,0 +1,43 @@
+"""This file contains the TestSocketService class."""
+# pylint: disable=E0401,E1120,E1121,R0903
+import socket
+import threading
+import time
+
+from socket_service.SocketService import SocketService
+
+
+class TestSocketService:
+    """This class contains methods to test the SocketService class."""
+
+    def test_send_files_waits_for_receiver(self, tmp_path):
+        """This method ensures a sender started before its receiver still delivers."""
+        (tmp_path / "out").mkdir()
+        (tmp_path / "out" / "words.txt").write_bytes(b"hello world")
+
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+
+        sender = threading.Thread(
+            target=SocketService.send_files_to_many,
+            args=(
+                [
+                    {
+                        "host": "127.0.0.1",
+                        "port": port,
+                        "filedictlist": [
+                            {"filename": "words.txt", "filedir": str(tmp_path / "out")}
+                        ],
+                    }
+                ],
+                10,
+            ),
+        )
+        sender.start()
+        time.sleep(0.3)
+
+        SocketService.receive_files(str(tmp_path / "in"), "127.0.0.1", port)
+        sender.join()
+
+        assert (tmp_path / "in" / "words.txt").read_bytes() == b"hello world"
@@ -36,14 +36,30 @@ class SocketService(rpyc.Service):
 
         return export_function(self.upload_to_dropbox)
 
-    def send_files(filedictlist, host, port):
-        """Handles the sending of files to one recipient."""
+    def send_files(filedictlist, host, port, connect_timeout=600):
+        """Handles the sending of files to one recipient.
+
+        The recipient is ready once its port accepts connections, so the
+        connection is retried with backoff until it does or connect_timeout
+        seconds pass.
+        """
         import os
         import socket
+        import time
         from pathlib import Path
 
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.connect((host, port))
+        deadline = time.monotonic() + connect_timeout
+        delay = 0.05
+        while True:
+            try:
+                sock = socket.create_connection((host, port), timeout=delay + 5)
+                sock.settimeout(None)
+                break
+            except OSError:
+                if time.monotonic() + delay > deadline:
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, 2)
 
         for filedict in filedictlist:
             filedir = filedict["filedir"]
@@ -59,16 +75,30 @@ class SocketService(rpyc.Service):
                 sock.sendall(out_file.read())
                 out_file.close()
 
-    def send_files_to_many(argsdictlist):
-        """Handles the sending of files to multiple recipients."""
+    def send_files_to_many(argsdictlist, connect_timeout=600):
+        """Handles the sending of files to multiple recipients.
+
+        Each recipient is sent to as soon as its port accepts connections.
+        """
         import os
         import socket
         import threading
+        import time
         from pathlib import Path
 
         def _send_files(filedictlist, host, port):
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.connect((host, port))
+            deadline = time.monotonic() + connect_timeout
+            delay = 0.05
+            while True:
+                try:
+                    sock = socket.create_connection((host, port), timeout=delay + 5)
+                    sock.settimeout(None)
+                    break
+                except OSError:
+                    if time.monotonic() + delay > deadline:
+                        raise
+                    time.sleep(delay)
+                    delay = min(delay * 2, 2)
 
             for filedict in filedictlist:
                 filedir = filedict["filedir"]